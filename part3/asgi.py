@@ -0,0 +1,14 @@
+#!/usr/bin/python3
+import os
+import sys
+
+# Same layout as run.py: the app's modules import each other as
+# part3.hbnb.app, its config is loaded as "config" from this directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(1, os.path.dirname(os.path.abspath(__file__)))
+
+from part3.hbnb.app.asgi import create_asgi_app  # noqa: E402
+
+# GET list/detail endpoints of places, amenities and reviews on asyncio, the
+# rest on the Flask app, e.g. `uvicorn part3.asgi:app` from the repository root
+app = create_asgi_app()
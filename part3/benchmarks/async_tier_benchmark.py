@@ -0,0 +1,117 @@
+#!/usr/bin/python3
+"""Thousands of slow clients: the asyncio read tier against threaded Flask.
+
+Every client fetches a place and takes --delay seconds to receive the
+response. "threads" serves them like a threaded WSGI server: a pool of
+--threads workers, each held by its client until the response has gone
+out. "asgi" serves them through app/asgi.py on one event loop, where a
+slow client only holds a suspended coroutine. Both run in process, on
+the same SQLite file.
+
+Usage (from the repository root):
+    python -m part3.benchmarks.async_tier_benchmark --clients 2000 --delay 0.2 --threads 32
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from config import Config
+from part3.hbnb.app import db
+from part3.hbnb.app.asgi import create_asgi_app
+from part3.hbnb.app.services import facade
+
+
+def seed(app, places):
+    with app.app_context():
+        db.create_all()
+        owner = facade.create_user({'first_name': 'Jane', 'last_name': 'Doe',
+                                    'email': 'jane@example.com', 'password': 'secret'})
+        return [facade.create_place({'title': f'Flat {i}', 'description': 'A quiet flat', 'price': 50.0 + i,
+                                     'latitude': 48.85, 'longitude': 2.35, 'owner_id': owner.id}).id
+                for i in range(places)]
+
+
+def paths(ids, clients):
+    rng = random.Random(0)
+    return [f'/api/v1/places/{rng.choice(ids)}' for _ in range(clients)]
+
+
+def run_threads(flask_app, paths, args):
+    def serve(path, queued):
+        response = flask_app.test_client().get(path)
+        time.sleep(args.delay)  # the worker writes to a slow socket
+        return time.perf_counter() - queued, response.status_code
+
+    with ThreadPoolExecutor(args.threads) as pool:
+        start = time.perf_counter()
+        futures = [pool.submit(serve, path, time.perf_counter()) for path in paths]
+        results = [future.result() for future in futures]
+    return time.perf_counter() - start, results
+
+
+async def run_asgi(app, paths, args):
+    async def serve(path):
+        queued = time.perf_counter()
+        status = []
+        scope = {'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET',
+                 'scheme': 'http', 'path': path, 'raw_path': path.encode(), 'root_path': '',
+                 'query_string': b'', 'headers': [(b'host', b'bench')],
+                 'server': ('bench', 80), 'client': ('127.0.0.1', 1234)}
+
+        async def receive():
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+        async def send(message):
+            if message['type'] == 'http.response.start':
+                status.append(message['status'])
+            elif not message.get('more_body'):
+                await asyncio.sleep(args.delay)  # the last bytes reach a slow client
+
+        await app(scope, receive, send)
+        return time.perf_counter() - queued, status[0]
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(serve(path) for path in paths))
+    return time.perf_counter() - start, results
+
+
+def report(name, wall, results):
+    latencies = sorted(latency for latency, _ in results)
+    errors = sum(status != 200 for _, status in results)
+    print(f'  {name:8} {len(results) / wall:7.0f} req/s   wall {wall:6.2f} s   '
+          f'p50 {latencies[len(latencies) // 2] * 1000:8.1f} ms   '
+          f'p95 {latencies[int(len(latencies) * 0.95)] * 1000:8.1f} ms   {errors} errors')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--clients', type=int, default=2000)
+    parser.add_argument('--delay', type=float, default=0.2, help='seconds each client takes to read')
+    parser.add_argument('--threads', type=int, default=32, help='workers of the threaded server')
+    parser.add_argument('--pool', type=int, default=10, help='connections of the async tier')
+    parser.add_argument('--places', type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        class BenchConfig(Config):
+            SQLALCHEMY_DATABASE_URI = 'sqlite:///' + os.path.join(tmp, 'bench.db')
+            SQLALCHEMY_TRACK_MODIFICATIONS = False
+            ASYNC_DB_POOL_SIZE = args.pool
+
+        app = create_asgi_app(BenchConfig)
+        requests = paths(seed(app.flask_app, args.places), args.clients)
+        print(f'{args.clients} clients reading in {args.delay * 1000:.0f} ms, '
+              f'{args.threads} threads vs one event loop ({args.pool} connections)')
+        report('threads', *run_threads(app.flask_app, requests, args))
+        report('asgi', *asyncio.run(run_asgi(app, requests, args)))
+        with app.flask_app.app_context():
+            db.session.remove()
+            db.engine.dispose()
+
+
+if __name__ == '__main__':
+    main()
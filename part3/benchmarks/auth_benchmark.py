@@ -0,0 +1,83 @@
+#!/usr/bin/python3
+"""Protected endpoint throughput: per-request ORM lookups vs. token claims.
+
+"before" validates the caller like the handlers used to, loading the user
+and the whole place to compare owner ids; "after" uses owner_required,
+which trusts the token claims and reads only the owner column.
+
+Usage (from the repository root):
+    python -m part3.benchmarks.auth_benchmark --requests 5000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from flask_jwt_extended import create_access_token, get_jwt_identity, jwt_required
+
+from part3.hbnb.app import create_app, db
+from part3.hbnb.app.authorization import owner_required
+from part3.hbnb.app.services import facade
+
+
+def add_routes(app):
+    @app.route('/bench/before/<place_id>')
+    @jwt_required()
+    def before(place_id):
+        current_user = get_jwt_identity()
+        user = facade.get_user(current_user['id'])
+        if not user:
+            return {'error': 'User Not Found'}, 404
+        place = facade.get_place(place_id)
+        if not place:
+            return {'error': 'Place not found'}, 404
+        if place.owner_id != current_user['id']:
+            return {'error': 'Unauthorized action.'}, 403
+        return {'ok': True}
+
+    @app.route('/bench/after/<place_id>')
+    @owner_required('place')
+    def after(place_id):
+        return {'ok': True}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=5000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        class BenchConfig:
+            SQLALCHEMY_DATABASE_URI = 'sqlite:///' + os.path.join(tmp, 'bench.db')
+            SQLALCHEMY_TRACK_MODIFICATIONS = False
+            SECRET_KEY = 'bench'
+            JWT_VERIFY_SUB = False
+            BCRYPT_LOG_ROUNDS = 4
+            PASSWORD_HASH_WORKERS = 0
+
+        app = create_app(BenchConfig)
+        add_routes(app)
+        with app.app_context():
+            db.create_all()
+            owner = facade.create_user({'first_name': 'Bench', 'last_name': 'Owner',
+                                        'email': 'bench@example.com', 'password': 'secret'})
+            place_id = facade.create_place({
+                'title': 'Bench place', 'description': '', 'price': 100.0,
+                'latitude': 48.85, 'longitude': 2.35, 'owner_id': owner.id}).id
+            token = create_access_token(identity={'id': owner.id, 'is_admin': False})
+
+        client = app.test_client()
+        headers = {'Authorization': f'Bearer {token}'}
+        for name in ('before', 'after'):
+            url = f'/bench/{name}/{place_id}'
+            assert client.get(url, headers=headers).status_code == 200
+            start = time.perf_counter()
+            for _ in range(args.requests):
+                client.get(url, headers=headers)
+            elapsed = time.perf_counter() - start
+            print(f"{name}: {args.requests / elapsed:.0f} requests/s "
+                  f"({elapsed / args.requests * 1e6:.0f} us/request)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/python3
+"""List endpoints: bytes on the wire and CPU per request for each content coding.
+
+Usage (from the repository root):
+    python -m part3.benchmarks.compression_benchmark --places 5000 --reviews 5000
+"""
+import argparse
+import os
+import tempfile
+import time
+import uuid
+from datetime import datetime
+
+from part3.hbnb.app import create_app, db, compression
+from part3.hbnb.app.models.amenity import Amenity
+from part3.hbnb.app.models.place import Place
+from part3.hbnb.app.models.review import Review
+from part3.hbnb.app.models.user import User
+from part3.hbnb.app.responsecache import init_response_cache
+from part3.benchmarks.serialization_benchmark import seed
+
+
+def seed_reviews_and_amenities(reviews, amenities):
+    now = datetime.now()
+    place_id = db.session.query(Place.id).first()[0]
+    db.session.execute(User.__table__.insert(), [{
+        'id': str(uuid.uuid4()), 'first_name': 'Guest', 'last_name': str(i),
+        'email': f'guest{i}@example.com', 'password': 'x', 'is_admin': False,
+        'created_at': now, 'updated_at': now
+    } for i in range(reviews)])
+    guest_ids = [row[0] for row in db.session.query(User.id).filter(User.first_name == 'Guest')]
+    db.session.execute(Review.__table__.insert(), [{
+        'id': str(uuid.uuid4()), 'text': 'Lovely place, would stay again', 'rating': 1 + i % 5,
+        'user_id': guest_id, 'place_id': place_id, 'created_at': now, 'updated_at': now
+    } for i, guest_id in enumerate(guest_ids)])
+    db.session.execute(Amenity.__table__.insert(), [{
+        'id': str(uuid.uuid4()), 'name': f'Amenity {i}', 'created_at': now, 'updated_at': now
+    } for i in range(amenities)])
+    db.session.commit()
+    return place_id
+
+
+def measure(client, url, encoding, repeat):
+    """(bytes on the wire, CPU ms per request)"""
+    headers = {'Accept-Encoding': encoding} if encoding else {}
+    body = client.get(url, headers=headers).get_data()
+    start = time.process_time()
+    for _ in range(repeat):
+        client.get(url, headers=headers).get_data()
+    return len(body), (time.process_time() - start) * 1000 / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--places', type=int, default=5000)
+    parser.add_argument('--reviews', type=int, default=5000)
+    parser.add_argument('--amenities', type=int, default=200)
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    encodings = [None, 'gzip'] + (['br'] if compression.brotli else [])
+    with tempfile.TemporaryDirectory() as tmp:
+        class BenchConfig:
+            SQLALCHEMY_DATABASE_URI = 'sqlite:///' + os.path.join(tmp, 'bench.db')
+            SQLALCHEMY_TRACK_MODIFICATIONS = False
+            SECRET_KEY = 'bench'
+            RESPONSE_CACHE = None
+            RESPONSE_CACHE_SIZE = 64
+            RESPONSE_CACHE_MAX_BODY = 64 * 1024 * 1024
+
+        app = create_app(BenchConfig)
+        with app.app_context():
+            db.create_all()
+            seed(args.places)
+            place_id = seed_reviews_and_amenities(args.reviews, args.amenities)
+
+        urls = ['/api/v1/places/', f'/api/v1/reviews/places/{place_id}/reviews', '/api/v1/amenities/']
+        for cache in (None, 'memory'):
+            app.config['RESPONSE_CACHE'] = cache
+            app.extensions.pop('response_cache', None)
+            init_response_cache(app)
+            client = app.test_client()
+            print(f"response cache: {cache or 'off'}")
+            for url in urls:
+                print(f"  {url}")
+                for encoding in encodings:
+                    size, cpu = measure(client, url, encoding, args.repeat)
+                    print(f"    {encoding or 'identity':8} {size / 1024:9.1f} KiB  {cpu:7.2f} ms CPU/request")
+
+
+if __name__ == '__main__':
+    main()
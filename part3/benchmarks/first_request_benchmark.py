@@ -0,0 +1,80 @@
+#!/usr/bin/python3
+"""Time to first request: package import, create_app() and the first request,
+each run in a fresh interpreter.
+
+Usage (from the repository root):
+    python -m part3.benchmarks.first_request_benchmark --runs 15
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+PROBE = '''
+import json, os, sys, time
+start = time.perf_counter()
+from part3.hbnb.app import create_app, db
+imported = time.perf_counter()
+
+class BenchConfig:
+    SQLALCHEMY_DATABASE_URI = 'sqlite:///' + os.environ['BENCH_DB']
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SECRET_KEY = 'bench'
+
+app = create_app(BenchConfig)
+created = time.perf_counter()
+response = app.test_client().get('/api/v1/places/')
+assert response.status_code == 200, response.status_code
+done = time.perf_counter()
+modules = sum(1 for name in sys.modules if name.startswith('part3.'))
+print(json.dumps([imported - start, created - imported, done - created, modules]))
+'''
+
+SETUP = '''
+import os
+from part3.hbnb.app import create_app, db
+from part3.benchmarks.serialization_benchmark import seed
+
+class BenchConfig:
+    SQLALCHEMY_DATABASE_URI = 'sqlite:///' + os.environ['BENCH_DB']
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SECRET_KEY = 'bench'
+
+app = create_app(BenchConfig)
+with app.app_context():
+    db.create_all()
+    seed(100)
+'''
+
+
+def run(code, env, root):
+    output = subprocess.run([sys.executable, '-c', code], env=env, cwd=root,
+                            check=True, capture_output=True, text=True).stdout
+    return output.strip().splitlines()[-1] if output.strip() else ''
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=15)
+    args = parser.parse_args()
+
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    with tempfile.TemporaryDirectory() as tmp:
+        env = dict(os.environ, BENCH_DB=os.path.join(tmp, 'bench.db'),
+                   PYTHONPATH=os.pathsep.join([root, os.path.join(root, 'part3')]))
+        run(SETUP, env, root)
+        # One untimed run so every measured run finds the bytecode cache warm
+        run(PROBE, env, root)
+        samples = [json.loads(run(PROBE, env, root)) for _ in range(args.runs)]
+
+    print(f'median of {args.runs} fresh interpreters, {samples[0][3]} part3 modules loaded')
+    for index, label in enumerate(('import part3.hbnb.app', 'create_app()', 'first request')):
+        print(f'  {label:22} {statistics.median(s[index] for s in samples) * 1000:8.1f} ms')
+    print(f"  {'time to first request':22} {statistics.median(sum(s[:3]) for s in samples) * 1000:8.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+#!/usr/bin/python3
+"""Login throughput with bcrypt inline vs. in the hashing process pool.
+
+Usage (from the repository root):
+    python -m part3.benchmarks.login_benchmark --threads 8 --logins 64
+"""
+import argparse
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from part3.hbnb.app import create_app, db, password_hasher
+from part3.hbnb.app.services import facade
+
+
+def run(workers, args):
+    with tempfile.TemporaryDirectory() as tmp:
+        class BenchConfig:
+            SQLALCHEMY_DATABASE_URI = 'sqlite:///' + os.path.join(tmp, 'bench.db')
+            SQLALCHEMY_TRACK_MODIFICATIONS = False
+            SECRET_KEY = 'bench'
+            BCRYPT_LOG_ROUNDS = args.rounds
+            PASSWORD_HASH_WORKERS = workers
+            PASSWORD_HASH_MAX_PENDING = args.logins
+
+        app = create_app(BenchConfig)
+        with app.app_context():
+            db.create_all()
+            facade.create_user({'first_name': 'Bench', 'last_name': 'User',
+                                'email': 'bench@example.com', 'password': 'secret'})
+
+        client = app.test_client()
+
+        def login(_):
+            response = client.post('/api/v1/auth/login', json={
+                'email': 'bench@example.com', 'password': 'secret'})
+            assert response.status_code == 200, response.status_code
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.threads) as pool:
+            list(pool.map(login, range(args.logins)))
+        elapsed = time.perf_counter() - start
+        stats = password_hasher.stats()
+        password_hasher.shutdown()
+        return args.logins / elapsed, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--threads', type=int, default=8, help='concurrent request threads')
+    parser.add_argument('--logins', type=int, default=64)
+    parser.add_argument('--rounds', type=int, default=12, help='bcrypt work factor')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='hashing processes')
+    args = parser.parse_args()
+
+    for workers in (0, args.workers):
+        rate, stats = run(workers, args)
+        label = 'inline' if workers == 0 else f'{workers} hashing processes'
+        print(f"{label}: {rate:.2f} logins/s "
+              f"(avg {stats['avg_latency_ms']} ms, max queue {stats['max_queue_depth']})")
+
+
+if __name__ == '__main__':
+    main()
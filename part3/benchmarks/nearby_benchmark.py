@@ -0,0 +1,97 @@
+#!/usr/bin/python3
+"""Radius search latency: geohash index vs. a brute-force scan.
+
+Usage (from the repository root):
+    python -m part3.benchmarks.nearby_benchmark --places 1000000
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+import uuid
+from datetime import datetime
+
+from part3.hbnb.app import create_app, db
+from part3.hbnb.app.models.place import Place
+from part3.hbnb.app.models.user import User
+from part3.hbnb.app.persistence import geohash
+from part3.hbnb.app.services import facade
+
+
+def seed(count, rng):
+    owner_id = str(uuid.uuid4())
+    now = datetime.now()
+    db.session.execute(User.__table__.insert(), [{
+        'id': owner_id, 'first_name': 'Bench', 'last_name': 'Owner',
+        'email': 'bench@example.com', 'password': 'x', 'is_admin': False,
+        'created_at': now, 'updated_at': now
+    }])
+
+    batch = []
+    for i in range(count):
+        lat, lon = rng.uniform(-85, 85), rng.uniform(-180, 180)
+        batch.append({
+            'id': str(uuid.uuid4()), 'title': f'Place {i}', 'description': '',
+            'price': 100.0, 'latitude': lat, 'longitude': lon, 'owner_id': owner_id,
+            'geohash': geohash.encode(lat, lon), 'created_at': now, 'updated_at': now
+        })
+        if len(batch) == 50000:
+            db.session.execute(Place.__table__.insert(), batch)
+            batch = []
+    if batch:
+        db.session.execute(Place.__table__.insert(), batch)
+    db.session.commit()
+
+
+def brute_force(lat, lon, radius_km, limit):
+    rows = db.session.query(Place.id, Place.latitude, Place.longitude).all()
+    matches = sorted(
+        (geohash.haversine_km(lat, lon, p_lat, p_lon), place_id)
+        for place_id, p_lat, p_lon in rows
+    )
+    return [place_id for distance, place_id in matches if distance <= radius_km][:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--places', type=int, default=1000000)
+    parser.add_argument('--queries', type=int, default=20)
+    parser.add_argument('--radius-km', type=float, default=25.0)
+    parser.add_argument('--brute-force-queries', type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    with tempfile.TemporaryDirectory() as tmp:
+        class BenchConfig:
+            SQLALCHEMY_DATABASE_URI = 'sqlite:///' + os.path.join(tmp, 'bench.db')
+            SQLALCHEMY_TRACK_MODIFICATIONS = False
+            SECRET_KEY = 'bench'
+
+        app = create_app(BenchConfig)
+        with app.app_context():
+            db.create_all()
+            start = time.perf_counter()
+            seed(args.places, rng)
+            print(f"seeded {args.places} places in {time.perf_counter() - start:.1f}s")
+
+            centers = [(rng.uniform(-60, 60), rng.uniform(-180, 180)) for _ in range(args.queries)]
+
+            start = time.perf_counter()
+            for lat, lon in centers:
+                facade.get_places_nearby(lat, lon, args.radius_km, 20)
+                db.session.expunge_all()
+            indexed = (time.perf_counter() - start) / len(centers)
+            print(f"geohash nearby: {indexed * 1000:.2f} ms/query")
+
+            start = time.perf_counter()
+            for lat, lon in centers[:args.brute_force_queries]:
+                expected = brute_force(lat, lon, args.radius_km, 20)
+                found = [p.id for p, _ in facade.get_places_nearby(lat, lon, args.radius_km, 20)]
+                assert found == expected, (lat, lon)
+            scan = (time.perf_counter() - start) / args.brute_force_queries
+            print(f"brute force scan: {scan * 1000:.2f} ms/query ({scan / indexed:.0f}x slower)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+#!/usr/bin/python3
+"""Place list: ORM entities vs. projected rows, time and peak memory.
+
+Usage (from the repository root):
+    python -m part3.benchmarks.projection_benchmark --places 100000
+"""
+import argparse
+import gc
+import os
+import tempfile
+import time
+import tracemalloc
+
+from part3.hbnb.app import create_app, db, serialization
+from part3.hbnb.app.models.place import Place
+from part3.hbnb.app.services import facade
+from part3.hbnb.app.api.v1.places import PLACE_ROW_COLUMNS
+from part3.benchmarks.serialization_benchmark import seed
+
+
+def measure(label, function):
+    db.session.expunge_all()
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    body = function()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    db.session.expunge_all()
+    print(f"{label}: {elapsed * 1000:.0f} ms, peak {peak / 1e6:.0f} MB ({len(body) / 1e6:.1f} MB body)")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--places', type=int, default=100000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        class BenchConfig:
+            SQLALCHEMY_DATABASE_URI = 'sqlite:///' + os.path.join(tmp, 'bench.db')
+            SQLALCHEMY_TRACK_MODIFICATIONS = False
+            SECRET_KEY = 'bench'
+
+        app = create_app(BenchConfig)
+        with app.app_context():
+            db.create_all()
+            seed(args.places)
+
+            entities = measure('entities', lambda: serialization.dump_rows(
+                facade.get_all_places(), Place))
+            rows = measure('projected rows', lambda: serialization.dump_rows(
+                facade.get_all_places(columns=PLACE_ROW_COLUMNS), Place, 'row', rows=True))
+            print(f"speedup: {entities / rows:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
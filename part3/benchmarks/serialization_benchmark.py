@@ -0,0 +1,100 @@
+#!/usr/bin/python3
+"""Serializing places: hand-written dicts + json vs. compiled views + orjson.
+
+Usage (from the repository root):
+    python -m part3.benchmarks.serialization_benchmark --places 100000
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+import uuid
+from datetime import datetime
+
+from part3.hbnb.app import create_app, db, serialization
+from part3.hbnb.app.models.place import Place
+from part3.hbnb.app.models.user import User
+from part3.hbnb.app.persistence import geohash
+import part3.hbnb.app.api.v1.places  # noqa: F401 registers the Place views
+
+
+def hand_written(place):
+    # What places.py did before the serializer registry
+    return {
+        'id': place.id,
+        'title': place.title,
+        'description': place.description,
+        'price': place.price,
+        'latitude': place.latitude,
+        'longitude': place.longitude,
+        'owner': place.owner_id,
+        'created_at': place.created_at.isoformat(),
+        'updated_at': place.updated_at.isoformat(),
+        **place.rating_summary()
+    }
+
+
+def seed(count):
+    owner_id = str(uuid.uuid4())
+    now = datetime.now()
+    db.session.execute(User.__table__.insert(), [{
+        'id': owner_id, 'first_name': 'Bench', 'last_name': 'Owner',
+        'email': 'bench@example.com', 'password': 'x', 'is_admin': False,
+        'created_at': now, 'updated_at': now
+    }])
+    db.session.execute(Place.__table__.insert(), [{
+        'id': str(uuid.uuid4()), 'title': f'Place {i}', 'description': 'A cozy place',
+        'price': 100.0 + i % 50, 'latitude': 48.85, 'longitude': 2.35, 'owner_id': owner_id,
+        'geohash': geohash.encode(48.85, 2.35), 'created_at': now, 'updated_at': now
+    } for i in range(count)])
+    db.session.commit()
+
+
+def timed(label, function, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    print(f"{label}: {best * 1000:.0f} ms ({len(body) / 1e6:.1f} MB)")
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--places', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        class BenchConfig:
+            SQLALCHEMY_DATABASE_URI = 'sqlite:///' + os.path.join(tmp, 'bench.db')
+            SQLALCHEMY_TRACK_MODIFICATIONS = False
+            SECRET_KEY = 'bench'
+
+        app = create_app(BenchConfig)
+        with app.app_context():
+            db.create_all()
+            seed(args.places)
+            places = Place.query.all()
+            print(f"loaded {len(places)} places")
+
+            before = timed('hand-written dict + json.dumps',
+                           lambda: json.dumps([hand_written(p) for p in places]).encode('utf-8'),
+                           args.repeat)
+            compiled = serialization.serializer(Place)
+            middle = timed('compiled view + json.dumps',
+                           lambda: json.dumps([compiled(p) for p in places]).encode('utf-8'),
+                           args.repeat)
+            encoder = 'orjson' if serialization.orjson else 'json fallback'
+            after = timed(f'compiled native view + {encoder}',
+                          lambda: b'[' + serialization.dump_rows(places, Place) + b']',
+                          args.repeat)
+            print(f"speedup: {before / middle:.1f}x from the compiled view, "
+                  f"{before / after:.1f}x with the encoder")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/python3
+"""SQLite under concurrency: mixed read and write requests from worker threads.
+
+"default" is the development setup (rollback journal, synchronous FULL, one
+pool). "pragmas" adds ProductionSQLiteConfig's pragmas to that single pool,
+"production" is ProductionSQLiteConfig itself: pragmas plus the read pool
+and a one-connection write pool.
+
+Usage (from the repository root):
+    python -m part3.benchmarks.sqlite_concurrency_benchmark --threads 8 --requests 200 --write-ratio 0.2
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import threading
+import time
+
+from config import Config, ProductionSQLiteConfig
+from part3.hbnb.app import create_app, db
+from part3.hbnb.app.persistence import connections
+
+
+def configs(uri):
+    class Default(Config):
+        SQLALCHEMY_DATABASE_URI = uri
+        SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+    class Pragmas(Default):
+        SQLITE_PRAGMAS = ProductionSQLiteConfig.SQLITE_PRAGMAS
+
+    class Production(ProductionSQLiteConfig):
+        SQLALCHEMY_DATABASE_URI = uri
+
+    return (('default', Default), ('pragmas', Pragmas), ('production', Production))
+
+
+def worker(app, ids, requests, write_ratio, seed, results):
+    client = app.test_client()
+    rng = random.Random(seed)
+    reads, writes, errors = [], [], 0
+    for i in range(requests):
+        start = time.perf_counter()
+        if rng.random() < write_ratio:
+            status = client.put(f'/api/v1/amenities/{rng.choice(ids)}', json={'name': f'Amenity {seed}-{i}'}).status_code
+            writes.append(time.perf_counter() - start)
+        else:
+            status = client.get(f'/api/v1/amenities/{rng.choice(ids)}').status_code
+            reads.append(time.perf_counter() - start)
+        errors += status >= 500
+    results.append((reads, writes, errors))
+
+
+def run(name, config_class, args):
+    app = create_app(config_class)
+    client = app.test_client()
+    ids = [client.post('/api/v1/amenities/', json={'name': f'Amenity {i}'}).get_json()['id']
+           for i in range(args.amenities)]
+
+    results = []
+    threads = [threading.Thread(target=worker, args=(app, ids, args.requests, args.write_ratio, seed, results))
+               for seed in range(args.threads)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - start
+
+    reads = sorted(t for r, _, _ in results for t in r)
+    writes = sorted(t for _, w, _ in results for t in w)
+    errors = sum(e for _, _, e in results)
+    with app.app_context():
+        db.session.remove()
+        db.engine.dispose()
+    if connections.read_engine(app):
+        connections.read_engine(app).dispose()
+
+    def p95(samples):
+        return samples[int(len(samples) * 0.95)] * 1000 if samples else 0
+
+    print(f'  {name:11} {(len(reads) + len(writes)) / wall:7.0f} req/s   '
+          f'read median {statistics.median(reads) * 1000:6.2f} ms p95 {p95(reads):6.2f} ms   '
+          f'write median {statistics.median(writes) * 1000:6.2f} ms p95 {p95(writes):6.2f} ms   {errors} errors')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=200, help='per thread')
+    parser.add_argument('--write-ratio', type=float, default=0.2)
+    parser.add_argument('--amenities', type=int, default=200)
+    args = parser.parse_args()
+
+    print(f'{args.threads} threads x {args.requests} requests, {args.write_ratio:.0%} writes')
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, config_class in configs('sqlite:///' + os.path.join(tmp, 'bench.db')):
+            path = os.path.join(tmp, 'bench.db')
+            for leftover in (path, path + '-wal', path + '-shm', path + '.init.lock'):
+                if os.path.exists(leftover):
+                    os.remove(leftover)
+            run(name, config_class, args)
+
+
+if __name__ == '__main__':
+    main()
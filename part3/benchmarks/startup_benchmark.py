@@ -0,0 +1,111 @@
+#!/usr/bin/python3
+"""Startup: database initialization of a cold and a warm boot, alone and with workers.
+
+"replay" is the former run.py behaviour: the schema and seed scripts run
+again on every start of every process.
+
+Usage (from the repository root):
+    python -m part3.benchmarks.startup_benchmark --workers 8 --repeat 20
+"""
+import argparse
+import multiprocessing
+import os
+import sqlite3
+import tempfile
+import time
+
+from part3.hbnb.app import create_app
+from part3.hbnb.app.persistence import migrations, startup
+
+
+def replay(path):
+    conn = sqlite3.connect(path, timeout=60)
+    for migration in migrations.available_migrations():
+        if migration.path.endswith('.sql'):
+            with open(migration.path) as script:
+                conn.executescript(script.read())
+    for seed in startup.seed_files():
+        with open(seed) as script:
+            conn.executescript(script.read())
+    conn.close()
+
+
+def initialize(path):
+    conn = sqlite3.connect(path, timeout=60)
+    startup.initialize_connection(conn, path + '.init.lock')
+    conn.close()
+
+
+def boot(args):
+    """Worker process: initialize the database and create the app, return
+    the ms spent in each"""
+    path, mode = args
+
+    class BenchConfig:
+        SQLALCHEMY_DATABASE_URI = 'sqlite:///' + path
+        SQLALCHEMY_TRACK_MODIFICATIONS = False
+        SECRET_KEY = 'bench'
+
+    start = time.perf_counter()
+    (replay if mode == 'replay' else initialize)(path)
+    ready = time.perf_counter()
+    app = create_app(BenchConfig)
+    done = time.perf_counter()
+    with app.app_context():
+        app.extensions['sqlalchemy'].engine.dispose()
+    return (ready - start) * 1000, (done - start) * 1000
+
+
+def fresh_path(tmp, name):
+    path = os.path.join(tmp, name)
+    for leftover in (path, path + '.init.lock'):
+        if os.path.exists(leftover):
+            os.remove(leftover)
+    return path
+
+
+def timed(function, path, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function(path)
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print('single process, database initialization only')
+        cold = 0
+        for i in range(args.repeat):
+            path = fresh_path(tmp, 'single.db')
+            start = time.perf_counter()
+            initialize(path)
+            cold += (time.perf_counter() - start) * 1000
+        print(f'  cold boot          {cold / args.repeat:8.2f} ms')
+        print(f'  warm boot          {timed(initialize, path, args.repeat):8.2f} ms')
+        print(f'  warm boot, replay  {timed(replay, path, args.repeat):8.2f} ms')
+
+        print(f'{args.workers} workers starting together, create_app() included')
+        context = multiprocessing.get_context('fork')
+        with context.Pool(args.workers) as pool:
+            # First app of each worker pays one-off costs, keep them out of the figures
+            pool.map(boot, [(fresh_path(tmp, 'warmup.db'), 'replay')] * args.workers, chunksize=1)
+            for label, mode, warm in (('cold boot', 'initialize', False), ('warm boot', 'initialize', True),
+                                      ('cold boot, replay', 'replay', False), ('warm boot, replay', 'replay', True)):
+                path = fresh_path(tmp, f'{mode}.db')
+                if warm:
+                    pool.map(boot, [(path, mode)] * args.workers)
+                start = time.perf_counter()
+                times = pool.map(boot, [(path, mode)] * args.workers)
+                wall = (time.perf_counter() - start) * 1000
+                init = [init for init, _ in times]
+                print(f'  {label:18} database {sum(init) / len(init):7.2f} ms mean {max(init):7.2f} ms slowest, '
+                      f'{wall:8.2f} ms until every app is created')
+
+
+if __name__ == '__main__':
+    main()
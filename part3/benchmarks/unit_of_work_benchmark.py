@@ -0,0 +1,87 @@
+#!/usr/bin/python3
+"""Unit of work: amenity writes per second, one commit per facade call or
+one commit per `with facade.transaction():` batch.
+
+"sqlite file" is a database file with the default journal, where every
+commit waits for the disk. There is no database server here, so "server
+stand-in" is the same file with --rtt-ms of sleep added to each statement
+and each commit, like the network round trip to a server would.
+
+Usage (from the repository root):
+    python -m part3.benchmarks.unit_of_work_benchmark --writes 500 --batch 50 --rtt-ms 0.5
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from sqlalchemy import event
+
+from part3.hbnb.app import create_app, db
+from part3.hbnb.app.services import facade
+
+
+def make_app(path):
+    class BenchConfig:
+        SQLALCHEMY_DATABASE_URI = 'sqlite:///' + path
+        SQLALCHEMY_TRACK_MODIFICATIONS = False
+        SECRET_KEY = 'bench'
+
+    return create_app(BenchConfig)
+
+
+def add_latency(engine, rtt):
+    """Sleep one round trip per statement and per commit"""
+    def round_trip(*args, **kwargs):
+        time.sleep(rtt)
+    event.listen(engine, 'before_cursor_execute', round_trip)
+    event.listen(engine, 'commit', round_trip)
+    return round_trip
+
+
+def per_call(writes, batch):
+    for i in range(writes):
+        facade.create_amenity({'name': f'Amenity {i}'})
+
+
+def batched(writes, batch):
+    for start in range(0, writes, batch):
+        with facade.transaction():
+            for i in range(start, min(start + batch, writes)):
+                facade.create_amenity({'name': f'Amenity {i}'})
+
+
+def measure(path, writes, batch, rtt, function):
+    app = make_app(path)
+    with app.app_context():
+        db.drop_all()
+        db.create_all()
+        if rtt:
+            add_latency(db.engine, rtt)
+        start = time.perf_counter()
+        function(writes, batch)
+        elapsed = time.perf_counter() - start
+        db.session.remove()
+        db.engine.dispose()
+    return writes / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--writes', type=int, default=500)
+    parser.add_argument('--batch', type=int, default=50)
+    parser.add_argument('--rtt-ms', type=float, default=0.5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'bench.db')
+        print(f'{args.writes} amenity writes, batches of {args.batch}')
+        for label, rtt in (('sqlite file', 0), (f'server stand-in, {args.rtt_ms} ms rtt', args.rtt_ms / 1000)):
+            print(f'  {label}')
+            for mode, function in (('commit per call', per_call), ('facade.transaction()', batched)):
+                rate = measure(path, args.writes, args.batch, rtt, function)
+                print(f'    {mode:22} {rate:9.0f} writes/s')
+
+
+if __name__ == '__main__':
+    main()
@@ -5,15 +5,123 @@ import os
 class Config:
     SECRET_KEY = os.getenv('SECRET_KEY', 'default_secret_key')
     DEBUG = False
+    # Identities are {'id', 'is_admin'} dicts, not plain strings
+    JWT_VERIFY_SUB = False
+
+    # Read-through cache for repository get(): None, 'memory' or 'sqlite'
+    # ('sqlite' is shared by every worker through REPOSITORY_CACHE_PATH)
+    REPOSITORY_CACHE = os.getenv('REPOSITORY_CACHE')
+    REPOSITORY_CACHE_SIZE = int(os.getenv('REPOSITORY_CACHE_SIZE', 1024))
+    REPOSITORY_CACHE_TTL = int(os.getenv('REPOSITORY_CACHE_TTL', 60))
+    REPOSITORY_CACHE_PATH = os.getenv('REPOSITORY_CACHE_PATH', 'repository_cache.db')
+
+    # Encoded responses of the public list endpoints: None, 'memory' or
+    # 'sqlite' (shared through RESPONSE_CACHE_PATH, use it with several workers
+    # so an invalidation reaches all of them). Bodies over
+    # RESPONSE_CACHE_MAX_BODY bytes are not stored.
+    RESPONSE_CACHE = os.getenv('RESPONSE_CACHE')
+    RESPONSE_CACHE_SIZE = int(os.getenv('RESPONSE_CACHE_SIZE', 256))
+    RESPONSE_CACHE_TTL = int(os.getenv('RESPONSE_CACHE_TTL', 300))
+    RESPONSE_CACHE_PATH = os.getenv('RESPONSE_CACHE_PATH', 'response_cache.db')
+    RESPONSE_CACHE_MAX_BODY = int(os.getenv('RESPONSE_CACHE_MAX_BODY', 1024 * 1024))
+
+    # gzip (and brotli when installed) for text responses of at least
+    # COMPRESS_MIN_SIZE bytes, negotiated through Accept-Encoding
+    COMPRESS_RESPONSES = os.getenv('COMPRESS_RESPONSES', '1') == '1'
+    COMPRESS_MIN_SIZE = int(os.getenv('COMPRESS_MIN_SIZE', 1024))
+    COMPRESS_LEVEL = int(os.getenv('COMPRESS_LEVEL', 6))  # gzip, 1-9
+    COMPRESS_BROTLI_QUALITY = int(os.getenv('COMPRESS_BROTLI_QUALITY', 4))  # 0-11
+
+    # Apply pending migrations and changed seed data in create_app(); only
+    # the first worker to start does the work, the others find it done.
+    # Set to 0 to run `flask db-init` as a separate deployment step instead.
+    DATABASE_AUTO_INIT = os.getenv('DATABASE_AUTO_INIT', '1') == '1'
+
+    # Commit the repository writes of each POST/PUT/PATCH/DELETE request
+    # once at the end (rolled back on an error status) instead of per call
+    UNIT_OF_WORK_PER_REQUEST = os.getenv('UNIT_OF_WORK_PER_REQUEST', '1') == '1'
+
+    # Connection pool of each worker process, see persistence/pool.py. With
+    # threaded workers, DB_POOL_SIZE + DB_MAX_OVERFLOW should cover the
+    # threads that can hold a connection at once. Keys set in
+    # SQLALCHEMY_ENGINE_OPTIONS win; in-memory SQLite has no pool to size.
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', 5))
+    DB_MAX_OVERFLOW = int(os.getenv('DB_MAX_OVERFLOW', 10))
+    DB_POOL_TIMEOUT = int(os.getenv('DB_POOL_TIMEOUT', 30))  # whole seconds to wait for a connection
+    DB_POOL_RECYCLE = int(os.getenv('DB_POOL_RECYCLE', -1))  # reconnect after N seconds, -1 = never
+    DB_POOL_PRE_PING = os.getenv('DB_POOL_PRE_PING', '0') == '1'  # test connections on checkout
+
+    # Connections of the asyncio engine behind the ASGI read endpoints
+    # (app/asgi.py), per worker; coroutines queue for them without a thread
+    ASYNC_DB_POOL_SIZE = int(os.getenv('ASYNC_DB_POOL_SIZE', 10))
+
+    # Rows validated and inserted per executemany by the /bulk endpoints
+    BULK_CHUNK_SIZE = int(os.getenv('BULK_CHUNK_SIZE', 500))
+
+    # bcrypt runs in a process pool so logins don't pin the request threads
+    BCRYPT_LOG_ROUNDS = int(os.getenv('BCRYPT_LOG_ROUNDS', 12))
+    PASSWORD_HASH_WORKERS = int(os.getenv('PASSWORD_HASH_WORKERS', os.cpu_count() or 1))
+    PASSWORD_HASH_MAX_PENDING = int(os.getenv('PASSWORD_HASH_MAX_PENDING', 64))
+    PASSWORD_HASH_TIMEOUT = float(os.getenv('PASSWORD_HASH_TIMEOUT', 10))
+    # Remember recent successful logins for this many seconds (0 = off)
+    CREDENTIAL_CACHE_TTL = int(os.getenv('CREDENTIAL_CACHE_TTL', 0))
+    CREDENTIAL_CACHE_SIZE = int(os.getenv('CREDENTIAL_CACHE_SIZE', 10000))
+
+    # Revoked token ids: 'memory' or 'sqlite' (shared through TOKEN_DENYLIST_PATH)
+    TOKEN_DENYLIST = os.getenv('TOKEN_DENYLIST', 'memory')
+    TOKEN_DENYLIST_SIZE = int(os.getenv('TOKEN_DENYLIST_SIZE', 100000))
+    TOKEN_DENYLIST_PATH = os.getenv('TOKEN_DENYLIST_PATH', 'token_denylist.db')
 
 
 class DevelopmentConfig(Config):
     DEBUG = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///development.db'  # task 6
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    QUERY_COUNTER = True  # X-Query-Count response header
+
+
+class ProductionSQLiteConfig(Config):
+    SQLALCHEMY_DATABASE_URI = os.getenv('DATABASE_URL', 'sqlite:///production.db')
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Set on every pooled connection, see persistence/connections.py.
+    # WAL lets readers run while a write is in progress; NORMAL only syncs
+    # at checkpoints, so a power loss can drop the last commits but never
+    # corrupts the database.
+    SQLITE_PRAGMAS = {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'foreign_keys': 'ON',
+        'busy_timeout': int(os.getenv('SQLITE_BUSY_TIMEOUT_MS', 5000)),
+        'mmap_size': int(os.getenv('SQLITE_MMAP_SIZE', 256 * 1024 * 1024)),
+        'cache_size': -int(os.getenv('SQLITE_CACHE_SIZE_KB', 64 * 1024)),  # negative: KiB
+        'temp_store': 'MEMORY',
+    }
+    # SQLite has one writer at a time, queue for it in the pool rather than
+    # in the busy handler's sleeps
+    DB_POOL_SIZE = int(os.getenv('SQLITE_WRITE_POOL_SIZE', 1))
+    DB_MAX_OVERFLOW = 0
+    # GET requests read through their own pool (opened query_only)
+    SQLITE_READ_POOL = {
+        'pool_size': int(os.getenv('SQLITE_READ_POOL_SIZE', 8)),
+        'max_overflow': 8,
+    }
+
+
+class TestingConfig(Config):
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    QUERY_COUNTER = True
+    # Tests build their schema with db.create_all()
+    DATABASE_AUTO_INIT = False
+    # Cheap hashes computed inline keep the test suite fast
+    BCRYPT_LOG_ROUNDS = 4
+    PASSWORD_HASH_WORKERS = 0
 
 
 config = {
     'development': DevelopmentConfig,
+    'testing': TestingConfig,
+    'production_sqlite': ProductionSQLiteConfig,
     'default': DevelopmentConfig
 }
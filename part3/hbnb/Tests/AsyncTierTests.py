@@ -0,0 +1,199 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+from config import TestingConfig
+from part3.hbnb.app import create_app, db
+from part3.hbnb.app.persistence import asyncrepository
+from part3.hbnb.app.services import facade
+
+ASYNC_TIER = asyncrepository.create_async_engine is not None
+if ASYNC_TIER:
+    from part3.hbnb.app import asgi
+
+
+async def call(app, method, path, query=b'', body=b'', headers=()):
+    """Run one request through an ASGI app, return (status, headers, body)"""
+    scope = {'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': method,
+             'scheme': 'http', 'path': path, 'raw_path': path.encode(), 'root_path': '',
+             'query_string': query,
+             'headers': [(b'host', b'testserver'), (b'content-length', str(len(body)).encode()), *headers],
+             'server': ('testserver', 80), 'client': ('127.0.0.1', 1234)}
+    received = False
+    messages = []
+
+    async def receive():
+        nonlocal received
+        if received:
+            await asyncio.Event().wait()
+        received = True
+        return {'type': 'http.request', 'body': body, 'more_body': False}
+
+    async def send(message):
+        messages.append(message)
+
+    await app(scope, receive, send)
+    start = messages[0]
+    chunks = [message.get('body', b'') for message in messages[1:]]
+    return start['status'], dict(start['headers']), chunks
+
+
+@unittest.skipUnless(ASYNC_TIER, 'aiosqlite and greenlet are not installed')
+class TestAsyncTier(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        uri = 'sqlite:///' + os.path.join(self.tmp.name, 'hbnb.db')
+
+        class FileConfig(TestingConfig):
+            SQLALCHEMY_DATABASE_URI = uri
+            ASYNC_DB_POOL_SIZE = 2
+
+        self.app = asgi.create_asgi_app(FileConfig)
+        self.flask = self.app.flask_app.test_client()
+        with self.app.flask_app.app_context():
+            db.create_all()
+            owner = facade.create_user({'first_name': 'Jane', 'last_name': 'Doe',
+                                        'email': 'jane@example.com', 'password': 'secret'})
+            guests = [facade.create_user({'first_name': f'Guest {i}', 'last_name': 'Smith',
+                                          'email': f'guest{i}@example.com', 'password': 'secret'})
+                      for i in range(5)]
+            self.place_ids = [facade.create_place({'title': f'Flat {i}', 'description': '', 'price': 50.0 + i,
+                                                   'latitude': 48.85, 'longitude': 2.35,
+                                                   'owner_id': owner.id}).id
+                              for i in range(3)]
+            for i, guest in enumerate(guests):
+                facade.create_review({'text': f'Review {i}', 'rating': i % 5 + 1, 'user_id': guest.id,
+                                      'place_id': self.place_ids[0]})
+            self.amenity_id = facade.create_amenity({'name': 'WiFi'}).id
+            facade.create_amenity({'name': 'Pool'})
+
+    async def asyncTearDown(self):
+        await self.app.engine.dispose()
+
+    def tearDown(self):
+        with self.app.flask_app.app_context():
+            db.session.remove()
+            db.engine.dispose()
+        self.tmp.cleanup()
+
+    async def assertSameAsFlask(self, path, query=''):
+        status, headers, chunks = await call(self.app, 'GET', path, query.encode())
+        expected = self.flask.get(f'{path}?{query}' if query else path)
+        self.assertEqual(status, expected.status_code, path)
+        self.assertEqual(headers[b'content-type'], b'application/json')
+        self.assertEqual(json.loads(b''.join(chunks)), expected.get_json(), path)
+        return chunks
+
+    async def test_list_endpoints_match_flask(self):
+        for path in ('/api/v1/places/', '/api/v1/amenities/', '/api/v1/reviews/'):
+            await self.assertSameAsFlask(path)
+            await self.assertSameAsFlask(path, 'limit=1')
+
+    async def test_pages_follow_the_cursor(self):
+        status, _, chunks = await call(self.app, 'GET', '/api/v1/places/', b'limit=2')
+        first = json.loads(b''.join(chunks))
+        await self.assertSameAsFlask('/api/v1/places/', f"limit=2&cursor={first['next_cursor']}")
+
+    async def test_detail_endpoints_match_flask(self):
+        await self.assertSameAsFlask(f'/api/v1/places/{self.place_ids[0]}')
+        await self.assertSameAsFlask(f'/api/v1/places/{self.place_ids[1]}')
+        await self.assertSameAsFlask('/api/v1/places/unknown')
+        await self.assertSameAsFlask(f'/api/v1/amenities/{self.amenity_id}')
+
+    async def test_missing_amenity(self):
+        status, _, chunks = await call(self.app, 'GET', '/api/v1/amenities/unknown')
+        self.assertEqual(status, 404)
+        self.assertEqual(json.loads(b''.join(chunks)), {'message': 'Amenity not found'})
+
+    async def test_invalid_page_arguments(self):
+        await self.assertSameAsFlask('/api/v1/places/', 'limit=abc')
+        await self.assertSameAsFlask('/api/v1/reviews/', 'limit=0')
+
+    async def test_place_reviews_are_streamed(self):
+        with mock.patch.object(asgi, 'STREAM_CHUNK_SIZE', 2):
+            chunks = await self.assertSameAsFlask(f'/api/v1/reviews/places/{self.place_ids[0]}/reviews')
+        # '[', three chunks of rows, ']' and the closing empty body
+        self.assertEqual(len(chunks), 6)
+        await self.assertSameAsFlask(f'/api/v1/reviews/places/{self.place_ids[0]}/reviews', 'limit=2')
+        await self.assertSameAsFlask(f'/api/v1/reviews/places/{self.place_ids[1]}/reviews')
+
+    async def test_other_requests_go_to_flask(self):
+        await self.assertSameAsFlask('/api/v1/places/search', 'min_price=51')
+        await self.assertSameAsFlask(f'/api/v1/places/{self.place_ids[0]}', 'expand=owner,reviews')
+        status, _, chunks = await call(self.app, 'POST', '/api/v1/amenities/', body=b'{"name": "Sauna"}',
+                                       headers=[(b'content-type', b'application/json')])
+        self.assertEqual(status, 201)
+        status, _, chunks = await call(self.app, 'GET', '/api/v1/amenities/')
+        self.assertIn('Sauna', [amenity['name'] for amenity in json.loads(b''.join(chunks))])
+
+    async def test_concurrent_requests_share_the_pool(self):
+        paths = [f'/api/v1/places/{place_id}' for place_id in self.place_ids] * 20
+        results = await asyncio.gather(*(call(self.app, 'GET', path) for path in paths))
+        self.assertEqual({status for status, _, _ in results}, {200})
+        self.assertLessEqual(self.app.engine.pool.checkedout(), 2)
+
+    async def test_lifespan(self):
+        messages = [{'type': 'lifespan.startup'}, {'type': 'lifespan.shutdown'}]
+        sent = []
+
+        async def receive():
+            return messages.pop(0)
+
+        async def send(message):
+            sent.append(message['type'])
+
+        await self.app({'type': 'lifespan'}, receive, send)
+        self.assertEqual(sent, ['lifespan.startup.complete', 'lifespan.shutdown.complete'])
+
+
+@unittest.skipUnless(ASYNC_TIER, 'aiosqlite and greenlet are not installed')
+class TestAsyncRepository(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        uri = 'sqlite:///' + os.path.join(self.tmp.name, 'hbnb.db')
+
+        class FileConfig(TestingConfig):
+            SQLALCHEMY_DATABASE_URI = uri
+
+        self.app = create_app(FileConfig)
+        with self.app.app_context():
+            db.create_all()
+            self.amenity_model = facade.amenity_repo.model
+        self.engine, sessions = asyncrepository.create_async_database(uri, self.app.config)
+        self.repo = asyncrepository.AsyncSQLAlchemyRepository(self.amenity_model, sessions)
+
+    async def asyncTearDown(self):
+        await self.engine.dispose()
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.engine.dispose()
+        self.tmp.cleanup()
+
+    async def test_add_and_read_back(self):
+        with self.app.app_context():
+            count, _ = facade.get_collection_version('amenity')
+        amenity = self.amenity_model(name='WiFi')
+        await self.repo.add(amenity)
+        self.assertEqual((await self.repo.get(amenity.id)).name, 'WiFi')
+        self.assertEqual([a.name for a in await self.repo.get_all()], ['WiFi'])
+        self.assertEqual((await self.repo.get_by_attribute('name', 'WiFi')).id, amenity.id)
+        self.assertIsNone(await self.repo.get_by_attribute('name', 'Pool'))
+        self.assertIsNone(await self.repo.get('unknown'))
+        # The sync side sees the write, and its collection version moved
+        with self.app.app_context():
+            self.assertEqual(facade.get_amenity(amenity.id).name, 'WiFi')
+            self.assertEqual(facade.get_collection_version('amenity')[0], count + 1)
+
+    def test_only_sqlite(self):
+        with self.assertRaises(ValueError):
+            asyncrepository.async_url('postgresql://db/hbnb')
+        self.assertEqual(asyncrepository.async_url('sqlite:////tmp/hbnb.db').drivername, 'sqlite+aiosqlite')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+import unittest
+from flask_jwt_extended import create_access_token
+from part3.hbnb.app import create_app, db
+from part3.hbnb.app.services import facade
+
+
+class TestAuthorization(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.create_all()
+            owner = facade.create_user({
+                'first_name': 'Jane',
+                'last_name': 'Doe',
+                'email': 'jane.doe@example.com',
+                'password': 'secret'
+            })
+            guest = facade.create_user({
+                'first_name': 'John',
+                'last_name': 'Smith',
+                'email': 'john.smith@example.com',
+                'password': 'secret'
+            })
+            self.place_id = facade.create_place({
+                'title': 'Paris flat',
+                'description': 'A cozy place',
+                'price': 80.0,
+                'latitude': 48.85,
+                'longitude': 2.35,
+                'owner_id': owner.id
+            }).id
+            self.review_id = facade.create_review({
+                'text': 'Great stay',
+                'rating': 5,
+                'user_id': guest.id,
+                'place_id': self.place_id
+            }).id
+            self.owner = self.auth(owner.id)
+            self.guest = self.auth(guest.id)
+            self.admin = self.auth('admin', is_admin=True)
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.drop_all()
+
+    def auth(self, user_id, is_admin=False):
+        token = create_access_token(identity={'id': user_id, 'is_admin': is_admin})
+        return {'Authorization': f'Bearer {token}'}
+
+    def test_admin_required(self):
+        response = self.client.get('/api/v1/admin/cache-stats', headers=self.guest)
+        self.assertEqual(response.status_code, 403)
+        response = self.client.get('/api/v1/admin/cache-stats', headers=self.admin)
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get('/api/v1/admin/cache-stats')
+        self.assertEqual(response.status_code, 401)
+
+    def test_owner_check_is_one_query(self):
+        response = self.client.put(f'/api/v1/places/{self.place_id}', headers=self.guest,
+                                   json={'title': 'Mine now'})
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(response.headers['X-Query-Count'], '1')
+
+    def test_owner_can_update_place(self):
+        response = self.client.put(f'/api/v1/places/{self.place_id}', headers=self.owner,
+                                   json={'title': 'Paris loft'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()['title'], 'Paris loft')
+
+    def test_unknown_resource(self):
+        response = self.client.delete('/api/v1/reviews/unknown', headers=self.guest)
+        self.assertEqual(response.status_code, 404)
+
+    def test_review_author_and_admin(self):
+        response = self.client.delete(f'/api/v1/reviews/{self.review_id}', headers=self.owner)
+        self.assertEqual(response.status_code, 403)
+        response = self.client.put(f'/api/v1/reviews/{self.review_id}', headers=self.guest,
+                                   json={'text': 'Still great', 'rating': 4})
+        self.assertEqual(response.status_code, 200)
+        response = self.client.delete(f'/api/v1/reviews/{self.review_id}', headers=self.admin)
+        self.assertEqual(response.status_code, 200)
+
+    def test_logout_revokes_token(self):
+        response = self.client.get('/api/v1/auth/protected', headers=self.guest)
+        self.assertEqual(response.status_code, 200)
+        response = self.client.post('/api/v1/auth/logout', headers=self.guest)
+        self.assertEqual(response.status_code, 200)
+        response = self.client.get('/api/v1/auth/protected', headers=self.guest)
+        self.assertEqual(response.status_code, 401)
+        # Other tokens are unaffected
+        response = self.client.get('/api/v1/auth/protected', headers=self.owner)
+        self.assertEqual(response.status_code, 200)
+
+
+if __name__ == '__main__':
+    unittest.main()
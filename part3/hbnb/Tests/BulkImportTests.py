@@ -0,0 +1,114 @@
+import json
+import unittest
+from flask_jwt_extended import create_access_token
+from part3.hbnb.app import create_app, db
+from part3.hbnb.app.models.amenity import Amenity
+from part3.hbnb.app.models.place import Place
+from part3.hbnb.app.persistence.querycount import count_queries
+from part3.hbnb.app.services import facade
+
+
+def place_row(title, price=100.0, **extra):
+    return dict({'title': title, 'description': '', 'price': price,
+                 'latitude': 48.85, 'longitude': 2.35}, **extra)
+
+
+class TestBulkImport(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.app.config['BULK_CHUNK_SIZE'] = 2
+        self.client = self.app.test_client()
+        self.client.testing = True
+        with self.app.app_context():
+            db.create_all()
+            admin = facade.create_user({
+                'first_name': 'Jane',
+                'last_name': 'Doe',
+                'email': 'jane.doe@example.com',
+                'password': 'secret',
+                'is_admin': True
+            })
+            self.admin_id = admin.id
+            self.amenity_id = facade.create_amenity({'name': 'WiFi'}).id
+            token = create_access_token(identity={'id': admin.id, 'is_admin': True})
+        self.headers = {'Authorization': f'Bearer {token}'}
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.drop_all()
+
+    def test_json_array_with_row_errors(self):
+        rows = [place_row('A'), place_row('B', price=0), place_row('C'),
+                place_row('D', owner_id='unknown'), place_row('E')]
+        response = self.client.post('/api/v1/places/bulk', headers=self.headers, json=rows)
+
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual(response.json['created'], 3)
+        self.assertEqual([e['index'] for e in response.json['errors']], [1, 3])
+        self.assertEqual(response.json['errors'][1]['error'], 'Owner not found')
+        with self.app.app_context():
+            places = Place.query.order_by(Place.title).all()
+            self.assertEqual([p.title for p in places], ['A', 'C', 'E'])
+            self.assertTrue(all(p.geohash for p in places))
+
+    def test_ndjson_stream(self):
+        lines = [json.dumps(place_row(f'Place {i}')) for i in range(5)]
+        lines.insert(2, '{not json')
+        response = self.client.post('/api/v1/places/bulk', headers=self.headers,
+                                    data='\n'.join(lines), content_type='application/x-ndjson')
+
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual(response.json['created'], 5)
+        self.assertEqual(response.json['errors'], [{'index': 2, 'error': 'Invalid JSON'}])
+
+    def test_one_owner_query_per_chunk(self):
+        with self.app.app_context():
+            with count_queries() as statements:
+                result = facade.create_places_bulk(
+                    [place_row(f'Place {i}', owner_id=self.admin_id) for i in range(10)], chunk_size=5)
+            self.assertEqual(len(result.created), 10)
+            selects = [s for s in statements if s.lstrip().upper().startswith('SELECT')]
+            inserts = [s for s in statements if s.lstrip().upper().startswith('INSERT')]
+            self.assertEqual(len(selects), 2)
+            self.assertEqual(len(inserts), 2)
+
+    def test_place_amenities_bulk(self):
+        with self.app.app_context():
+            place_id = facade.create_places_bulk([place_row('A', owner_id=self.admin_id)]).created[0]
+        rows = [{'place_id': place_id, 'amenity_id': self.amenity_id},
+                {'place_id': place_id, 'amenity_id': 'unknown'}]
+        response = self.client.post('/api/v1/placeamenities/bulk', headers=self.headers, json=rows)
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual(response.json['errors'], [{'index': 1, 'error': 'Amenity not found'}])
+
+    def test_non_string_ids_only_reject_their_row(self):
+        rows = [place_row('A'), place_row('B', owner_id=['x']), place_row('C', owner_id={'id': 'x'})]
+        response = self.client.post('/api/v1/places/bulk', headers=self.headers, json=rows)
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual(response.json['created'], 1)
+        self.assertEqual(response.json['errors'], [{'index': 1, 'error': 'owner_id must be a string'},
+                                                   {'index': 2, 'error': 'owner_id must be a string'}])
+
+        with self.app.app_context():
+            place_id = facade.create_places_bulk([place_row('D', owner_id=self.admin_id)]).created[0]
+        rows = [{'place_id': place_id, 'amenity_id': {'id': self.amenity_id}},
+                {'place_id': [place_id], 'amenity_id': self.amenity_id},
+                {'place_id': place_id, 'amenity_id': self.amenity_id}]
+        response = self.client.post('/api/v1/placeamenities/bulk', headers=self.headers, json=rows)
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual(response.json['created'], 1)
+        self.assertEqual(response.json['errors'], [{'index': 0, 'error': 'amenity_id must be a string'},
+                                                   {'index': 1, 'error': 'place_id must be a string'}])
+
+    def test_database_error_only_rejects_its_row(self):
+        with self.app.app_context():
+            first, duplicate, last = Amenity('Pool'), Amenity('Gym'), Amenity('Spa')
+            first.id = duplicate.id = 'same-id'
+            failed = facade.amenity_repo.add_many([first, duplicate, last])
+            self.assertEqual(list(failed), [1])
+            self.assertEqual(Amenity.query.count(), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,128 @@
+import gzip
+import json
+import unittest
+from unittest import mock
+from part3.hbnb.app import create_app, db, compression
+from part3.hbnb.app.services import facade
+from part3.hbnb.Tests.ResponseCacheTests import CachedConfig
+
+
+class TestCompression(unittest.TestCase):
+    config = "config.TestingConfig"
+    streamed = True
+
+    def setUp(self):
+        self.app = create_app(self.config)
+        self.app.config['COMPRESS_MIN_SIZE'] = 200
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.create_all()
+            owner = facade.create_user({
+                'first_name': 'Jane',
+                'last_name': 'Doe',
+                'email': 'jane.doe@example.com',
+                'password': 'secret'
+            })
+            guest = facade.create_user({
+                'first_name': 'John',
+                'last_name': 'Smith',
+                'email': 'john.smith@example.com',
+                'password': 'secret'
+            })
+            self.place_id = None
+            for i in range(10):
+                self.place_id = facade.create_place({
+                    'title': f'Place {i}',
+                    'description': 'A cozy place',
+                    'price': 80.0,
+                    'latitude': 48.85,
+                    'longitude': 2.35,
+                    'owner_id': owner.id
+                }).id
+            facade.create_review({
+                'text': 'Great stay ' * 50,
+                'rating': 4,
+                'user_id': guest.id,
+                'place_id': self.place_id
+            })
+            self.amenity_id = facade.create_amenity({'name': 'Wi-Fi'}).id
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.drop_all()
+
+    def test_gzip(self):
+        plain = self.client.get('/api/v1/places/')
+        response = self.client.get('/api/v1/places/', headers={'Accept-Encoding': 'gzip'})
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response.headers['Vary'])
+        self.assertLess(len(response.get_data()), len(plain.get_data()))
+        self.assertEqual(gzip.decompress(response.get_data()), plain.get_data())
+        self.assertEqual(int(response.headers['Content-Length']), len(response.get_data()))
+        # Weak validators survive compression
+        self.assertEqual(response.headers['ETag'], plain.headers['ETag'])
+
+    def test_identity_without_accept_encoding(self):
+        response = self.client.get('/api/v1/places/')
+        self.assertNotIn('Content-Encoding', response.headers)
+        self.assertIn('Accept-Encoding', response.headers['Vary'])
+        refused = self.client.get('/api/v1/places/', headers={'Accept-Encoding': 'gzip;q=0, br;q=0'})
+        self.assertNotIn('Content-Encoding', refused.headers)
+
+    def test_small_bodies_are_not_compressed(self):
+        response = self.client.get(f'/api/v1/amenities/{self.amenity_id}', headers={'Accept-Encoding': 'gzip'})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('Content-Encoding', response.headers)
+
+    @unittest.skipIf(compression.brotli is None, 'brotli is not installed')
+    def test_brotli_preferred(self):
+        plain = self.client.get('/api/v1/places/')
+        response = self.client.get('/api/v1/places/', headers={'Accept-Encoding': 'gzip, deflate, br'})
+        self.assertEqual(response.headers['Content-Encoding'], 'br')
+        self.assertEqual(compression.brotli.decompress(response.get_data()), plain.get_data())
+
+        gzip_first = self.client.get('/api/v1/places/', headers={'Accept-Encoding': 'br;q=0.5, gzip'})
+        self.assertEqual(gzip_first.headers['Content-Encoding'], 'gzip')
+
+    def test_streamed_list(self):
+        url = f'/api/v1/reviews/places/{self.place_id}/reviews'
+        response = self.client.get(url, headers={'Accept-Encoding': 'gzip'})
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        if self.streamed:
+            self.assertNotIn('Content-Length', response.headers)
+        reviews = json.loads(gzip.decompress(response.get_data()))
+        self.assertEqual(reviews[0]['rating'], 4)
+
+    def test_disabled(self):
+        self.app.config['COMPRESS_RESPONSES'] = False
+        response = self.client.get('/api/v1/places/', headers={'Accept-Encoding': 'gzip'})
+        self.assertNotIn('Content-Encoding', response.headers)
+
+
+class TestCompressedResponseCache(TestCompression):
+    """Same behaviour through the response cache, which stores compressed bytes"""
+    config = CachedConfig
+    # Bodies under RESPONSE_CACHE_MAX_BODY are collected to be stored
+    streamed = False
+
+    def tearDown(self):
+        super().tearDown()
+        self.app.extensions['response_cache'].clear()
+
+    def test_hit_is_not_recompressed(self):
+        first = self.client.get('/api/v1/places/', headers={'Accept-Encoding': 'gzip'})
+        with mock.patch.object(compression, '_compressor', side_effect=AssertionError('recompressed')):
+            hit = self.client.get('/api/v1/places/', headers={'Accept-Encoding': 'gzip'})
+        self.assertEqual(hit.headers['X-Cache'], 'HIT')
+        self.assertEqual(hit.headers['Content-Encoding'], 'gzip')
+        self.assertEqual(hit.get_data(), first.get_data())
+
+    def test_encodings_are_cached_separately(self):
+        self.client.get('/api/v1/places/', headers={'Accept-Encoding': 'gzip'})
+        plain = self.client.get('/api/v1/places/')
+        self.assertEqual(plain.headers['X-Cache'], 'MISS')
+        self.assertNotIn('Content-Encoding', plain.headers)
+
+
+if __name__ == '__main__':
+    unittest.main()
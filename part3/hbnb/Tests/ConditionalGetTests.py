@@ -0,0 +1,150 @@
+import unittest
+from flask_jwt_extended import create_access_token
+from werkzeug.http import http_date
+from part3.hbnb.app import create_app, db
+from part3.hbnb.app.services import facade
+
+
+class TestConditionalGet(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.create_all()
+            owner = facade.create_user({
+                'first_name': 'Jane',
+                'last_name': 'Doe',
+                'email': 'jane.doe@example.com',
+                'password': 'secret'
+            })
+            guest = facade.create_user({
+                'first_name': 'John',
+                'last_name': 'Smith',
+                'email': 'john.smith@example.com',
+                'password': 'secret'
+            })
+            self.place_id = facade.create_place({
+                'title': 'Paris flat',
+                'description': 'A cozy place',
+                'price': 80.0,
+                'latitude': 48.85,
+                'longitude': 2.35,
+                'owner_id': owner.id
+            }).id
+            self.amenity_id = facade.create_amenity({'name': 'Wi-Fi'}).id
+            self.guest_id = guest.id
+            self.guest_headers = {'Authorization': 'Bearer ' + create_access_token(
+                identity={'id': guest.id, 'is_admin': False})}
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.drop_all()
+
+    def revalidate(self, url, response, **headers):
+        return self.client.get(url, headers={'If-None-Match': response.headers['ETag'], **headers})
+
+    def add_review(self, rating=4):
+        with self.app.app_context():
+            return facade.create_review({
+                'text': 'Great stay',
+                'rating': rating,
+                'user_id': self.guest_id,
+                'place_id': self.place_id
+            }).id
+
+    def test_place_not_modified(self):
+        url = f'/api/v1/places/{self.place_id}'
+        first = self.client.get(url)
+        self.assertEqual(first.status_code, 200)
+        self.assertTrue(first.headers['ETag'].startswith('W/"'))
+        self.assertIn('Last-Modified', first.headers)
+
+        again = self.revalidate(url, first)
+        self.assertEqual(again.status_code, 304)
+        self.assertEqual(again.get_data(), b'')
+        self.assertEqual(again.headers['ETag'], first.headers['ETag'])
+
+    def test_not_modified_skips_loading(self):
+        url = f'/api/v1/places/{self.place_id}'
+        first = self.client.get(url)
+        # Only the version lookup runs, the place isn't loaded or serialized
+        self.assertEqual(self.revalidate(url, first).headers['X-Query-Count'], '1')
+
+    def test_update_changes_etag(self):
+        url = f'/api/v1/places/{self.place_id}'
+        first = self.client.get(url)
+        with self.app.app_context():
+            facade.update_place(self.place_id, {'title': 'Renamed flat'})
+        again = self.revalidate(url, first)
+        self.assertEqual(again.status_code, 200)
+        self.assertEqual(again.get_json()['title'], 'Renamed flat')
+        self.assertNotEqual(again.headers['ETag'], first.headers['ETag'])
+
+    def test_review_changes_place_etag(self):
+        url = f'/api/v1/places/{self.place_id}'
+        first = self.client.get(url)
+        self.add_review()
+        again = self.revalidate(url, first)
+        self.assertEqual(again.status_code, 200)
+        self.assertEqual(again.get_json()['review_count'], 1)
+
+    def test_if_modified_since(self):
+        url = f'/api/v1/amenities/{self.amenity_id}'
+        first = self.client.get(url)
+        again = self.client.get(url, headers={'If-Modified-Since': first.headers['Last-Modified']})
+        self.assertEqual(again.status_code, 304)
+
+        stale = self.client.get(url, headers={'If-Modified-Since': http_date(0)})
+        self.assertEqual(stale.status_code, 200)
+
+    def test_if_none_match_takes_precedence(self):
+        url = f'/api/v1/amenities/{self.amenity_id}'
+        first = self.client.get(url)
+        again = self.client.get(url, headers={'If-None-Match': 'W/"other"',
+                                              'If-Modified-Since': first.headers['Last-Modified']})
+        self.assertEqual(again.status_code, 200)
+
+    def test_missing_resource_has_no_validators(self):
+        response = self.client.get('/api/v1/places/missing', headers={'If-None-Match': '*'})
+        self.assertEqual(response.status_code, 404)
+        self.assertNotIn('ETag', response.headers)
+
+    def test_review_after_authentication(self):
+        review_id = self.add_review()
+        url = f'/api/v1/reviews/{review_id}'
+        self.assertEqual(self.client.get(url, headers={'If-None-Match': '*'}).status_code, 401)
+        first = self.client.get(url, headers=self.guest_headers)
+        self.assertEqual(self.revalidate(url, first, **self.guest_headers).status_code, 304)
+
+    def test_collection_version(self):
+        url = '/api/v1/amenities/'
+        first = self.client.get(url)
+        self.assertEqual(self.revalidate(url, first).status_code, 304)
+
+        with self.app.app_context():
+            facade.create_amenity({'name': 'Pool'})
+            self.assertEqual(facade.get_collection_version('amenity')[0], 2)
+        added = self.revalidate(url, first)
+        self.assertEqual(added.status_code, 200)
+        self.assertEqual(len(added.get_json()), 2)
+
+    def test_place_list_follows_reviews(self):
+        url = '/api/v1/places/'
+        first = self.client.get(url)
+        self.add_review()
+        again = self.revalidate(url, first)
+        self.assertEqual(again.status_code, 200)
+        self.assertEqual(again.get_json()[0]['review_count'], 1)
+
+    def test_version_counted_once_when_missing(self):
+        with self.app.app_context():
+            db.session.execute(db.text('DELETE FROM collection_version'))
+            db.session.commit()
+            self.assertEqual(facade.get_collection_version('place')[0], 1)
+            facade.create_amenity({'name': 'Pool'})
+            self.assertEqual(facade.get_collection_version('amenity')[0], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,198 @@
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+from sqlalchemy import event, text
+from sqlalchemy.exc import OperationalError
+from config import ProductionSQLiteConfig
+from part3.hbnb.app import create_app, db, hashing
+from part3.hbnb.app.persistence import connections, identitymap
+from part3.hbnb.app.services import facade
+
+
+def production_config(path):
+    uri = 'sqlite:///' + path
+
+    class FileConfig(ProductionSQLiteConfig):
+        SQLALCHEMY_DATABASE_URI = uri
+        SECRET_KEY = 'test'
+        DATABASE_AUTO_INIT = True
+        BCRYPT_LOG_ROUNDS = 4
+        PASSWORD_HASH_WORKERS = 0
+
+    return FileConfig
+
+
+class TestProductionSQLite(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.app = create_app(production_config(os.path.join(self.tmp.name, 'hbnb.db')))
+        self.client = self.app.test_client()
+        self.statements = {'write': [], 'read': []}
+        with self.app.app_context():
+            self.engines = {'write': db.engine, 'read': connections.read_engine(self.app)}
+        for name, engine in self.engines.items():
+            event.listen(engine, 'before_cursor_execute', self._recorder(name))
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            for engine in self.engines.values():
+                engine.dispose()
+        self.tmp.cleanup()
+
+    def _recorder(self, name):
+        def record(conn, cursor, statement, parameters, context, executemany):
+            self.statements[name].append(statement)
+        return record
+
+    def pragma(self, engine, name):
+        with engine.connect() as conn:
+            return conn.execute(text(f'PRAGMA {name}')).scalar()
+
+    def test_pragmas_on_every_pooled_connection(self):
+        for name, engine in self.engines.items():
+            pooled = [engine.connect() for _ in range(engine.pool.size())]
+            for conn in pooled:
+                self.assertEqual(conn.execute(text('PRAGMA journal_mode')).scalar(), 'wal')
+                self.assertEqual(conn.execute(text('PRAGMA synchronous')).scalar(), 1)  # NORMAL
+                self.assertEqual(conn.execute(text('PRAGMA temp_store')).scalar(), 2)  # MEMORY
+                self.assertEqual(conn.execute(text('PRAGMA foreign_keys')).scalar(), 1)
+                self.assertEqual(conn.execute(text('PRAGMA busy_timeout')).scalar(), 5000)
+                self.assertEqual(conn.execute(text('PRAGMA cache_size')).scalar(), -65536)
+                self.assertGreater(conn.execute(text('PRAGMA mmap_size')).scalar(), 0)
+            for conn in pooled:
+                conn.close()
+
+    def test_read_connections_are_query_only(self):
+        self.assertEqual(self.pragma(self.engines['write'], 'query_only'), 0)
+        self.assertEqual(self.pragma(self.engines['read'], 'query_only'), 1)
+        with self.engines['read'].connect() as conn:
+            with self.assertRaises(OperationalError):
+                conn.execute(text("INSERT INTO Amenity (id, name) VALUES ('x', 'Sauna')"))
+
+    def test_get_request_reads_from_the_read_pool(self):
+        amenity_id = self.client.post('/api/v1/amenities/', json={'name': 'Sauna'}).get_json()['id']
+        self.assertEqual(self.statements['read'], [])
+
+        response = self.client.get(f'/api/v1/amenities/{amenity_id}')
+        self.assertEqual(response.get_json()['name'], 'Sauna')
+        self.assertTrue(self.statements['read'])
+        self.assertFalse(any(statement.lstrip().upper().startswith(('INSERT', 'UPDATE', 'DELETE'))
+                             for statement in self.statements['read']))
+
+    def test_write_request_reads_its_own_writes(self):
+        """Reads inside a unit of work see its uncommitted changes"""
+        with self.app.test_request_context('/', method='POST'):
+            with facade.transaction():
+                amenity = facade.create_amenity({'name': 'Sauna'})
+                identitymap.clear()
+                self.assertEqual(facade.get_amenity(amenity.id).name, 'Sauna')
+        self.assertEqual(self.statements['read'], [])
+
+    def test_outside_requests_everything_uses_the_default_engine(self):
+        with self.app.app_context():
+            facade.create_amenity({'name': 'Sauna'})
+            self.assertEqual(len(facade.get_all_amenities()), 4)  # with the 3 seeded ones
+        self.assertEqual(self.statements['read'], [])
+
+    def test_readers_are_not_blocked_by_an_open_write(self):
+        amenity_id = self.client.post('/api/v1/amenities/', json={'name': 'Sauna'}).get_json()['id']
+        holding = threading.Event()
+        release = threading.Event()
+
+        def writer():
+            with self.app.test_request_context('/', method='POST'):
+                with facade.transaction():
+                    facade.update_amenity(amenity_id, {'name': 'Hammam'})
+                    holding.set()
+                    release.wait(5)
+
+        thread = threading.Thread(target=writer)
+        thread.start()
+        try:
+            self.assertTrue(holding.wait(5))
+            # The single write connection is taken and its transaction open
+            response = self.client.get(f'/api/v1/amenities/{amenity_id}')
+            self.assertEqual(response.get_json()['name'], 'Sauna')
+        finally:
+            release.set()
+            thread.join()
+        self.assertEqual(self.client.get(f'/api/v1/amenities/{amenity_id}').get_json()['name'], 'Hammam')
+
+
+class TestWritesDuringHashing(unittest.TestCase):
+    """A request hashing a password holds neither the write lock nor the
+    single write connection, so other writers don't wait for bcrypt"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+        class ShortWaits(production_config(os.path.join(self.tmp.name, 'hbnb.db'))):
+            # Fail fast instead of queueing behind a held lock or connection
+            SQLITE_PRAGMAS = {**ProductionSQLiteConfig.SQLITE_PRAGMAS, 'busy_timeout': 200}
+            DB_POOL_TIMEOUT = 1
+
+        self.app = create_app(ShortWaits)
+        with self.app.app_context():
+            facade.create_user({'first_name': 'Jane', 'last_name': 'Doe',
+                                'email': 'jane@example.com', 'password': 'secret'})
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.engine.dispose()
+            connections.read_engine(self.app).dispose()
+        self.tmp.cleanup()
+
+    def assertWriteSucceedsWhileHashing(self, hash_function, request):
+        hashing_started = threading.Event()
+        written = threading.Event()
+        real = getattr(hashing, hash_function)
+        responses = []
+
+        def slow_hash(*args):
+            hashing_started.set()
+            written.wait(5)
+            return real(*args)
+
+        def hashing_request():
+            responses.append(request(self.app.test_client()))
+
+        with mock.patch.object(hashing, hash_function, slow_hash):
+            thread = threading.Thread(target=hashing_request)
+            thread.start()
+            try:
+                self.assertTrue(hashing_started.wait(5))
+                response = self.app.test_client().post('/api/v1/amenities/', json={'name': 'Sauna'})
+                self.assertEqual(response.status_code, 201)
+            finally:
+                written.set()
+                thread.join()
+        return responses[0]
+
+    def test_write_during_login(self):
+        response = self.assertWriteSucceedsWhileHashing('_check', lambda client: client.post(
+            '/api/v1/auth/login', json={'email': 'jane@example.com', 'password': 'secret'}))
+        self.assertEqual(response.status_code, 200)
+
+    def test_write_during_registration(self):
+        response = self.assertWriteSucceedsWhileHashing('_hash', lambda client: client.post(
+            '/api/v1/users/', json={'first_name': 'John', 'last_name': 'Smith', 'email': 'john@example.com',
+                                    'is_admin': False, 'password': 'secret'}))
+        self.assertEqual(response.status_code, 201)
+
+
+class TestDefaultConfig(unittest.TestCase):
+
+    def test_testing_config_has_no_read_engine(self):
+        app = create_app("config.TestingConfig")
+        self.assertIsNone(connections.read_engine(app))
+        with app.app_context():
+            self.assertEqual(db.session.execute(text('PRAGMA query_only')).scalar(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
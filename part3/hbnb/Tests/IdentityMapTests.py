@@ -0,0 +1,62 @@
+import unittest
+from flask import g
+from part3.hbnb.app import create_app, db
+from part3.hbnb.app.persistence.querycount import count_queries
+from part3.hbnb.app.services import facade
+
+
+class TestRequestIdentityMap(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        with self.app.app_context():
+            db.create_all()
+            owner = facade.create_user({
+                'first_name': 'Jane',
+                'last_name': 'Doe',
+                'email': 'jane.doe@example.com',
+                'password': 'secret'
+            })
+            self.place_id = facade.create_place({
+                'title': 'Paris flat',
+                'description': 'A cozy place',
+                'price': 80.0,
+                'latitude': 48.85,
+                'longitude': 2.35,
+                'owner_id': owner.id
+            }).id
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.drop_all()
+
+    def test_same_row_loaded_once_per_request(self):
+        with self.app.test_request_context():
+            with count_queries() as statements:
+                first = facade.get_place(self.place_id)
+                second = facade.get_place(self.place_id)
+                facade.update_place(self.place_id, {'title': 'Paris loft'})
+            self.assertIs(first, second)
+            selects = [s for s in statements if s.lstrip().upper().startswith('SELECT')]
+            self.assertEqual(len(selects), 1)
+
+    def test_missing_row_is_remembered(self):
+        with self.app.test_request_context():
+            with count_queries() as statements:
+                self.assertIsNone(facade.get_place('unknown'))
+                self.assertIsNone(facade.get_place('unknown'))
+            self.assertEqual(len(statements), 1)
+
+    def test_map_cleared_between_requests(self):
+        with self.app.test_request_context():
+            facade.get_place(self.place_id)
+            self.assertIn('identity_map', g)
+        with self.app.test_request_context():
+            self.assertNotIn('identity_map', g)
+            with count_queries() as statements:
+                facade.get_place(self.place_id)
+            self.assertEqual(len(statements), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
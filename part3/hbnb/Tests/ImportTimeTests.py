@@ -0,0 +1,59 @@
+import os
+import re
+import subprocess
+import sys
+import unittest
+
+PART3 = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+ROOT = os.path.dirname(PART3)
+
+# Self time of this package's own modules while importing it and creating an
+# app, as reported by -X importtime. About 130 ms on a single-CPU development
+# container; set HBNB_IMPORT_BUDGET_MS on slower machines.
+OWN_MODULES_BUDGET_MS = float(os.getenv('HBNB_IMPORT_BUDGET_MS', 300))
+
+_IMPORT_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \| *(\S+)$')
+
+
+def importtime(code):
+    """{module: self time in ms} of a fresh interpreter running code"""
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([ROOT, PART3]))
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                            cwd=ROOT, env=env, capture_output=True, text=True, check=True)
+    modules = {}
+    for line in result.stderr.splitlines():
+        match = _IMPORT_LINE.match(line)
+        if match:
+            modules[match.group(3)] = int(match.group(1)) / 1000
+    return modules
+
+
+class TestImportTime(unittest.TestCase):
+
+    def test_package_import_is_light(self):
+        """The API, the facade and the models load with create_app(), not the package"""
+        modules = importtime('import part3.hbnb.app')
+        loaded = [name for name in modules if name.startswith(('part3.hbnb.app.api', 'part3.hbnb.app.services',
+                                                                  'part3.hbnb.app.models'))]
+        self.assertEqual(loaded, [])
+        self.assertNotIn('flask_restx', modules)
+        self.assertNotIn('concurrent.futures.process', modules)
+
+    def test_create_app_defers_first_use_dependencies(self):
+        modules = importtime("from part3.hbnb.app import create_app; create_app('config.TestingConfig')")
+        # The password hashing pool is only started by the first hash
+        self.assertNotIn('concurrent.futures.process', modules)
+        # Repositories are built by the facade on first use
+        self.assertNotIn('part3.hbnb.app.services.repositories.userrepository', modules)
+
+    def test_own_modules_within_budget(self):
+        modules = importtime("from part3.hbnb.app import create_app; create_app('config.TestingConfig')")
+        own = {name: ms for name, ms in modules.items() if name.startswith('part3')}
+        total = sum(own.values())
+        slowest = ', '.join(f'{name} {ms:.1f} ms' for name, ms in sorted(own.items(), key=lambda m: -m[1])[:5])
+        self.assertLessEqual(total, OWN_MODULES_BUDGET_MS,
+                             f'{total:.0f} ms importing this package, slowest: {slowest}')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,216 @@
+import os
+import re
+import sqlite3
+import tempfile
+import unittest
+from sqlalchemy import inspect
+from part3.hbnb.app import create_app, db
+from part3.hbnb.app.persistence import identitymap, migrations
+from part3.hbnb.app.persistence.querycount import count_queries
+from part3.hbnb.app.services import facade
+
+
+class TestMigrations(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'hbnb.db')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_fresh_database(self):
+        conn = sqlite3.connect(self.path)
+        applied = migrations.upgrade_connection(conn)
+        self.assertEqual([m.version for m in applied], [m.version for m in migrations.available_migrations()])
+        # A second run has nothing left to do
+        self.assertEqual(migrations.upgrade_connection(conn), [])
+        self.assertEqual(migrations.pending_migrations(conn), [])
+        columns = [row[1] for row in conn.execute('PRAGMA table_info(Place_Amenity)')]
+        self.assertIn('id', columns)
+        conn.close()
+
+    def test_target_version(self):
+        conn = sqlite3.connect(self.path)
+        applied = migrations.upgrade_connection(conn, target=1)
+        self.assertEqual([m.version for m in applied], [1])
+        self.assertEqual(migrations.applied_versions(conn), {1})
+        conn.close()
+
+    def test_legacy_database_is_adopted(self):
+        """A database built by the old scripts.sql keeps its rows"""
+        conn = sqlite3.connect(self.path)
+        conn.executescript(
+            'CREATE TABLE User (id CHAR(36) PRIMARY KEY, first_name VARCHAR(255) NOT NULL,'
+            ' last_name VARCHAR(255) NOT NULL, email VARCHAR(255) UNIQUE NOT NULL,'
+            ' password VARCHAR(255) NOT NULL, is_admin BOOLEAN DEFAULT FALSE,'
+            ' created_at DATETIME, updated_at DATETIME);'
+            'CREATE TABLE Place (id CHAR(36) PRIMARY KEY, title VARCHAR(255) NOT NULL, description TEXT,'
+            ' price DECIMAL(10, 2) NOT NULL, latitude FLOAT NOT NULL, longitude FLOAT NOT NULL,'
+            ' owner_id CHAR(36), created_at DATETIME, updated_at DATETIME);'
+            'CREATE TABLE Place_Rating_Stats (place_id CHAR(36) PRIMARY KEY, review_count INT NOT NULL DEFAULT 0,'
+            ' rating_sum INT NOT NULL DEFAULT 0, rating_1 INT NOT NULL DEFAULT 0, rating_2 INT NOT NULL DEFAULT 0,'
+            ' rating_3 INT NOT NULL DEFAULT 0, rating_4 INT NOT NULL DEFAULT 0, rating_5 INT NOT NULL DEFAULT 0);'
+            'CREATE TABLE Place_Amenity (place_id CHAR(36), amenity_id CHAR(36), created_at DATETIME,'
+            ' updated_at DATETIME, PRIMARY KEY (place_id, amenity_id));'
+            "INSERT INTO User (id, first_name, last_name, email, password) VALUES ('u1', 'Jane', 'Doe', 'j@d.io', 'x');"
+            "INSERT INTO Place (id, title, price, latitude, longitude, owner_id) VALUES ('p1', 'Flat', 80, 48.85, 2.35, 'u1');"
+            "INSERT INTO Place_Amenity (place_id, amenity_id) VALUES ('p1', 'a1');"
+        )
+        migrations.upgrade_connection(conn)
+        self.assertIsNotNone(conn.execute("SELECT geohash FROM Place WHERE id = 'p1'").fetchone()[0])
+        rows = conn.execute('SELECT id, place_id, amenity_id FROM Place_Amenity').fetchall()
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0][1:], ('p1', 'a1'))
+        self.assertIsNotNone(rows[0][0])
+        stats_columns = [row[1] for row in conn.execute('PRAGMA table_info(Place_Rating_Stats)')]
+        self.assertIn('updated_at', stats_columns)
+        conn.close()
+
+    def test_failed_migration_is_rolled_back(self):
+        directory = os.path.join(self.tmp.name, 'migrations')
+        os.mkdir(directory)
+        with open(os.path.join(directory, '0001_table.sql'), 'w') as script:
+            script.write('CREATE TABLE Thing (id INTEGER PRIMARY KEY);\n')
+        with open(os.path.join(directory, '0002_broken.sql'), 'w') as script:
+            script.write('CREATE TABLE Other (id INTEGER PRIMARY KEY);\nINSERT INTO Missing VALUES (1);\n')
+        conn = sqlite3.connect(self.path)
+        with self.assertRaises(sqlite3.OperationalError):
+            migrations.upgrade_connection(conn, directory=directory)
+        self.assertEqual(migrations.applied_versions(conn), {1})
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        self.assertIn('Thing', tables)
+        self.assertNotIn('Other', tables)
+        conn.close()
+
+    def test_models_indexes_exist_after_migration(self):
+        """Every index the models declare is created by the migrations too"""
+        conn = sqlite3.connect(self.path)
+        migrations.upgrade_connection(conn)
+        created = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        conn.close()
+        declared = {index.name for table in db.metadata.tables.values() for index in table.indexes}
+        self.assertTrue(declared)
+        self.assertEqual(declared - created, set())
+
+    def test_create_all_database_is_adopted(self):
+        class FileConfig:
+            SQLALCHEMY_DATABASE_URI = 'sqlite:///' + self.path
+            SQLALCHEMY_TRACK_MODIFICATIONS = False
+            SECRET_KEY = 'test'
+
+        app = create_app(FileConfig)
+        with app.app_context():
+            db.create_all()
+            migrations.upgrade(db.engine)
+            self.assertEqual(migrations.current_version(db.engine), migrations.available_migrations()[-1].version)
+            self.assertEqual(facade.create_amenity({'name': 'Wi-Fi'}).name, 'Wi-Fi')
+            indexes = {index['name'] for index in inspect(db.engine).get_indexes('place_amenity')}
+            self.assertIn('ix_place_amenity_amenity_id_place_id', indexes)
+            db.session.remove()
+            db.engine.dispose()
+
+
+class TestQueryPlans(unittest.TestCase):
+    """The queries behind the hot paths must be answered through an index.
+
+    Every statement a facade call sends is run through EXPLAIN QUERY PLAN on
+    a migrated database, a plain "SCAN <table>" fails the test.
+    """
+    BARE_SCAN = re.compile(r'^SCAN (\w+)$')
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        migrations.upgrade(db.engine)
+        owner = facade.create_user({
+            'first_name': 'Jane',
+            'last_name': 'Doe',
+            'email': 'jane.doe@example.com',
+            'password': 'secret'
+        })
+        self.guest = facade.create_user({
+            'first_name': 'John',
+            'last_name': 'Smith',
+            'email': 'john.smith@example.com',
+            'password': 'secret'
+        })
+        self.place = facade.create_place({
+            'title': 'Flat',
+            'description': 'A cozy place',
+            'price': 80.0,
+            'latitude': 48.85,
+            'longitude': 2.35,
+            'owner_id': owner.id
+        })
+        self.review = facade.create_review({
+            'text': 'Great stay',
+            'rating': 5,
+            'user_id': self.guest.id,
+            'place_id': self.place.id
+        })
+        self.amenity = facade.create_amenity({'name': 'Wi-Fi'})
+        facade.create_place_amenity({'place_id': self.place.id, 'amenity_id': self.amenity.id})
+        # Lookups must reach the database, not the objects created above
+        db.session.expunge_all()
+        identitymap.clear()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def assertIndexed(self, call, *args, **kwargs):
+        with count_queries() as statements:
+            call(*args, **kwargs)
+        self.assertTrue(statements, f'{call.__name__} sent no query')
+        conn = db.engine.raw_connection()
+        try:
+            for statement in statements:
+                if not statement.lstrip().upper().startswith('SELECT'):
+                    continue
+                plan = conn.execute('EXPLAIN QUERY PLAN ' + statement, [None] * statement.count('?')).fetchall()
+                for row in plan:
+                    detail = row[-1]
+                    self.assertIsNone(self.BARE_SCAN.match(detail),
+                                      f'{call.__name__}: {detail}\n{statement}')
+        finally:
+            conn.close()
+
+    def test_user_by_email(self):
+        self.assertIndexed(facade.get_user_by_email, 'jane.doe@example.com')
+
+    def test_owner_and_version_lookups(self):
+        self.assertIndexed(facade.get_owner_id, 'place', self.place.id)
+        self.assertIndexed(facade.get_owner_id, 'review', self.review.id)
+        self.assertIndexed(facade.get_version, 'place', self.place.id)
+        self.assertIndexed(facade.get_place, self.place.id)
+
+    def test_user_has_reviewed(self):
+        self.assertIndexed(facade.user_has_reviewed, self.guest.id, self.place.id)
+
+    def test_reviews_by_place(self):
+        self.assertIndexed(facade.get_reviews_by_place, self.place.id, limit=10)
+        self.assertIndexed(facade.get_reviews_by_place, self.place.id)
+
+    def test_place_amenities(self):
+        self.assertIndexed(facade.get_place_amenity_by_place, self.place.id)
+
+    def test_keyset_pages(self):
+        self.assertIndexed(facade.get_all_places, limit=10)
+        self.assertIndexed(facade.get_all_reviews, limit=10)
+        self.assertIndexed(facade.get_all_amenities, limit=10)
+
+    def test_search(self):
+        self.assertIndexed(facade.search_places, {'min_price': 50, 'max_price': 100})
+        self.assertIndexed(facade.search_places, {'bbox': (48.0, 2.0, 49.0, 3.0)})
+        self.assertIndexed(facade.search_places, {'amenity_ids': [self.amenity.id], 'max_price': 100})
+
+    def test_nearby(self):
+        self.assertIndexed(facade.get_places_nearby, 48.85, 2.35, 5, 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import unittest
+from part3.hbnb.app import create_app, db
+from part3.hbnb.app.services import facade
+
+
+class TestCursorPagination(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.client = self.app.test_client()
+        self.client.testing = True
+        with self.app.app_context():
+            db.create_all()
+            owner = facade.create_user({
+                'first_name': 'Jane',
+                'last_name': 'Doe',
+                'email': 'jane.doe@example.com',
+                'password': 'secret'
+            })
+            for i in range(7):
+                facade.create_place({
+                    'title': f'Place {i}',
+                    'description': 'A cozy place',
+                    'price': 100.0 + i,
+                    'latitude': 10.0,
+                    'longitude': 20.0,
+                    'owner_id': owner.id
+                })
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.drop_all()
+
+    def test_pages_cover_all_places_once(self):
+        seen = []
+        cursor = None
+        while True:
+            url = '/api/v1/places/?limit=3' + (f'&cursor={cursor}' if cursor else '')
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertLessEqual(len(response.json['results']), 3)
+            seen.extend(place['title'] for place in response.json['results'])
+            cursor = response.json['next_cursor']
+            if not cursor:
+                break
+
+        self.assertEqual(seen, [f'Place {i}' for i in range(7)])
+
+    def test_last_page_has_no_cursor(self):
+        response = self.client.get('/api/v1/places/?limit=7')
+        self.assertEqual(len(response.json['results']), 7)
+        self.assertIsNone(response.json['next_cursor'])
+
+    def test_without_limit_returns_plain_list(self):
+        response = self.client.get('/api/v1/places/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json), 7)
+
+    def test_invalid_cursor(self):
+        response = self.client.get('/api/v1/users/user-list?cursor=not-a-cursor')
+        self.assertEqual(response.status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
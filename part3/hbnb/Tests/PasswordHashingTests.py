@@ -0,0 +1,223 @@
+import threading
+import time
+import unittest
+from flask_jwt_extended import create_access_token
+from part3.hbnb.app import create_app, db, password_hasher
+from part3.hbnb.app.hashing import CredentialCache, HashingBusy, PasswordHasher, hash_cost
+from part3.hbnb.app.services import facade
+
+
+class FakeApp:
+    def __init__(self, **config):
+        self.config = config
+
+
+class TestPasswordHasher(unittest.TestCase):
+
+    def test_hash_and_verify_in_worker_process(self):
+        hasher = PasswordHasher(FakeApp(BCRYPT_LOG_ROUNDS=4, PASSWORD_HASH_WORKERS=1))
+        try:
+            pw_hash = hasher.hash('secret')
+            self.assertTrue(pw_hash.startswith('$2b$04$'))
+            self.assertTrue(hasher.verify(pw_hash, 'secret'))
+            self.assertFalse(hasher.verify(pw_hash, 'wrong'))
+            stats = hasher.stats()
+            self.assertEqual(stats['completed'], 3)
+            self.assertEqual(stats['queue_depth'], 0)
+        finally:
+            hasher.shutdown()
+
+    def test_long_and_invalid_inputs(self):
+        hasher = PasswordHasher(FakeApp(BCRYPT_LOG_ROUNDS=4))
+        pw_hash = hasher.hash('x' * 100)
+        self.assertTrue(hasher.verify(pw_hash, 'x' * 100))
+        self.assertFalse(hasher.verify('not-a-hash', 'secret'))
+        self.assertFalse(hasher.verify(None, 'secret'))
+        with self.assertRaises(ValueError):
+            hasher.hash('')
+
+    def test_full_queue_is_rejected(self):
+        hasher = PasswordHasher(FakeApp(BCRYPT_LOG_ROUNDS=4, PASSWORD_HASH_MAX_PENDING=1))
+        pw_hash = hasher.hash('secret')
+        started, release = threading.Event(), threading.Event()
+
+        def slow(*args):
+            started.set()
+            release.wait(5)
+            return True
+
+        worker = threading.Thread(target=hasher._run, args=(slow,))
+        worker.start()
+        started.wait(5)
+        try:
+            with self.assertRaises(HashingBusy):
+                hasher.verify(pw_hash, 'secret')
+        finally:
+            release.set()
+            worker.join()
+        self.assertEqual(hasher.stats()['rejected'], 1)
+        self.assertEqual(hasher.stats()['max_queue_depth'], 1)
+
+    def test_timeout_keeps_the_slot_until_the_job_ends(self):
+        hasher = PasswordHasher(FakeApp(PASSWORD_HASH_WORKERS=1, PASSWORD_HASH_MAX_PENDING=1,
+                                        PASSWORD_HASH_TIMEOUT=0.05))
+        try:
+            hasher._pool().submit(time.sleep, 0).result()  # Start the worker process
+            with self.assertRaises(HashingBusy):
+                hasher._run(time.sleep, 0.5)
+            # The job still runs in the worker, so it still counts
+            self.assertEqual(hasher.stats()['queue_depth'], 1)
+            with self.assertRaises(HashingBusy):
+                hasher._run(time.sleep, 0)
+            deadline = time.monotonic() + 5
+            while hasher.stats()['queue_depth'] and time.monotonic() < deadline:
+                time.sleep(0.01)
+            stats = hasher.stats()
+            self.assertEqual(stats['queue_depth'], 0)
+            self.assertEqual(stats['timed_out'], 1)
+            self.assertEqual(stats['rejected'], 1)
+            self.assertEqual(stats['completed'], 1)
+        finally:
+            hasher.shutdown()
+
+    def test_credential_cache_skips_bcrypt(self):
+        hasher = PasswordHasher(FakeApp(BCRYPT_LOG_ROUNDS=4, CREDENTIAL_CACHE_TTL=60))
+        pw_hash = hasher.hash('secret')
+        self.assertTrue(hasher.verify(pw_hash, 'secret', user_id='u1'))
+        self.assertTrue(hasher.verify(pw_hash, 'secret', user_id='u1'))
+        self.assertFalse(hasher.verify(pw_hash, 'wrong', user_id='u1'))
+        stats = hasher.stats()
+        # hash + first check + wrong password; the repeated login was a hit
+        self.assertEqual(stats['completed'], 3)
+        self.assertEqual(stats['credential_cache']['hits'], 1)
+        self.assertEqual(stats['credential_cache']['size'], 1)
+
+    def test_credential_cache_keyed_by_stored_hash(self):
+        cache = CredentialCache(max_entries=2, ttl=60)
+        cache.add('u1', 'hash-a', 'secret')
+        self.assertTrue(cache.contains('u1', 'hash-a', 'secret'))
+        self.assertFalse(cache.contains('u1', 'hash-b', 'secret'))
+        self.assertFalse(cache.contains('u2', 'hash-a', 'secret'))
+
+    def test_hash_cost(self):
+        hasher = PasswordHasher(FakeApp(BCRYPT_LOG_ROUNDS=4))
+        self.assertEqual(hash_cost(hasher.hash('secret', rounds=5)), 5)
+        self.assertIsNone(hash_cost('not-a-hash'))
+        self.assertTrue(hasher.needs_rehash(hasher.hash('secret', rounds=5)))
+        self.assertFalse(hasher.needs_rehash(hasher.hash('secret')))
+        self.assertEqual(hasher.stats()['rehashed'], 1)
+
+
+class TestLoginHashing(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.create_all()
+            facade.create_user({
+                'first_name': 'Jane',
+                'last_name': 'Doe',
+                'email': 'jane.doe@example.com',
+                'password': 'secret',
+                'is_admin': True
+            })
+            self.token = create_access_token(identity={'id': 'admin', 'is_admin': True})
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.drop_all()
+
+    def test_created_user_can_log_in(self):
+        response = self.client.post('/api/v1/auth/login', json={
+            'email': 'jane.doe@example.com', 'password': 'secret'})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('access_token', response.get_json())
+
+        response = self.client.post('/api/v1/auth/login', json={
+            'email': 'jane.doe@example.com', 'password': 'wrong'})
+        self.assertEqual(response.status_code, 401)
+
+    def test_login_rehashes_other_work_factor(self):
+        with self.app.app_context():
+            user = facade.get_user_by_email('jane.doe@example.com')
+            facade.user_repo.update(user.id, {'password': password_hasher.hash('secret', rounds=5)})
+
+        response = self.client.post('/api/v1/auth/login', json={
+            'email': 'jane.doe@example.com', 'password': 'secret'})
+        self.assertEqual(response.status_code, 200)
+
+        with self.app.app_context():
+            user = facade.get_user_by_email('jane.doe@example.com')
+            self.assertEqual(hash_cost(user.password), 4)
+            self.assertTrue(user.verify_password('secret'))
+
+    def test_login_skips_rehash_when_hashing_is_busy(self):
+        with self.app.app_context():
+            user = facade.get_user_by_email('jane.doe@example.com')
+            old_hash = password_hasher.hash('secret', rounds=5)
+            facade.user_repo.update(user.id, {'password': old_hash})
+
+        def busy(*args, **kwargs):
+            raise HashingBusy('Too many password hashing requests, retry later')
+        password_hasher.hash = busy
+        try:
+            response = self.client.post('/api/v1/auth/login', json={
+                'email': 'jane.doe@example.com', 'password': 'secret'})
+        finally:
+            del password_hasher.hash
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('access_token', response.get_json())
+
+        with self.app.app_context():
+            # Left for a later login
+            self.assertEqual(facade.get_user_by_email('jane.doe@example.com').password, old_hash)
+
+    def test_login_returns_503_when_queue_is_full(self):
+        max_pending = password_hasher.max_pending
+        password_hasher.max_pending = 0
+        try:
+            response = self.client.post('/api/v1/auth/login', json={
+                'email': 'jane.doe@example.com', 'password': 'secret'})
+        finally:
+            password_hasher.max_pending = max_pending
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.headers['Retry-After'], '1')
+
+    def test_registration_returns_503_when_queue_is_full(self):
+        max_pending = password_hasher.max_pending
+        password_hasher.max_pending = 0
+        try:
+            response = self.client.post('/api/v1/users/', json={
+                'first_name': 'John', 'last_name': 'Doe',
+                'email': 'john.doe@example.com', 'password': 'secret', 'is_admin': False})
+        finally:
+            password_hasher.max_pending = max_pending
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.headers['Retry-After'], '1')
+        with self.app.app_context():
+            self.assertIsNone(facade.get_user_by_email('john.doe@example.com'))
+
+    def test_admin_user_creation_returns_503_when_queue_is_full(self):
+        max_pending = password_hasher.max_pending
+        password_hasher.max_pending = 0
+        try:
+            response = self.client.post('/api/v1/admin/users/', headers={'Authorization': f'Bearer {self.token}'},
+                                        json={'first_name': 'John', 'last_name': 'Doe', 'is_admin': False,
+                                              'email': 'john.doe@example.com', 'password': 'secret'})
+        finally:
+            password_hasher.max_pending = max_pending
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.headers['Retry-After'], '1')
+
+    def test_hashing_stats_endpoint(self):
+        response = self.client.get('/api/v1/admin/hashing-stats',
+                                   headers={'Authorization': f'Bearer {self.token}'})
+        self.assertEqual(response.status_code, 200)
+        stats = response.get_json()['password_hashing']
+        self.assertEqual(stats['work_factor'], 4)
+        self.assertEqual(stats['workers'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
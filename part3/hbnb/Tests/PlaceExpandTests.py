@@ -0,0 +1,136 @@
+import unittest
+from part3.hbnb.app import create_app, db
+from part3.hbnb.app.persistence.querycount import count_queries
+from part3.hbnb.app.services import facade
+
+
+class TestPlaceExpand(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.create_all()
+            owner = facade.create_user({
+                'first_name': 'Jane',
+                'last_name': 'Doe',
+                'email': 'jane.doe@example.com',
+                'password': 'secret'
+            })
+            self.owner_id = owner.id
+            self.place_id = facade.create_place({
+                'title': 'Paris flat',
+                'description': 'A cozy place',
+                'price': 80.0,
+                'latitude': 48.85,
+                'longitude': 2.35,
+                'owner_id': owner.id
+            }).id
+            self.amenity_ids = []
+            for name in ('Wi-Fi', 'Balcony', 'Parking'):
+                amenity = facade.create_amenity({'name': name})
+                facade.create_place_amenity({'place_id': self.place_id, 'amenity_id': amenity.id})
+                self.amenity_ids.append(amenity.id)
+            self.guest_ids = []
+            for i in range(4):
+                guest = facade.create_user({
+                    'first_name': f'Guest {i}',
+                    'last_name': 'Smith',
+                    'email': f'guest{i}@example.com',
+                    'password': 'secret'
+                })
+                facade.create_review({'text': f'Stay {i}', 'rating': i + 1, 'place_id': self.place_id,
+                                      'user_id': guest.id})
+                self.guest_ids.append(guest.id)
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.drop_all()
+
+    def test_facade_loads_everything_in_three_queries(self):
+        with self.app.app_context():
+            with count_queries() as statements:
+                place = facade.get_place(self.place_id, ('owner', 'amenities', 'reviews'))
+                owner = place.owner
+                amenities = [amenity.name for amenity in place.amenities]
+                reviews = [review.text for review in place.reviews]
+            # Place, aggregates and owner joined; one IN query per collection
+            self.assertEqual(len(statements), 3)
+            self.assertEqual(owner.id, self.owner_id)
+            self.assertEqual(amenities, ['Balcony', 'Parking', 'Wi-Fi'])
+            self.assertEqual(reviews, ['Stay 0', 'Stay 1', 'Stay 2', 'Stay 3'])
+
+    def test_only_requested_relationships_are_loaded(self):
+        with self.app.app_context():
+            with count_queries() as statements:
+                facade.get_place(self.place_id, ('owner',)).owner
+            self.assertEqual(len(statements), 1)
+        with self.app.app_context():
+            with count_queries() as statements:
+                facade.get_place(self.place_id, ('amenities',)).amenities
+            self.assertEqual(len(statements), 2)
+
+    def test_expanded_endpoint_query_count(self):
+        with count_queries() as statements:
+            response = self.client.get(f'/api/v1/places/{self.place_id}?expand=owner,amenities,reviews')
+        self.assertEqual(response.status_code, 200)
+        # The version check for the ETag, then the three loading queries
+        self.assertEqual(len(statements), 4)
+
+        data = response.get_json()
+        self.assertEqual(data['title'], 'Paris flat')
+        self.assertEqual(data['review_count'], 4)
+        self.assertEqual(data['owner'], {'id': self.owner_id, 'first_name': 'Jane', 'last_name': 'Doe',
+                                         'email': 'jane.doe@example.com'})
+        self.assertEqual([amenity['name'] for amenity in data['amenities']], ['Balcony', 'Parking', 'Wi-Fi'])
+        self.assertEqual(set(data['amenities'][0]), {'id', 'name'})
+        self.assertEqual([review['user_id'] for review in data['reviews']], self.guest_ids)
+        self.assertEqual(set(data['reviews'][0]), {'id', 'text', 'rating', 'user_id'})
+
+    def test_without_expand_owner_stays_an_id(self):
+        data = self.client.get(f'/api/v1/places/{self.place_id}').get_json()
+        self.assertEqual(data['owner'], self.owner_id)
+        self.assertNotIn('amenities', data)
+        self.assertNotIn('reviews', data)
+
+    def test_invalid_expand(self):
+        response = self.client.get(f'/api/v1/places/{self.place_id}?expand=owner,bookings')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('expand', response.get_json()['error'])
+
+    def test_missing_place(self):
+        response = self.client.get('/api/v1/places/unknown?expand=owner')
+        self.assertEqual(response.status_code, 404)
+
+    def test_etag_covers_the_embedded_resources(self):
+        url = f'/api/v1/places/{self.place_id}'
+        plain = self.client.get(url).headers['ETag']
+        expanded = self.client.get(url + '?expand=amenities').headers['ETag']
+        self.assertNotEqual(plain, expanded)
+        # The order of the names doesn't matter
+        both = self.client.get(url + '?expand=reviews,amenities').headers['ETag']
+        self.assertEqual(both, self.client.get(url + '?expand=amenities,reviews').headers['ETag'])
+        response = self.client.get(url + '?expand=amenities', headers={'If-None-Match': expanded})
+        self.assertEqual(response.status_code, 304)
+
+        with self.app.app_context():
+            facade.update_amenity(self.amenity_ids[0], {'name': 'Fast Wi-Fi'})
+        response = self.client.get(url + '?expand=amenities', headers={'If-None-Match': expanded})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('Fast Wi-Fi', [amenity['name'] for amenity in response.get_json()['amenities']])
+        # The place itself didn't change
+        self.assertEqual(self.client.get(url, headers={'If-None-Match': plain}).status_code, 304)
+
+    def test_relationships_are_writable(self):
+        with self.app.app_context():
+            place = facade.get_place(self.place_id)
+            amenity = facade.create_amenity({'name': 'Sauna'})
+            place.add_amenity(amenity)
+            db.session.commit()
+        with self.app.app_context():
+            names = [a.name for a in facade.get_place(self.place_id, ('amenities',)).amenities]
+            self.assertIn('Sauna', names)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import random
+import unittest
+from part3.hbnb.app import create_app, db
+from part3.hbnb.app.models.place import Place
+from part3.hbnb.app.persistence import geohash
+from part3.hbnb.app.persistence.querycount import count_queries
+from part3.hbnb.app.services import facade
+
+
+class TestPlaceNearby(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.client = self.app.test_client()
+        self.client.testing = True
+        rng = random.Random(42)
+        with self.app.app_context():
+            db.create_all()
+            owner = facade.create_user({
+                'first_name': 'Jane',
+                'last_name': 'Doe',
+                'email': 'jane.doe@example.com',
+                'password': 'secret'
+            })
+            places = []
+            # Dense clusters plus a uniform spread, including around the antimeridian
+            for center_lat, center_lon in ((48.85, 2.35), (-17.7, 179.9), (0.0, 0.0)):
+                for _ in range(300):
+                    places.append((center_lat + rng.uniform(-2, 2),
+                                   ((center_lon + rng.uniform(-2, 2) + 180) % 360) - 180))
+            for _ in range(600):
+                places.append((rng.uniform(-85, 85), rng.uniform(-180, 180)))
+
+            db.session.add_all([
+                Place(title=f'Place {i}', description='', price=100.0,
+                      latitude=lat, longitude=lon, owner_id=owner.id)
+                for i, (lat, lon) in enumerate(places)
+            ])
+            db.session.commit()
+            self.places = [(p.id, p.latitude, p.longitude) for p in Place.query.all()]
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.drop_all()
+
+    def brute_force(self, lat, lon, radius_km, limit):
+        matches = sorted(
+            (geohash.haversine_km(lat, lon, p_lat, p_lon), place_id)
+            for place_id, p_lat, p_lon in self.places
+        )
+        return [place_id for distance, place_id in matches if distance <= radius_km][:limit]
+
+    def test_matches_brute_force(self):
+        queries = [
+            (48.85, 2.35, 5, 100),
+            (48.85, 2.35, 150, 50),
+            (-17.7, 180.0, 120, 100),
+            (-17.7, -179.5, 60, 100),
+            (0.0, 0.0, 300, 100),
+            (89.0, 10.0, 800, 100),
+            (10.0, 10.0, 3000, 100),
+        ]
+        with self.app.app_context():
+            for lat, lon, radius_km, limit in queries:
+                results = facade.get_places_nearby(lat, lon, radius_km, limit)
+                self.assertEqual([place.id for place, _ in results],
+                                 self.brute_force(lat, lon, radius_km, limit),
+                                 (lat, lon, radius_km))
+
+    def test_geohash_updated_with_coordinates(self):
+        with self.app.app_context():
+            place = Place.query.first()
+            place.latitude, place.longitude = 40.7128, -74.0060
+            db.session.commit()
+            self.assertEqual(place.geohash, geohash.encode(40.7128, -74.0060))
+
+    def test_endpoint(self):
+        response = self.client.get('/api/v1/places/nearby?lat=48.85&lon=2.35&radius_km=50&limit=5')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([p['id'] for p in response.json], self.brute_force(48.85, 2.35, 50, 5))
+        distances = [p['distance_km'] for p in response.json]
+        self.assertEqual(distances, sorted(distances))
+
+    def test_endpoint_invalid_parameters(self):
+        self.assertEqual(self.client.get('/api/v1/places/nearby?lat=1&lon=2').status_code, 400)
+        self.assertEqual(self.client.get('/api/v1/places/nearby?lat=91&lon=2&radius_km=1').status_code, 400)
+        self.assertEqual(self.client.get('/api/v1/places/nearby?lat=1&lon=2&radius_km=0').status_code, 400)
+        for radius_km in ('20000', 'inf', 'nan'):
+            response = self.client.get(f'/api/v1/places/nearby?lat=1&lon=2&radius_km={radius_km}')
+            self.assertEqual(response.status_code, 400, radius_km)
+
+    def test_bounding_box_filters_in_sql(self):
+        with self.app.app_context():
+            with count_queries() as statements:
+                facade.get_places_nearby(10.0, 10.0, 3000, 5)
+        self.assertEqual(len(statements), 1)
+        self.assertIn('place.latitude BETWEEN', statements[0])
+        self.assertIn('place.longitude BETWEEN', statements[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+from part3.hbnb.app import create_app, db
+from part3.hbnb.app.models.review import Review
+from part3.hbnb.app.models.user import User
+from part3.hbnb.app.services import facade
+
+
+class TestPlaceReviewList(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.client = self.app.test_client()
+        self.client.testing = True
+        with self.app.app_context():
+            db.create_all()
+            owner = facade.create_user({
+                'first_name': 'Jane',
+                'last_name': 'Doe',
+                'email': 'jane.doe@example.com',
+                'password': 'secret'
+            })
+            place = facade.create_place({
+                'title': 'Paris flat',
+                'description': 'A cozy place',
+                'price': 80.0,
+                'latitude': 48.85,
+                'longitude': 2.35,
+                'owner_id': owner.id
+            })
+            self.place_id = place.id
+
+            guests = []
+            for i in range(1200):
+                guest = User(first_name='Guest', last_name=str(i), email=f'guest{i}@example.com')
+                guest.password = 'not-a-hash'
+                guests.append(guest)
+            db.session.add_all(guests)
+            db.session.flush()  # assigns the guest ids
+            db.session.add_all([
+                Review(text=f'Review {i}', rating=i % 5 + 1, place_id=place.id, user_id=guest.id)
+                for i, guest in enumerate(guests)
+            ])
+            db.session.commit()
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.drop_all()
+
+    def test_streams_every_review(self):
+        response = self.client.get(f'/api/v1/reviews/places/{self.place_id}/reviews')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.is_streamed)
+        self.assertEqual(len(response.json), 1200)
+        self.assertEqual(len({review['id'] for review in response.json}), 1200)
+
+    def test_paged_reviews(self):
+        seen = 0
+        cursor = ''
+        while True:
+            response = self.client.get(
+                f'/api/v1/reviews/places/{self.place_id}/reviews?limit=500&cursor={cursor}')
+            self.assertEqual(response.status_code, 200)
+            seen += len(response.json['results'])
+            cursor = response.json['next_cursor']
+            if not cursor:
+                break
+        self.assertEqual(seen, 1200)
+
+    def test_place_without_reviews(self):
+        response = self.client.get('/api/v1/reviews/places/unknown/reviews')
+        self.assertEqual(response.status_code, 404)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import unittest
+from part3.hbnb.app import create_app, db
+from part3.hbnb.app.services import facade
+
+
+class TestPlaceSearch(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.client = self.app.test_client()
+        self.client.testing = True
+        with self.app.app_context():
+            db.create_all()
+            owner = facade.create_user({
+                'first_name': 'Jane',
+                'last_name': 'Doe',
+                'email': 'jane.doe@example.com',
+                'password': 'secret'
+            })
+            wifi = facade.create_amenity({'name': 'WiFi'})
+            pool = facade.create_amenity({'name': 'Pool'})
+            self.wifi_id, self.pool_id = wifi.id, pool.id
+
+            places = [
+                ('Paris flat', 80.0, 48.85, 2.35, [wifi]),
+                ('Nice villa', 300.0, 43.70, 7.26, [wifi, pool]),
+                ('Fiji hut', 40.0, -17.7, 179.9, []),
+                ('Samoa hut', 60.0, -13.8, -172.1, [pool]),
+            ]
+            for title, price, lat, lon, amenities in places:
+                place = facade.create_place({
+                    'title': title,
+                    'description': 'A place',
+                    'price': price,
+                    'latitude': lat,
+                    'longitude': lon,
+                    'owner_id': owner.id
+                })
+                for amenity in amenities:
+                    facade.create_place_amenity({'place_id': place.id, 'amenity_id': amenity.id})
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.drop_all()
+
+    def titles(self, query):
+        response = self.client.get('/api/v1/places/search' + query)
+        self.assertEqual(response.status_code, 200)
+        return [place['title'] for place in response.json['results']]
+
+    def test_price_range(self):
+        self.assertEqual(self.titles('?min_price=50&max_price=100'), ['Samoa hut', 'Paris flat'])
+
+    def test_sort_price_desc(self):
+        self.assertEqual(self.titles('?sort=price_desc&limit=2'), ['Nice villa', 'Paris flat'])
+
+    def test_bounding_box(self):
+        self.assertEqual(self.titles('?min_lat=40&min_lon=0&max_lat=50&max_lon=10'),
+                         ['Paris flat', 'Nice villa'])
+
+    def test_bounding_box_across_antimeridian(self):
+        self.assertEqual(self.titles('?min_lat=-20&min_lon=170&max_lat=-10&max_lon=-170'),
+                         ['Fiji hut', 'Samoa hut'])
+
+    def test_amenities_must_all_match(self):
+        self.assertEqual(self.titles(f'?amenities={self.wifi_id}'), ['Paris flat', 'Nice villa'])
+        self.assertEqual(self.titles(f'?amenities={self.wifi_id},{self.pool_id}'), ['Nice villa'])
+
+    def test_pages_follow_the_cursor(self):
+        for sort, expected in (('price_asc', ['Fiji hut', 'Samoa hut', 'Paris flat', 'Nice villa']),
+                               ('price_desc', ['Nice villa', 'Paris flat', 'Samoa hut', 'Fiji hut']),
+                               ('newest', ['Samoa hut', 'Fiji hut', 'Nice villa', 'Paris flat']),
+                               ('oldest', ['Paris flat', 'Nice villa', 'Fiji hut', 'Samoa hut'])):
+            titles, query = [], f'?sort={sort}&limit=3'
+            while query is not None:
+                page = self.client.get('/api/v1/places/search' + query).json
+                titles += [place['title'] for place in page['results']]
+                self.assertLessEqual(len(page['results']), 3)
+                query = page['next_cursor'] and f"?sort={sort}&limit=3&cursor={page['next_cursor']}"
+            self.assertEqual(titles, expected, sort)
+
+    def test_last_page_has_no_cursor(self):
+        page = self.client.get('/api/v1/places/search?max_price=100').json
+        self.assertEqual(len(page['results']), 3)
+        self.assertIsNone(page['next_cursor'])
+
+    def test_cursor_of_another_sort_order(self):
+        cursor = self.client.get('/api/v1/places/search?sort=newest&limit=1').json['next_cursor']
+        response = self.client.get(f'/api/v1/places/search?sort=price_asc&cursor={cursor}')
+        self.assertEqual(response.status_code, 400)
+
+    def test_invalid_parameters(self):
+        self.assertEqual(self.client.get('/api/v1/places/search?min_price=abc').status_code, 400)
+        self.assertEqual(self.client.get('/api/v1/places/search?min_lat=1').status_code, 400)
+        self.assertEqual(self.client.get('/api/v1/places/search?sort=random').status_code, 400)
+        self.assertEqual(self.client.get('/api/v1/places/search?cursor=bogus').status_code, 400)
+
+
+if __name__ == '__main__':
+    unittest.main()
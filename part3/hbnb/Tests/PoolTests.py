@@ -0,0 +1,129 @@
+import os
+import tempfile
+import unittest
+from flask_jwt_extended import create_access_token
+from sqlalchemy import text
+from sqlalchemy.exc import TimeoutError as PoolTimeout
+from config import Config, TestingConfig
+from part3.hbnb.app import create_app, db
+from part3.hbnb.app.persistence.pool import InstrumentedQueuePool, engine_options
+
+
+class TestEngineOptions(unittest.TestCase):
+
+    def test_pool_settings_become_engine_options(self):
+        config = {'SQLALCHEMY_DATABASE_URI': 'sqlite:///hbnb.db', 'DB_POOL_SIZE': 3, 'DB_MAX_OVERFLOW': 2,
+                  'DB_POOL_TIMEOUT': 2, 'DB_POOL_RECYCLE': 600, 'DB_POOL_PRE_PING': True}
+        self.assertEqual(engine_options(config), {
+            'pool_size': 3, 'max_overflow': 2, 'pool_timeout': 2, 'pool_recycle': 600,
+            'pool_pre_ping': True, 'poolclass': InstrumentedQueuePool})
+
+    def test_explicit_engine_options_win(self):
+        config = {'SQLALCHEMY_DATABASE_URI': 'postgresql://db/hbnb', 'DB_POOL_SIZE': 3,
+                  'SQLALCHEMY_ENGINE_OPTIONS': {'pool_size': 20, 'echo': True}}
+        options = engine_options(config)
+        self.assertEqual(options['pool_size'], 20)
+        self.assertTrue(options['echo'])
+
+    def test_in_memory_sqlite_is_left_alone(self):
+        for uri in ('sqlite://', 'sqlite:///:memory:', 'sqlite:///file:hbnb?mode=memory&uri=true'):
+            self.assertEqual(engine_options({'SQLALCHEMY_DATABASE_URI': uri, 'DB_POOL_SIZE': 3}), {})
+        app = create_app("config.TestingConfig")
+        with app.app_context():
+            self.assertEqual(db.session.execute(text('SELECT 1')).scalar(), 1)
+
+
+class TestPoolMetrics(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        uri = 'sqlite:///' + os.path.join(self.tmp.name, 'hbnb.db')
+
+        class SmallPool(Config):
+            SQLALCHEMY_DATABASE_URI = uri
+            SQLALCHEMY_TRACK_MODIFICATIONS = False
+            DATABASE_AUTO_INIT = False
+            DB_POOL_SIZE = 2
+            DB_MAX_OVERFLOW = 1
+            DB_POOL_TIMEOUT = 1
+            DB_POOL_PRE_PING = True
+
+        self.app = create_app(SmallPool)
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        self.engine = db.engine
+
+    def tearDown(self):
+        self.engine.dispose()
+        self.ctx.pop()
+        self.tmp.cleanup()
+
+    def test_settings_reach_the_pool(self):
+        pool = self.engine.pool
+        self.assertIsInstance(pool, InstrumentedQueuePool)
+        self.assertEqual(pool.size(), 2)
+        self.assertEqual(pool._max_overflow, 1)
+        self.assertEqual(pool.timeout(), 1)
+        self.assertTrue(pool._pre_ping)
+
+    def test_checkouts_overflow_and_timeouts_are_counted(self):
+        connections = [self.engine.connect() for _ in range(3)]
+        metrics = self.engine.pool.metrics
+        self.assertEqual(metrics.checkouts, 3)
+        self.assertEqual(metrics.overflow_opened, 1)
+        self.assertEqual(self.engine.pool.checkedout(), 3)
+        with self.assertRaises(PoolTimeout):
+            self.engine.connect()
+        self.assertEqual(metrics.timeouts, 1)
+        self.assertGreaterEqual(metrics.max_wait, 1)
+        for conn in connections:
+            conn.close()
+
+    def test_metrics_survive_dispose(self):
+        self.engine.connect().close()
+        metrics = self.engine.pool.metrics
+        self.engine.dispose()
+        self.engine.connect().close()
+        self.assertIs(self.engine.pool.metrics, metrics)
+        self.assertEqual(metrics.checkouts, 2)
+
+    def test_invalidated_connections_are_counted(self):
+        conn = self.engine.connect()
+        conn.invalidate()
+        conn.close()
+        self.assertEqual(self.engine.pool.metrics.invalidated, 1)
+
+    def test_pool_stats_endpoint(self):
+        token = create_access_token(identity={'id': 'admin', 'is_admin': True})
+        client = self.app.test_client()
+        held = self.engine.connect()
+        response = client.get('/api/v1/admin/pool-stats', headers={'Authorization': f'Bearer {token}'})
+        held.close()
+        self.assertEqual(response.status_code, 200)
+        stats = response.get_json()['connection_pools']
+        self.assertEqual(set(stats), {'default'})
+        self.assertEqual(stats['default']['pool_class'], 'InstrumentedQueuePool')
+        self.assertEqual(stats['default']['size'], 2)
+        self.assertEqual(stats['default']['active'], 1)
+        self.assertEqual(stats['default']['checkouts'], 1)
+        self.assertIsNotNone(stats['default']['avg_checkout_ms'])
+
+    def test_pool_stats_requires_admin(self):
+        token = create_access_token(identity={'id': 'guest', 'is_admin': False})
+        response = self.app.test_client().get('/api/v1/admin/pool-stats',
+                                              headers={'Authorization': f'Bearer {token}'})
+        self.assertEqual(response.status_code, 403)
+
+
+class TestStaticPoolStats(unittest.TestCase):
+
+    def test_in_memory_pool_stats(self):
+        app = create_app(TestingConfig)
+        with app.app_context():
+            token = create_access_token(identity={'id': 'admin', 'is_admin': True})
+        response = app.test_client().get('/api/v1/admin/pool-stats', headers={'Authorization': f'Bearer {token}'})
+        self.assertEqual(response.get_json()['connection_pools'], {'default': {'pool_class': 'StaticPool'}})
+
+
+if __name__ == '__main__':
+    unittest.main()
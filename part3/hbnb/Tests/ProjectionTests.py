@@ -0,0 +1,95 @@
+import unittest
+from part3.hbnb.app import create_app, db, serialization
+from part3.hbnb.app.models.place import Place
+from part3.hbnb.app.services import facade
+
+
+class TestProjectedRows(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.create_all()
+            owner = facade.create_user({
+                'first_name': 'Jane',
+                'last_name': 'Doe',
+                'email': 'jane.doe@example.com',
+                'password': 'secret'
+            })
+            guest = facade.create_user({
+                'first_name': 'John',
+                'last_name': 'Smith',
+                'email': 'john.smith@example.com',
+                'password': 'secret'
+            })
+            self.place_ids = []
+            for i, price in enumerate((80.0, 120.0, 60.0)):
+                self.place_ids.append(facade.create_place({
+                    'title': f'Place {i}',
+                    'description': 'A cozy place',
+                    'price': price,
+                    'latitude': 48.85,
+                    'longitude': 2.35,
+                    'owner_id': owner.id
+                }).id)
+            facade.create_review({
+                'text': 'Great stay',
+                'rating': 5,
+                'user_id': guest.id,
+                'place_id': self.place_ids[0]
+            })
+            # A place created without going through the facade has no stats row
+            db.session.execute(db.text('DELETE FROM place_rating_stats WHERE place_id = :id'),
+                               {'id': self.place_ids[2]})
+            db.session.commit()
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.drop_all()
+
+    def test_rows_are_not_entities(self):
+        with self.app.app_context():
+            db.session.expunge_all()
+            rows = facade.get_all_places(columns=['id', 'title', 'price'])
+            self.assertEqual(len(rows), 3)
+            self.assertNotIsInstance(rows[0], Place)
+            self.assertEqual(rows[0]._fields, ('id', 'title', 'price'))
+            self.assertEqual(len(db.session.identity_map), 0)
+
+    def test_row_page(self):
+        with self.app.app_context():
+            page = facade.get_all_users(limit=1, columns=['email'])
+            self.assertEqual(len(page.items), 1)
+            self.assertIsNotNone(page.next_after)
+            rest = facade.get_all_users(after=page.next_after, limit=1, columns=['email'])
+            self.assertNotEqual(rest.items[0].email, page.items[0].email)
+            self.assertIsNone(rest.next_after)
+
+    def test_place_list_matches_entity_view(self):
+        response = self.client.get('/api/v1/places/')
+        self.assertEqual(response.status_code, 200)
+        with self.app.app_context():
+            serialize = serialization.serializer(Place)
+            expected = {place.id: serialize(place) for place in facade.get_all_places()}
+        for place in response.get_json():
+            self.assertEqual(place, expected[place['id']])
+        self.assertEqual(expected[self.place_ids[0]]['review_count'], 1)
+        self.assertEqual(expected[self.place_ids[2]]['review_count'], 0)
+
+    def test_search_rows(self):
+        response = self.client.get('/api/v1/places/search?max_price=100&sort=price_asc')
+        self.assertEqual(response.status_code, 200)
+        places = response.get_json()['results']
+        self.assertEqual([place['price'] for place in places], [60.0, 80.0])
+        self.assertEqual(places[1]['rating_histogram']['5'], 1)
+
+    def test_nearby_rows(self):
+        response = self.client.get('/api/v1/places/nearby?lat=48.85&lon=2.35&radius_km=1')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.get_json()), 3)
+        self.assertEqual(response.get_json()[0]['distance_km'], 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
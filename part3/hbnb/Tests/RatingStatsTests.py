@@ -0,0 +1,91 @@
+import unittest
+from part3.hbnb.app import create_app, db
+from part3.hbnb.app.models.placeratingstats import PlaceRatingStats
+from part3.hbnb.app.models.user import User
+from part3.hbnb.app.services import facade
+
+
+class TestPlaceRatingStats(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.client = self.app.test_client()
+        self.client.testing = True
+        with self.app.app_context():
+            db.create_all()
+            owner = facade.create_user({
+                'first_name': 'Jane',
+                'last_name': 'Doe',
+                'email': 'jane.doe@example.com',
+                'password': 'secret'
+            })
+            self.place_id = facade.create_place({
+                'title': 'Paris flat',
+                'description': 'A cozy place',
+                'price': 80.0,
+                'latitude': 48.85,
+                'longitude': 2.35,
+                'owner_id': owner.id
+            }).id
+
+            guests = []
+            for i in range(4):
+                guest = User(first_name='Guest', last_name=str(i), email=f'guest{i}@example.com')
+                guest.password = 'not-a-hash'
+                guests.append(guest)
+            db.session.add_all(guests)
+            db.session.commit()
+
+            self.review_ids = [
+                facade.create_review({
+                    'text': 'Nice', 'rating': rating, 'place_id': self.place_id, 'user_id': guest.id
+                }).id
+                for guest, rating in zip(guests, [5, 4, 4, 1])
+            ]
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.drop_all()
+
+    def get_place(self):
+        response = self.client.get(f'/api/v1/places/{self.place_id}')
+        self.assertEqual(response.status_code, 200)
+        return response.json
+
+    def test_create_updates_aggregates(self):
+        place = self.get_place()
+        self.assertEqual(place['review_count'], 4)
+        self.assertEqual(place['average_rating'], 3.5)
+        self.assertEqual(place['rating_histogram'], {'1': 1, '2': 0, '3': 0, '4': 2, '5': 1})
+
+    def test_update_and_delete_update_aggregates(self):
+        with self.app.app_context():
+            facade.update_review(self.review_ids[3], {'rating': 3})
+        with self.app.app_context():
+            facade.delete_review(self.review_ids[0])
+
+        place = self.get_place()
+        self.assertEqual(place['review_count'], 3)
+        self.assertEqual(place['average_rating'], round(11 / 3, 2))
+        self.assertEqual(place['rating_histogram'], {'1': 0, '2': 0, '3': 1, '4': 2, '5': 0})
+
+    def test_rebuild_matches_incremental(self):
+        before = self.get_place()
+        with self.app.app_context():
+            db.session.query(PlaceRatingStats).delete()
+            db.session.commit()
+        self.assertEqual(self.get_place()['review_count'], 0)
+
+        result = self.app.test_cli_runner().invoke(args=['rebuild-rating-stats'])
+        self.assertIn('1 places', result.output)
+        self.assertEqual(self.get_place(), before)
+
+    def test_list_includes_aggregates_in_one_query(self):
+        response = self.client.get('/api/v1/places/')
+        self.assertEqual(response.json[0]['review_count'], 4)
+        # The collection version for the ETag, then places with their aggregates
+        self.assertEqual(response.headers['X-Query-Count'], '2')
+
+
+if __name__ == '__main__':
+    unittest.main()
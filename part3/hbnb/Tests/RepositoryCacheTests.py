@@ -0,0 +1,181 @@
+import json
+import os
+import sqlite3
+import tempfile
+import unittest
+from datetime import datetime
+from flask_jwt_extended import create_access_token
+from part3.hbnb.app import create_app, db
+from part3.hbnb.app.persistence.cache import InProcessCache, SharedCache
+from part3.hbnb.app.persistence.querycount import count_queries
+from part3.hbnb.app.services import facade
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestCacheBackends(unittest.TestCase):
+
+    def test_lru_eviction(self):
+        cache = InProcessCache(max_entries=2, ttl=60)
+        cache.set('a', b'1')
+        cache.set('b', b'2')
+        cache.get('a')
+        cache.set('c', b'3')
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), b'1')
+        self.assertEqual(cache.stats()['evictions'], 1)
+
+    def test_ttl_expiry(self):
+        clock = FakeClock()
+        cache = InProcessCache(ttl=10, clock=clock)
+        cache.set('a', b'1')
+        clock.now = 9
+        self.assertEqual(cache.get('a'), b'1')
+        clock.now = 11
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.stats()['hits'], 1)
+        self.assertEqual(cache.stats()['misses'], 1)
+
+    def test_shared_cache_is_seen_by_every_worker(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'cache.db')
+            worker_a = SharedCache(path, max_entries=2)
+            worker_b = SharedCache(path, max_entries=2)
+            worker_a.set('a', b'1')
+            self.assertEqual(worker_b.get('a'), b'1')
+            worker_b.delete('a')
+            self.assertIsNone(worker_a.get('a'))
+            for key in ('x', 'y', 'z'):
+                worker_a.set(key, b'0')
+            self.assertEqual(worker_b.stats()['size'], 2)
+
+    def test_shared_cache_hits_rarely_write(self):
+        clock = FakeClock()
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'cache.db')
+            cache = SharedCache(path, ttl=60, clock=clock)
+            cache.set('a', b'1')
+
+            def used_at():
+                return sqlite3.connect(path).execute("SELECT used_at FROM cache WHERE key = 'a'").fetchone()[0]
+
+            clock.now = 5
+            self.assertEqual(cache.get('a'), b'1')
+            self.assertEqual(used_at(), 0)
+            clock.now = 6
+            self.assertEqual(cache.get('a'), b'1')
+            self.assertEqual(used_at(), 6)
+
+
+class TestCachedRepository(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+        class CachedConfig:
+            TESTING = True
+            SECRET_KEY = 'test'
+            JWT_VERIFY_SUB = False
+            SQLALCHEMY_DATABASE_URI = 'sqlite://'
+            REPOSITORY_CACHE = 'sqlite'
+            REPOSITORY_CACHE_PATH = os.path.join(self.tmp.name, 'cache.db')
+
+        self.app = create_app(CachedConfig)
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.create_all()
+            owner = facade.create_user({
+                'first_name': 'Jane',
+                'last_name': 'Doe',
+                'email': 'jane.doe@example.com',
+                'password': 'secret',
+                'is_admin': True
+            })
+            self.owner_id = owner.id
+            self.place_id = facade.create_place({
+                'title': 'Paris flat',
+                'description': 'A cozy place',
+                'price': 80.0,
+                'latitude': 48.85,
+                'longitude': 2.35,
+                'owner_id': owner.id
+            }).id
+            self.token = create_access_token(identity={'id': owner.id, 'is_admin': True})
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.drop_all()
+        facade.disable_cache()
+        self.tmp.cleanup()
+
+    def test_second_get_hits_cache(self):
+        with self.app.app_context():
+            facade.get_place(self.place_id)
+        with self.app.app_context():
+            with count_queries() as statements:
+                place = facade.get_place(self.place_id)
+                summary = place.rating_summary()
+            # The aggregates came from the cache too
+            self.assertEqual(statements, [])
+            self.assertEqual(place.title, 'Paris flat')
+            self.assertEqual(summary['review_count'], 0)
+            self.assertIsInstance(place.created_at, datetime)
+        self.assertEqual(facade.cache_stats()['hits'], 1)
+
+    def test_entries_are_plain_json(self):
+        with self.app.app_context():
+            facade.get_place(self.place_id)
+        entries = sqlite3.connect(os.path.join(self.tmp.name, 'cache.db')).execute(
+            'SELECT key, value FROM cache').fetchall()
+        self.assertEqual([key for key, _ in entries], [f'place:{self.place_id}'])
+        self.assertEqual(json.loads(entries[0][1])['title'], 'Paris flat')
+
+    def test_users_are_not_cached(self):
+        with self.app.app_context():
+            facade.get_user(self.owner_id)
+        with self.app.app_context():
+            with count_queries() as statements:
+                facade.get_user(self.owner_id)
+            self.assertEqual(len(statements), 1)
+        self.assertEqual(facade.cache_stats()['size'], 0)
+
+    def test_update_invalidates(self):
+        with self.app.app_context():
+            amenity_id = facade.create_amenity({'name': 'Wi-Fi'}).id
+        with self.app.app_context():
+            facade.get_amenity(amenity_id)
+            facade.update_amenity(amenity_id, {'name': 'Fast Wi-Fi'})
+        with self.app.app_context():
+            self.assertEqual(facade.get_amenity(amenity_id).name, 'Fast Wi-Fi')
+        with self.app.app_context():
+            db.session.expire_all()
+            self.assertEqual(facade.amenity_repo.repository.get(amenity_id).name, 'Fast Wi-Fi')
+
+    def test_review_invalidates_place_aggregates(self):
+        self.assertEqual(self.client.get(f'/api/v1/places/{self.place_id}').json['review_count'], 0)
+        with self.app.app_context():
+            guest = facade.create_user({
+                'first_name': 'John',
+                'last_name': 'Smith',
+                'email': 'john.smith@example.com',
+                'password': 'secret'
+            })
+            facade.create_review({'text': 'Nice', 'rating': 4,
+                                  'place_id': self.place_id, 'user_id': guest.id})
+        self.assertEqual(self.client.get(f'/api/v1/places/{self.place_id}').json['review_count'], 1)
+
+    def test_stats_endpoint(self):
+        response = self.client.get('/api/v1/admin/cache-stats',
+                                   headers={'Authorization': f'Bearer {self.token}'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json['repository_cache']['backend'], 'sqlite')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,196 @@
+import os
+import tempfile
+import unittest
+from flask_jwt_extended import create_access_token
+from part3.hbnb.app import create_app, db
+from part3.hbnb.app.responsecache import decode_entry
+from part3.hbnb.app.services import facade
+
+
+class CachedConfig:
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    SECRET_KEY = 'test'
+    JWT_VERIFY_SUB = False
+    TESTING = True
+    QUERY_COUNTER = True
+    BCRYPT_LOG_ROUNDS = 4
+    PASSWORD_HASH_WORKERS = 0
+    RESPONSE_CACHE = 'memory'
+    RESPONSE_CACHE_SIZE = 64
+    RESPONSE_CACHE_TTL = 60
+
+
+class TestResponseCache(unittest.TestCase):
+    config = CachedConfig
+
+    def setUp(self):
+        self.app = create_app(self.config)
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.create_all()
+            owner = facade.create_user({
+                'first_name': 'Jane',
+                'last_name': 'Doe',
+                'email': 'jane.doe@example.com',
+                'password': 'secret'
+            })
+            guest = facade.create_user({
+                'first_name': 'John',
+                'last_name': 'Smith',
+                'email': 'john.smith@example.com',
+                'password': 'secret'
+            })
+            self.place_ids = [facade.create_place({
+                'title': f'Place {i}',
+                'description': 'A cozy place',
+                'price': 80.0,
+                'latitude': 48.85,
+                'longitude': 2.35,
+                'owner_id': owner.id
+            }).id for i in range(2)]
+            self.amenity_id = facade.create_amenity({'name': 'Wi-Fi'}).id
+            self.guest_id = guest.id
+            self.review_id = self.add_review(self.place_ids[0])
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.drop_all()
+            self.app.extensions['response_cache'].clear()
+
+    def add_review(self, place_id, rating=4):
+        with self.app.app_context():
+            return facade.create_review({
+                'text': 'Great stay',
+                'rating': rating,
+                'user_id': self.guest_id,
+                'place_id': place_id
+            }).id
+
+    def test_hit_skips_the_database(self):
+        first = self.client.get('/api/v1/places/')
+        self.assertEqual(first.headers['X-Cache'], 'MISS')
+        second = self.client.get('/api/v1/places/')
+        self.assertEqual(second.headers['X-Cache'], 'HIT')
+        self.assertEqual(second.headers['X-Query-Count'], '0')
+        self.assertEqual(second.get_data(), first.get_data())
+        self.assertEqual(second.headers['ETag'], first.headers['ETag'])
+
+    def test_hit_answers_if_none_match(self):
+        first = self.client.get('/api/v1/amenities/')
+        self.client.get('/api/v1/amenities/')
+        again = self.client.get('/api/v1/amenities/', headers={'If-None-Match': first.headers['ETag']})
+        self.assertEqual(again.status_code, 304)
+        self.assertEqual(again.headers['X-Query-Count'], '0')
+
+    def test_query_string_is_normalized(self):
+        self.client.get('/api/v1/places/?limit=1&cursor=')
+        response = self.client.get('/api/v1/places/?cursor=&limit=1')
+        self.assertEqual(response.headers['X-Cache'], 'HIT')
+        other = self.client.get('/api/v1/places/?limit=2')
+        self.assertEqual(other.headers['X-Cache'], 'MISS')
+
+    def test_review_invalidates_only_its_place(self):
+        reviews = [f'/api/v1/reviews/places/{place_id}/reviews' for place_id in self.place_ids]
+        self.add_review(self.place_ids[1])
+        for url in reviews + ['/api/v1/amenities/', '/api/v1/places/']:
+            self.client.get(url)
+
+        with self.app.app_context():
+            facade.update_review(self.review_id, {'rating': 2})
+
+        changed = self.client.get(reviews[0])
+        self.assertEqual(changed.headers['X-Cache'], 'MISS')
+        self.assertEqual(changed.get_json()[0]['rating'], 2)
+        self.assertEqual(self.client.get(reviews[1]).headers['X-Cache'], 'HIT')
+        self.assertEqual(self.client.get('/api/v1/amenities/').headers['X-Cache'], 'HIT')
+        # The place list carries the rating aggregates
+        places = self.client.get('/api/v1/places/')
+        self.assertEqual(places.headers['X-Cache'], 'MISS')
+
+    def test_writes_invalidate(self):
+        self.client.get('/api/v1/amenities/')
+        self.client.get('/api/v1/placeamenities/')
+        with self.app.app_context():
+            facade.update_amenity(self.amenity_id, {'name': 'Fast Wi-Fi'})
+            facade.create_place_amenity({'place_id': self.place_ids[0], 'amenity_id': self.amenity_id})
+
+        amenities = self.client.get('/api/v1/amenities/')
+        self.assertEqual(amenities.headers['X-Cache'], 'MISS')
+        self.assertEqual(amenities.get_json()[0]['name'], 'Fast Wi-Fi')
+        place_amenities = self.client.get('/api/v1/placeamenities/')
+        self.assertEqual(place_amenities.headers['X-Cache'], 'MISS')
+        self.assertEqual(len(place_amenities.get_json()), 1)
+
+    def test_bulk_import_invalidates(self):
+        self.client.get('/api/v1/amenities/')
+        with self.app.app_context():
+            facade.create_amenities_bulk([{'name': 'Pool'}, {'name': 'Sauna'}])
+        self.assertEqual(len(self.client.get('/api/v1/amenities/').get_json()), 3)
+
+    def test_errors_are_not_cached(self):
+        self.client.get('/api/v1/reviews/places/missing/reviews')
+        response = self.client.get('/api/v1/reviews/places/missing/reviews')
+        self.assertEqual(response.status_code, 404)
+        self.assertNotIn('X-Cache', response.headers)
+
+    def test_large_bodies_stream_uncached(self):
+        self.app.extensions['response_cache'].max_body = 10
+        first = self.client.get(f'/api/v1/reviews/places/{self.place_ids[0]}/reviews')
+        self.assertEqual(first.get_json()[0]['id'], self.review_id)
+        second = self.client.get(f'/api/v1/reviews/places/{self.place_ids[0]}/reviews')
+        self.assertEqual(second.get_data(), first.get_data())
+        self.assertNotEqual(second.headers.get('X-Cache'), 'HIT')
+
+    def test_entries_are_json_and_raw_bytes(self):
+        cache = self.app.extensions['response_cache']
+        stored = []
+        set_entry = cache.entries.set
+        cache.entries.set = lambda key, value: stored.append(value) or set_entry(key, value)
+        first = self.client.get('/api/v1/amenities/')
+        self.assertTrue(stored[0].startswith(b'{"status": 200'))
+        status, headers, body = decode_entry(stored[0])
+        self.assertEqual(body, first.get_data())
+        self.assertIn(('ETag', first.headers['ETag']), headers)
+
+        second = self.client.get('/api/v1/amenities/')
+        self.assertEqual(second.headers['X-Cache'], 'HIT')
+        self.assertEqual(second.get_data(), first.get_data())
+
+    def test_stats(self):
+        self.client.get('/api/v1/places/')
+        self.client.get('/api/v1/places/')
+        with self.app.app_context():
+            admin = facade.create_user({
+                'first_name': 'Ada',
+                'last_name': 'Admin',
+                'email': 'ada@example.com',
+                'password': 'secret',
+                'is_admin': True
+            })
+            token = create_access_token(identity={'id': admin.id, 'is_admin': True})
+        response = self.client.get('/api/v1/admin/cache-stats', headers={'Authorization': f'Bearer {token}'})
+        stats = response.get_json()['response_cache']
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+        self.assertEqual(stats['hit_ratio'], 0.5)
+
+
+class TestSharedResponseCache(TestResponseCache):
+    """Same behaviour with the SQLite store shared by worker processes"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+
+        class SharedConfig(CachedConfig):
+            RESPONSE_CACHE = 'sqlite'
+            RESPONSE_CACHE_PATH = os.path.join(self.tmp.name, 'responses.db')
+        self.config = SharedConfig
+        super().setUp()
+
+    def tearDown(self):
+        super().tearDown()
+        self.tmp.cleanup()
+
+
+if __name__ == '__main__':
+    unittest.main()
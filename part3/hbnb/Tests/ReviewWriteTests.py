@@ -0,0 +1,80 @@
+import unittest
+from flask_jwt_extended import create_access_token
+from part3.hbnb.app import create_app, db
+from part3.hbnb.app.persistence.querycount import count_queries
+from part3.hbnb.app.services import facade
+
+
+class TestReviewWritePath(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.client = self.app.test_client()
+        self.client.testing = True
+        with self.app.app_context():
+            db.create_all()
+            owner = facade.create_user({
+                'first_name': 'Jane',
+                'last_name': 'Doe',
+                'email': 'jane.doe@example.com',
+                'password': 'secret'
+            })
+            guest = facade.create_user({
+                'first_name': 'John',
+                'last_name': 'Smith',
+                'email': 'john.smith@example.com',
+                'password': 'secret'
+            })
+            self.owner_id = owner.id
+            self.guest_id = guest.id
+            self.place_id = facade.create_place({
+                'title': 'Paris flat',
+                'description': 'A cozy place',
+                'price': 80.0,
+                'latitude': 48.85,
+                'longitude': 2.35,
+                'owner_id': owner.id
+            }).id
+            token = create_access_token(identity={'id': guest.id, 'is_admin': False})
+        self.headers = {'Authorization': f'Bearer {token}'}
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.drop_all()
+
+    def post_review(self):
+        return self.client.post('/api/v1/reviews/', headers=self.headers, json={
+            'text': 'Great stay',
+            'rating': 5,
+            'user_id': self.guest_id,
+            'place_id': self.place_id
+        })
+
+    def test_create_review_query_count(self):
+        response = self.post_review()
+        self.assertEqual(response.status_code, 201)
+        # place (with its rating stats), EXISTS review, EXISTS user,
+        # INSERT review, UPDATE rating stats, UPDATE place and review versions
+        self.assertLessEqual(int(response.headers['X-Query-Count']), 7)
+
+    def test_duplicate_review_rejected(self):
+        self.assertEqual(self.post_review().status_code, 201)
+        self.assertEqual(self.post_review().status_code, 400)
+
+    def test_create_place_reuses_owner(self):
+        with self.app.app_context():
+            with count_queries() as statements:
+                facade.create_place({
+                    'title': 'Nice villa',
+                    'description': '',
+                    'price': 300.0,
+                    'latitude': 43.7,
+                    'longitude': 7.26,
+                    'owner_id': self.owner_id
+                })
+            selects = [s for s in statements if s.lstrip().upper().startswith('SELECT')]
+            self.assertEqual(len(selects), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
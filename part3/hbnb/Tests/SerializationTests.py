@@ -0,0 +1,97 @@
+import json
+import unittest
+from part3.hbnb.app import create_app, db, serialization
+from part3.hbnb.app.models.place import Place
+from part3.hbnb.app.models.review import Review
+from part3.hbnb.app.services import facade
+
+
+class TestSerializerRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.create_all()
+            owner = facade.create_user({
+                'first_name': 'Jane',
+                'last_name': 'Doe',
+                'email': 'jane.doe@example.com',
+                'password': 'secret'
+            })
+            guest = facade.create_user({
+                'first_name': 'John',
+                'last_name': 'Smith',
+                'email': 'john.smith@example.com',
+                'password': 'secret'
+            })
+            self.place_id = facade.create_place({
+                'title': 'Paris flat',
+                'description': 'A cozy place',
+                'price': 80.0,
+                'latitude': 48.85,
+                'longitude': 2.35,
+                'owner_id': owner.id
+            }).id
+            facade.create_review({
+                'text': 'Great stay',
+                'rating': 4,
+                'user_id': guest.id,
+                'place_id': self.place_id
+            })
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.drop_all()
+
+    def test_serializer_is_compiled_once(self):
+        self.assertIs(serialization.serializer(Place), serialization.serializer(Place))
+        self.assertIsNot(serialization.serializer(Place),
+                         serialization.serializer(Place, native=True))
+
+    def test_place_view(self):
+        with self.app.app_context():
+            place = facade.get_place(self.place_id)
+            data = serialization.serializer(Place)(place)
+            self.assertEqual(data['owner'], place.owner_id)
+            self.assertEqual(data['created_at'], place.created_at.isoformat())
+            self.assertEqual(data['review_count'], 1)
+            self.assertEqual(data['rating_histogram']['4'], 1)
+
+            native = serialization.serializer(Place, native=True)(place)
+            self.assertIs(native['created_at'], place.created_at)
+
+    def test_expired_object_is_reloaded(self):
+        with self.app.app_context():
+            place = facade.get_place(self.place_id)
+            db.session.expire(place)
+            self.assertEqual(serialization.serializer(Place)(place)['title'], 'Paris flat')
+
+    def test_to_dict_has_columns_only(self):
+        with self.app.app_context():
+            data = facade.get_place(self.place_id).to_dict()
+            self.assertNotIn('_sa_instance_state', data)
+            self.assertEqual(set(data), {column.key for column in Place.__table__.columns})
+            json.dumps(data)
+
+    def test_unknown_view(self):
+        with self.assertRaises(KeyError):
+            serialization.serializer(Review, 'missing')
+
+    def test_list_endpoint_matches_dict_view(self):
+        response = self.client.get('/api/v1/places/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, 'application/json')
+        with self.app.app_context():
+            expected = serialization.serializer(Place)(facade.get_place(self.place_id))
+        self.assertEqual(response.get_json(), [expected])
+
+    def test_streamed_reviews_are_valid_json(self):
+        response = self.client.get(f'/api/v1/reviews/places/{self.place_id}/reviews')
+        self.assertEqual(response.status_code, 200)
+        reviews = json.loads(response.get_data())
+        self.assertEqual([review['rating'] for review in reviews], [4])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+import multiprocessing
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from part3.hbnb.app import create_app
+from part3.hbnb.app.persistence import migrations, startup
+
+
+def _initialize(path):
+    """Worker process: report whether this worker did the work"""
+    conn = sqlite3.connect(path, timeout=30)
+    try:
+        result = startup.initialize_connection(conn, path + '.init.lock')
+        return bool(result.applied), result.seeded
+    finally:
+        conn.close()
+
+
+class TestStartup(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'hbnb.db')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_cold_then_warm(self):
+        conn = sqlite3.connect(self.path)
+        cold = startup.initialize_connection(conn)
+        self.assertEqual(len(cold.applied), len(migrations.available_migrations()))
+        self.assertTrue(cold.seeded)
+        self.assertFalse(cold.skipped)
+        self.assertEqual(conn.execute('SELECT COUNT(*) FROM Amenity').fetchone()[0], 3)
+
+        warm = startup.initialize_connection(conn)
+        self.assertEqual(warm, startup.Startup([], False, True))
+        conn.close()
+
+    def test_warm_start_does_not_write(self):
+        conn = sqlite3.connect(self.path)
+        startup.initialize_connection(conn)
+        conn.close()
+        readonly = sqlite3.connect(f'file:{self.path}?mode=ro', uri=True)
+        self.assertTrue(startup.initialize_connection(readonly).skipped)
+        readonly.close()
+
+    def test_changed_seed_set_is_applied_again(self):
+        seeds = os.path.join(self.tmp.name, 'seeds')
+        shutil.copytree(startup.SEEDS_DIR, seeds)
+        conn = sqlite3.connect(self.path)
+        startup.initialize_connection(conn, seeds_dir=seeds)
+
+        with open(os.path.join(seeds, 'more_amenities.sql'), 'w') as seed:
+            seed.write("INSERT INTO Amenity (id, name) VALUES ('c3', 'Parking') ON CONFLICT DO NOTHING;\n")
+        result = startup.initialize_connection(conn, seeds_dir=seeds)
+        self.assertEqual(result.applied, [])
+        self.assertTrue(result.seeded)
+        # Existing seed rows are left alone, the new one is added
+        self.assertEqual(conn.execute('SELECT COUNT(*) FROM Amenity').fetchone()[0], 4)
+        self.assertTrue(startup.initialize_connection(conn, seeds_dir=seeds).skipped)
+        conn.close()
+
+    def test_new_migration_is_applied(self):
+        directory = os.path.join(self.tmp.name, 'migrations')
+        shutil.copytree(migrations.MIGRATIONS_DIR, directory, ignore=shutil.ignore_patterns('__*'))
+        conn = sqlite3.connect(self.path)
+        startup.initialize_connection(conn, migrations_dir=directory)
+
+        with open(os.path.join(directory, '0099_place_notes.sql'), 'w') as script:
+            script.write('ALTER TABLE Place ADD COLUMN notes TEXT;\n')
+        result = startup.initialize_connection(conn, migrations_dir=directory)
+        self.assertEqual([m.version for m in result.applied], [99])
+        self.assertFalse(result.seeded)
+        conn.close()
+
+    @unittest.skipIf(startup.fcntl is None, 'no file locks on this platform')
+    def test_concurrent_workers_initialize_once(self):
+        with multiprocessing.get_context('fork').Pool(4) as pool:
+            results = pool.map(_initialize, [self.path] * 4)
+        self.assertEqual(results.count((True, True)), 1)
+        self.assertEqual(results.count((False, False)), 3)
+
+    def test_create_app(self):
+        path = self.path
+
+        class FileConfig:
+            SQLALCHEMY_DATABASE_URI = 'sqlite:///' + path
+            SQLALCHEMY_TRACK_MODIFICATIONS = False
+            SECRET_KEY = 'test'
+            DATABASE_AUTO_INIT = True
+
+        app = create_app(FileConfig)
+        client = app.test_client()
+        self.assertEqual(len(client.get('/api/v1/amenities/').get_json()), 3)
+        self.assertTrue(os.path.exists(path + '.init.lock'))
+        with app.app_context():
+            app.extensions['sqlalchemy'].engine.dispose()
+
+    def test_lock_path(self):
+        app = create_app("config.TestingConfig")
+        with app.app_context():
+            self.assertIsNone(startup.lock_path_for(app.extensions['sqlalchemy'].engine))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,153 @@
+import unittest
+from flask import jsonify
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
+from part3.hbnb.app import create_app, db
+from part3.hbnb.app.persistence import identitymap, unitofwork
+from part3.hbnb.app.services import facade
+
+
+class TestUnitOfWork(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+
+        @self.app.route('/uow-test/<int:status>', methods=['POST'])
+        def write_then_answer(status):
+            amenity = facade.create_amenity({'name': f'Sauna {status}'})
+            return jsonify(id=amenity.id), status
+
+        self.client = self.app.test_client()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        self.commits = []
+        event.listen(db.engine, 'commit', self.count_commit)
+        self.changes = []
+        facade.listeners.append(self.record_change)
+
+    def tearDown(self):
+        facade.listeners.remove(self.record_change)
+        event.remove(db.engine, 'commit', self.count_commit)
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def count_commit(self, conn):
+        self.commits.append(conn)
+
+    def record_change(self, resource, **keys):
+        self.changes.append(resource)
+
+    def amenity_names(self):
+        identitymap.clear()
+        return sorted(amenity.name for amenity in facade.get_all_amenities())
+
+    def test_without_transaction_every_call_commits(self):
+        for name in ('WiFi', 'Pool', 'Parking'):
+            facade.create_amenity({'name': name})
+        self.assertEqual(len(self.commits), 3)
+
+    def test_one_commit_for_the_block(self):
+        with facade.transaction():
+            for name in ('WiFi', 'Pool', 'Parking'):
+                facade.create_amenity({'name': name})
+            self.assertEqual(self.commits, [])
+        self.assertEqual(len(self.commits), 1)
+        self.assertEqual(self.amenity_names(), ['Parking', 'Pool', 'WiFi'])
+
+    def test_error_rolls_back_the_block(self):
+        facade.create_amenity({'name': 'WiFi'})
+        with self.assertRaises(RuntimeError):
+            with facade.transaction():
+                amenity = facade.create_amenity({'name': 'Pool'})
+                self.assertEqual(facade.get_amenity(amenity.id).name, 'Pool')
+                raise RuntimeError('boom')
+        self.assertIsNone(unitofwork.current())
+        # The identity map must not hand out the rolled back object
+        with self.assertRaises(ValueError):
+            facade.get_amenity(amenity.id)
+        self.assertEqual(self.amenity_names(), ['WiFi'])
+
+    def test_constraint_error_surfaces_at_the_call(self):
+        user = {'first_name': 'Jane', 'last_name': 'Doe', 'email': 'jane@example.com', 'password': 'secret'}
+        with self.assertRaises(IntegrityError):
+            with facade.transaction():
+                facade.create_amenity({'name': 'WiFi'})
+                facade.create_user(user)
+                try:
+                    facade.create_user(dict(user))
+                except IntegrityError:
+                    self.assertIsNotNone(unitofwork.current())
+                    raise
+        self.assertEqual(self.amenity_names(), [])
+
+    def test_nested_failure_keeps_outer_writes(self):
+        with facade.transaction():
+            facade.create_amenity({'name': 'WiFi'})
+            with self.assertRaises(RuntimeError):
+                with facade.transaction():
+                    facade.create_amenity({'name': 'Pool'})
+                    raise RuntimeError('boom')
+            facade.create_amenity({'name': 'Parking'})
+        self.assertEqual(len(self.commits), 1)
+        self.assertEqual(self.amenity_names(), ['Parking', 'WiFi'])
+        # The change of the rolled back savepoint is not announced
+        self.assertEqual(self.changes, ['amenity', 'amenity'])
+
+    def test_listeners_run_after_commit(self):
+        with facade.transaction():
+            facade.create_amenity({'name': 'WiFi'})
+            self.assertEqual(self.changes, [])
+        self.assertEqual(self.changes, ['amenity'])
+
+        with self.assertRaises(RuntimeError):
+            with facade.transaction():
+                facade.create_amenity({'name': 'Pool'})
+                raise RuntimeError('boom')
+        self.assertEqual(self.changes, ['amenity'])
+
+    def test_bulk_insert_inside_transaction(self):
+        place_owner = facade.create_user({'first_name': 'Jane', 'last_name': 'Doe',
+                                          'email': 'jane@example.com', 'password': 'secret'})
+        place = facade.create_place({'title': 'Flat', 'description': '', 'price': 80.0,
+                                     'latitude': 48.85, 'longitude': 2.35, 'owner_id': place_owner.id})
+        wifi = facade.create_amenity({'name': 'WiFi'})
+        self.commits.clear()
+        with facade.transaction():
+            pool = facade.create_amenity({'name': 'Pool'})
+            row = {'place_id': place.id, 'amenity_id': wifi.id}
+            result = facade.create_place_amenities_bulk(
+                [row, dict(row), {'place_id': place.id, 'amenity_id': pool.id}], chunk_size=3)
+        # The duplicate only loses itself, the rest commits together
+        self.assertEqual(len(result.created), 2)
+        self.assertEqual([error['index'] for error in result.errors], [1])
+        self.assertEqual(len(self.commits), 1)
+        self.assertEqual(len(facade.get_place_amenity_by_place(place.id) or []), 2)
+
+    def test_write_request_commits_once(self):
+        response = self.client.post('/uow-test/201')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(self.commits), 1)
+        self.assertEqual(self.amenity_names(), ['Sauna 201'])
+
+    def test_failed_request_rolls_back(self):
+        response = self.client.post('/uow-test/400')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.commits, [])
+        self.assertEqual(self.amenity_names(), [])
+        self.assertEqual(self.changes, [])
+
+    def test_per_request_unit_of_work_can_be_disabled(self):
+        from config import TestingConfig
+
+        class NoUnitOfWork(TestingConfig):
+            UNIT_OF_WORK_PER_REQUEST = False
+
+        app = create_app(NoUnitOfWork)
+        names = [f.__name__ for f in app.before_request_funcs.get(None, [])]
+        self.assertNotIn('begin_request_unit_of_work', names)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,4 @@
 from flask import Flask
-from flask_restx import Api
 from flask_bcrypt import Bcrypt
 from flask_jwt_extended import JWTManager
 from flask_sqlalchemy import SQLAlchemy
@@ -7,27 +6,65 @@ from flask_cors import CORS
 
 bcrypt = Bcrypt()
 jwt = JWTManager()
-db = SQLAlchemy()
+from part3.hbnb.app.persistence.connections import RoutingSession
+# Keep committed objects loaded so responses don't re-SELECT what was just written
+db = SQLAlchemy(session_options={'expire_on_commit': False, 'class_': RoutingSession})
 
-from part3.hbnb.app.api.v1.users import api as users_ns
-from part3.hbnb.app.api.v1.places import api as places_ns
-from part3.hbnb.app.api.v1.amenities import api as amenities_ns
-from part3.hbnb.app.api.v1.reviews import api as reviews_ns
-from part3.hbnb.app.api.v1.auth import api as auth_ns
-from part3.hbnb.app.api.v1.admin import api as admin_ns
-from part3.hbnb.app.api.v1.placeamenities import api as placeamenities_ns
+from part3.hbnb.app.hashing import PasswordHasher
+password_hasher = PasswordHasher()
 
 
 def create_app(config_class="config.DevelopmentConfig"):
+    # The API, the facade and the models are imported here rather than with
+    # the package: scripts, CLI tools and worker processes that only need db
+    # or a model don't pay for them, and importing the package stays cheap.
+    from flask_restx import Api
+    from part3.hbnb.app.persistence.connections import init_connections
+    from part3.hbnb.app.persistence.pool import engine_options
+    from part3.hbnb.app.persistence.querycount import init_query_counter
+    from part3.hbnb.app.persistence.identitymap import init_identity_map
+    from part3.hbnb.app.persistence.unitofwork import init_unit_of_work
+    from part3.hbnb.app.persistence.startup import init_database
+    from part3.hbnb.app.api.v1.users import api as users_ns
+    from part3.hbnb.app.api.v1.places import api as places_ns
+    from part3.hbnb.app.api.v1.amenities import api as amenities_ns
+    from part3.hbnb.app.api.v1.reviews import api as reviews_ns
+    from part3.hbnb.app.api.v1.auth import api as auth_ns
+    from part3.hbnb.app.api.v1.admin import api as admin_ns
+    from part3.hbnb.app.api.v1.placeamenities import api as placeamenities_ns
+    from part3.hbnb.app.commands import init_commands
+    from part3.hbnb.app.authorization import init_authorization
+    from part3.hbnb.app.persistence.cache import build_cache
+    from part3.hbnb.app.responsecache import init_response_cache
+    from part3.hbnb.app.compression import init_compression
+    from part3.hbnb.app.services import facade
+
     app = Flask(__name__)
     app.config.from_object(config_class)
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(app.config)
 
     # Initialize extensions with app context
 
     bcrypt.init_app(app)
+    password_hasher.init_app(app)
     jwt.init_app(app)
+    init_authorization(app)
     db.init_app(app)
+    init_connections(app)
+    init_database(app)
     CORS(app)
+    init_query_counter(app)
+    init_identity_map(app)
+    init_unit_of_work(app)
+    init_commands(app)
+
+    cache = build_cache(app.config)
+    if cache:
+        facade.enable_cache(cache)
+    else:
+        facade.disable_cache()
+    init_response_cache(app)
+    init_compression(app)
 
     authorizations = {
         "BearerAuth": {
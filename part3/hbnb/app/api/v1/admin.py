@@ -1,7 +1,15 @@
 from flask_restx import Namespace, Resource, fields
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from part3.hbnb.app.authorization import admin_required, owner_required
 from part3.hbnb.app.services import facade
-from flask import request
+from part3.hbnb.app import db, password_hasher, serialization
+from part3.hbnb.app.hashing import HashingBusy
+from part3.hbnb.app.models.place import Place
+from part3.hbnb.app.api.v1.users import user_to_dict, account_to_dict
+from part3.hbnb.app.api.v1.amenities import amenity_to_dict
+from part3.hbnb.app.responsecache import response_cache_stats
+from part3.hbnb.app.persistence.connections import read_engine
+from part3.hbnb.app.persistence.pool import pool_stats
+from flask import current_app, request
 
 api = Namespace('admin', description='Admin operations')
 
@@ -17,20 +25,19 @@ amenity_model = api.model('Amenity', {
     'name': fields.String(required=True, description='Name of the amenity')
 })
 
+serialization.register(Place, ['id', 'title', 'description', 'price'], view='admin')
+admin_place_to_dict = serialization.serializer(Place, 'admin')
+
 
 @api.route('/users/')
 class AdminUserCreate(Resource):
-    @jwt_required()
+    @admin_required
     @api.expect(user_model, validate=True)
     @api.response(201, 'User successfully created')
     @api.response(400, 'Email already registered')
     @api.response(400, 'Invalid input data')
+    @api.response(503, 'Password hashing queue is full')
     def post(self):
-        current_user = get_jwt_identity()
-
-        if not current_user.get('is_admin'):
-            return {'error': 'Admin privileges required'}, 403
-
         user_data = request.json
         email = user_data.get('email')
 
@@ -39,26 +46,19 @@ class AdminUserCreate(Resource):
             return {'error': 'Email already registered'}, 400
 
         # Logic to create a new user
-        new_user = facade.create_user(user_data)
-        return {'id': new_user.id,
-                'first_name': new_user.first_name,
-                'last_name': new_user.last_name,
-                'email': new_user.email,
-                'is_admin': new_user.is_admin}, 201
+        try:
+            new_user = facade.create_user(user_data)
+        except HashingBusy as e:
+            return {'error': str(e)}, 503, {'Retry-After': '1'}
+        return account_to_dict(new_user), 201
 
 
 @api.route('/users/<user_id>')
 class AdminUserResource(Resource):
-    @jwt_required()
+    @admin_required
     @api.response(200, 'User updated successfully')
     @api.response(404, 'User not found')
     def put(self, user_id):
-        current_user = get_jwt_identity()
-
-        # If 'is_admin' is part of the identity payload
-        if not current_user.get('is_admin'):
-            return {'error': 'Admin privileges required'}, 403
-
         user_data = request.json
         email = user_data.get('email')
 
@@ -72,10 +72,7 @@ class AdminUserResource(Resource):
         updated_user = facade.update_user(user_id, user_data)
         if not updated_user:
             return {'error': 'User not found'}, 404
-        return {'id': updated_user.id,
-                'first_name': updated_user.first_name,
-                'last_name': updated_user.last_name,
-                'email': updated_user.email}, 200
+        return user_to_dict(updated_user), 200
 
 
 @api.route('/amenities/')
@@ -92,33 +89,22 @@ class AdminAmenityCreate(Resource):
         # Logic to create a new amenity
         try:
             new_amenity = facade.create_amenity(request.json)
-            return {
-                'id': new_amenity.id,
-                'name': new_amenity.name
-            }, 201
+            return amenity_to_dict(new_amenity), 201
         except Exception as e:
             api.abort(400, str(e))
 
 
 @api.route('/amenities/<amenity_id>')
 class AdminAmenityModify(Resource):
-    @jwt_required()
+    @admin_required
     @api.response(200, 'Amenity details retrieved successfully')
     @api.response(404, 'Amenity not found')
     def put(self, amenity_id):
-        current_user = get_jwt_identity()
-
-        if not current_user.get('is_admin'):
-            return {'error': 'Admin privileges required'}, 403
-
         # Logic to update an amenity
         try:
             updated_amenity = facade.update_amenity(amenity_id, request.json)
             if updated_amenity:
-                return {
-                    'id': updated_amenity.id,
-                    'name': updated_amenity.name
-                }, 200
+                return amenity_to_dict(updated_amenity), 200
             else:
                 api.abort(404, 'Amenity not found')
         except Exception as e:
@@ -127,25 +113,45 @@ class AdminAmenityModify(Resource):
 
 @api.route('/places/<place_id>')
 class AdminPlaceModify(Resource):
-    @jwt_required()
+    @owner_required('place')
     @api.response(200, 'Place details retrieved successfully')
     @api.response(404, 'Place not found')
     def put(self, place_id):
-        current_user = get_jwt_identity()
-
-        # Set is_admin default to False if not exists
-        is_admin = current_user.get('is_admin', False)
-        user_id = current_user.get('id')
-
-        place = facade.get_place(place_id)
-        if not is_admin and place.owner_id != user_id:
-            return {'error': 'Unauthorized action'}, 403
-
         # Logic to update the place
         updated_place = facade.update_place(place_id, request.json)
-        return {
-            'id': updated_place.id,
-            'title': updated_place.title,
-            'description': updated_place.description,
-            'price': updated_place.price
-        }, 200
+        return admin_place_to_dict(updated_place), 200
+
+
+@api.route('/cache-stats')
+class AdminCacheStats(Resource):
+    @admin_required
+    @api.response(200, 'Repository and response cache counters')
+    @api.response(403, 'Admin privileges required')
+    def get(self):
+        """Hit/miss/eviction counters of the repository and response caches"""
+        return {'repository_cache': facade.cache_stats(),
+                'response_cache': response_cache_stats()}, 200
+
+
+@api.route('/hashing-stats')
+class AdminHashingStats(Resource):
+    @admin_required
+    @api.response(200, 'Password hashing pool metrics')
+    @api.response(403, 'Admin privileges required')
+    def get(self):
+        """Queue depth, latency and rejections of the password hashing pool"""
+        return {'password_hashing': password_hasher.stats()}, 200
+
+
+@api.route('/pool-stats')
+class AdminPoolStats(Resource):
+    @admin_required
+    @api.response(200, 'Database connection pool metrics')
+    @api.response(403, 'Admin privileges required')
+    def get(self):
+        """Size, active/idle connections, checkout wait and overflow of this worker's pools"""
+        pools = {'default': pool_stats(db.engine.pool)}
+        engine = read_engine(current_app)
+        if engine is not None:
+            pools['read'] = pool_stats(engine.pool)
+        return {'connection_pools': pools}, 200
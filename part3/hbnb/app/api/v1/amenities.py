@@ -1,7 +1,14 @@
 #!/usr/bin/python3
+from flask import request
 from flask_restx import Namespace, Resource, fields
-from part3.hbnb.app.models import amenity
+from part3.hbnb.app.authorization import admin_required
+from part3.hbnb.app.conditional import conditional, conditional_collection
+from part3.hbnb.app.responsecache import cached_response
+from part3.hbnb.app.models.amenity import Amenity
+from part3.hbnb.app import serialization
 from part3.hbnb.app.services import facade
+from part3.hbnb.app.api.v1.bulk import read_bulk_rows, bulk_chunk_size, bulk_response
+from part3.hbnb.app.persistence.pagination import parse_page_args
 
 api = Namespace('amenities', description='Amenity operations')
 
@@ -12,6 +19,11 @@ amenity_model = api.model('Amenity', {
 })
 
 
+serialization.register(Amenity, ['id', 'name'])
+amenity_to_dict = serialization.serializer(Amenity)
+AMENITY_COLUMNS = serialization.view_columns(Amenity)
+
+
 @api.route('/')
 class AmenityList(Resource):
     @api.expect(amenity_model)
@@ -22,40 +34,61 @@ class AmenityList(Resource):
         amenity_data = api.payload
         try:
             new_amenity = facade.create_amenity(amenity_data)
-            return {
-                'id': new_amenity.id,
-                'name': new_amenity.name
-            }, 201
+            return amenity_to_dict(new_amenity), 201
         except Exception as e:
             api.abort(400, str(e))
 
+    @cached_response('amenities')
+    @conditional_collection('amenity')
+    @api.doc(params={'limit': 'Page size (enables cursor pagination)',
+                     'cursor': 'next_cursor returned by the previous page'})
     @api.response(200, 'List of amenities retrieved successfully')
+    @api.response(304, 'No amenity changed since the given ETag/date')
     def get(self):
         """Retrieve a list of all amenities"""
         try:
-            amenities = facade.get_all_amenities()
-            return [
-                {
-                    'id': amenity.id,
-                    'name': amenity.name
-                } for amenity in amenities
-            ], 200
+            page_args = parse_page_args(request.args)
+            if page_args:
+                page = facade.get_all_amenities(**page_args, columns=AMENITY_COLUMNS)
+                return serialization.page_response(page, Amenity, rows=True)
+
+            amenities = facade.get_all_amenities(columns=AMENITY_COLUMNS)
+            return serialization.list_response(amenities, Amenity, rows=True)
         except Exception as e:
             api.abort(400, str(e))
 
 
+@api.route('/bulk')
+class AmenityBulk(Resource):
+    @admin_required
+    @api.doc(description='JSON array of amenities, or one per line with '
+                         'Content-Type: application/x-ndjson')
+    @api.response(201, 'All amenities created')
+    @api.response(207, 'Some amenities were rejected, see errors')
+    @api.response(400, 'No amenity could be created')
+    @api.response(403, 'Admin privileges required')
+    def post(self):
+        """Create many amenities at once"""
+        try:
+            rows = read_bulk_rows()
+        except ValueError as e:
+            return {'error': str(e)}, 400
+
+        result = facade.create_amenities_bulk(rows, bulk_chunk_size())
+        return bulk_response(result)
+
+
 @api.route('/<amenity_id>')
 class AmenityResource(Resource):
+    @conditional('amenity')
     @api.response(200, 'Amenity details retrieved successfully')
+    @api.response(304, 'Amenity unchanged since the given ETag/date')
     @api.response(404, 'Amenity not found')
     def get(self, amenity_id):
         """Get amenity details by ID"""
         amenity = facade.get_amenity(amenity_id)
         if amenity:
-            return {
-                'id': amenity.id,
-                'name': amenity.name
-            }, 200
+            return amenity_to_dict(amenity), 200
         else:
             api.abort(404, 'Amenity not found')
 
@@ -69,10 +102,7 @@ class AmenityResource(Resource):
         try:
             updated_amenity = facade.update_amenity(amenity_id, amenity_data)
             if updated_amenity:
-                return {
-                    'id': updated_amenity.id,
-                    'name': updated_amenity.name
-                }, 201
+                return amenity_to_dict(updated_amenity), 201
             else:
                 api.abort(404, 'Amenity not found')
         except Exception as e:
@@ -1,6 +1,9 @@
 from flask_restx import Namespace, Resource, fields
-from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
+from flask_jwt_extended import create_access_token, jwt_required, get_jwt, get_jwt_identity
 from part3.hbnb.app.services import facade
+from part3.hbnb.app.hashing import HashingBusy
+from part3.hbnb.app.authorization import revoke_token
+from part3.hbnb.app.persistence.unitofwork import without_unit_of_work
 
 api = Namespace('auth', description='Authentication operations')
 
@@ -13,16 +16,19 @@ login_model = api.model('Login', {
 
 @api.route('/login')
 class Login(Resource):
+    @without_unit_of_work  # Only reads, the hash must not hold the write lock
     @api.expect(login_model)
+    @api.response(503, 'Password hashing queue is full')
     def post(self):
         """Authenticate user and return a JWT token"""
         credentials = api.payload  # Get the email and password from the request payload
 
-        # Step 1: Retrieve the user based on the provided email
-        user = facade.get_user_by_email(credentials['email'])
-
-        # Step 2: Check if the user exists and the password is correct
-        if not user or not user.verify_password(credentials['password']):
+        # Step 1 & 2: Retrieve the user by email and check the password
+        try:
+            user = facade.authenticate(credentials['email'], credentials['password'])
+        except HashingBusy as e:
+            return {'error': str(e)}, 503, {'Retry-After': '1'}
+        if not user:
             return {'error': 'Invalid credentials'}, 401
 
         # Step 3: Create a JWT token with the user's id and is_admin flag
@@ -31,6 +37,15 @@ class Login(Resource):
         # Step 4: Return the JWT token to the client
         return {'access_token': access_token}, 200
 
+    @api.route('/logout')
+    class Logout(Resource):
+        @jwt_required()
+        @api.response(200, 'Token revoked')
+        def post(self):
+            """Revoke the access token used for this request"""
+            revoke_token(get_jwt()['jti'])
+            return {'message': 'Successfully logged out'}, 200
+
     @api.route('/protected')
     class ProtectedResource(Resource):
         @jwt_required()
@@ -0,0 +1,49 @@
+#!/usr/bin/python3
+import json
+from flask import current_app, request
+from part3.hbnb.app.persistence.repository import BULK_CHUNK_SIZE
+
+NDJSON_MIMETYPES = ('application/x-ndjson', 'application/jsonl')
+
+
+def read_bulk_rows():
+    """Rows of a bulk request body.
+
+    A JSON array is parsed at once; NDJSON is read line by line so large
+    imports are never held in memory as a whole. Lines that are not valid
+    JSON come back as ValueError rows and are reported per row.
+    """
+    if request.mimetype in NDJSON_MIMETYPES:
+        return _iter_ndjson(request.stream)
+
+    payload = request.get_json(silent=True)
+    if not isinstance(payload, list):
+        raise ValueError('Expected a JSON array or an NDJSON body')
+    return payload
+
+
+def _iter_ndjson(stream):
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            yield ValueError('Invalid JSON')
+
+
+def bulk_chunk_size():
+    return current_app.config.get('BULK_CHUNK_SIZE', BULK_CHUNK_SIZE)
+
+
+def bulk_response(result):
+    """201 when every row was created, 207 when some rows were rejected"""
+    body = {
+        'created': len(result.created),
+        'ids': result.created,
+        'errors': result.errors
+    }
+    if not result.errors:
+        return body, 201
+    return body, 207 if result.created else 400
@@ -1,7 +1,11 @@
 #!/usr/bin/python3
 from flask_restx import Namespace, Resource, fields
 from part3.hbnb.app.services import facade
-from flask_jwt_extended import jwt_required, get_jwt_identity
+from part3.hbnb.app.models.placeamenity import PlaceAmenity
+from part3.hbnb.app import serialization
+from part3.hbnb.app.responsecache import cached_response
+from part3.hbnb.app.api.v1.bulk import read_bulk_rows, bulk_chunk_size, bulk_response
+from flask_jwt_extended import jwt_required
 
 api = Namespace('placeamenities', description='Place Amenity Operations')
 
@@ -12,22 +16,18 @@ place_amenity_model = api.model('PlaceAmenity', {
 })
 
 
+serialization.register(PlaceAmenity, ['place_id', 'amenity_id'])
+
+
 @api.route('/')
 class PlaceAmenities(Resource):
+    @cached_response('place_amenities')
     def get(self):
         """Retrieve a list of amenities for places."""
         try:
             # Assuming facade.get_place_amenity() returns a list of place-amenity relationships
             place_amenities = facade.get_place_amenity()
-
-            # Format the response data
-            place_amenity_data = [
-                {
-                    'place_id': pa.place_id,
-                    'amenity_id': pa.amenity_id
-                } for pa in place_amenities
-            ]
-            return place_amenity_data, 200
+            return serialization.list_response(place_amenities, PlaceAmenity)
         except Exception as e:
             return {'error': str(e)}, 400
 
@@ -35,9 +35,6 @@ class PlaceAmenities(Resource):
     @api.expect(place_amenity_model)  # This ensures the model is documented in Swagger
     def post(self):
         """Create a new place-amenity relationship."""
-        current_user = get_jwt_identity()
-        print("Current user identity:", current_user)
-
         # Get payload from the request
         place_amenity_data = api.payload
         if not place_amenity_data:
@@ -56,11 +53,6 @@ class PlaceAmenities(Resource):
         if not amenity:
             return {'error': 'Amenity Not Found'}, 404
 
-        # Validate user
-        user = facade.get_user(current_user['id'])
-        if not user:
-            return {'error': 'User Not Found'}, 404
-
         try:
             # Create a new place-amenity relationship
             new_place_amenity = facade.create_place_amenity(place_amenity_data)
@@ -74,3 +66,22 @@ class PlaceAmenities(Resource):
             return created_place_amenity_data, 201
         except Exception as e:
             return {'error': str(e)}, 400
+
+
+@api.route('/bulk')
+class PlaceAmenitiesBulk(Resource):
+    @jwt_required()
+    @api.doc(description='JSON array of {place_id, amenity_id}, or one per line with '
+                         'Content-Type: application/x-ndjson')
+    @api.response(201, 'All place-amenity relationships created')
+    @api.response(207, 'Some rows were rejected, see errors')
+    @api.response(400, 'No row could be created')
+    def post(self):
+        """Create many place-amenity relationships at once."""
+        try:
+            rows = read_bulk_rows()
+        except ValueError as e:
+            return {'error': str(e)}, 400
+
+        result = facade.create_place_amenities_bulk(rows, bulk_chunk_size())
+        return bulk_response(result)
@@ -1,7 +1,21 @@
 #!/usr/bin/python3
+from datetime import datetime
+from flask import request
 from flask_restx import Namespace, Resource, fields
 from part3.hbnb.app.services import facade
+from part3.hbnb.app.persistence.pagination import parse_page_args, decode_cursor, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+from part3.hbnb.app.models.place import Place
+from part3.hbnb.app.models.amenity import Amenity
+from part3.hbnb.app.models.review import Review
+from part3.hbnb.app.models.user import User
+from part3.hbnb.app.models.placeratingstats import STATS_COLUMNS, summarize
+from part3.hbnb.app import serialization
+from part3.hbnb.app.services.repositories.placerepository import EXPANSIONS, SORT_KEYS
+from part3.hbnb.app.api.v1.bulk import read_bulk_rows, bulk_chunk_size, bulk_response
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from part3.hbnb.app.authorization import owner_required
+from part3.hbnb.app.conditional import conditional, conditional_collection
+from part3.hbnb.app.responsecache import cached_response
 
 
 api = Namespace('places', description='Place operations')
@@ -49,6 +63,94 @@ create_place_model = api.model('PlaceCreate', {
 })
 
 
+PLACE_FIELDS = ['id', 'title', 'description', 'price', 'latitude', 'longitude',
+                ('owner', 'owner_id'), 'created_at', 'updated_at']
+serialization.register(Place, PLACE_FIELDS + [(serialization.MERGE, Place.rating_summary)])
+# Write responses, without the rating aggregates
+serialization.register(Place, PLACE_FIELDS, view='write')
+# List endpoints read projected rows carrying the aggregates columns
+serialization.register(Place, PLACE_FIELDS + [(serialization.MERGE, summarize, STATS_COLUMNS)], view='row')
+PLACE_ROW_COLUMNS = serialization.view_columns(Place, 'row')
+place_to_dict = serialization.serializer(Place)
+written_place_to_dict = serialization.serializer(Place, 'write')
+
+# Embedded related resources (?expand=), shaped like PlaceUser, PlaceAmenity and PlaceReview
+serialization.register(User, ['id', 'first_name', 'last_name', 'email'], view='place')
+serialization.register(Amenity, ['id', 'name'], view='place')
+serialization.register(Review, ['id', 'text', 'rating', 'user_id'], view='place')
+owner_to_dict = serialization.serializer(User, 'place')
+place_amenity_to_dict = serialization.serializer(Amenity, 'place')
+place_review_to_dict = serialization.serializer(Review, 'place')
+EXPANDED_FIELDS = {
+    'owner': lambda place: owner_to_dict(place.owner),
+    'amenities': lambda place: [place_amenity_to_dict(amenity) for amenity in place.amenities],
+    'reviews': lambda place: [place_review_to_dict(review) for review in place.reviews],
+}
+
+
+def parse_expand(args):
+    """The relationships named by ?expand=owner,amenities,reviews, in EXPANSIONS order"""
+    names = {name for name in args.get('expand', '').split(',') if name}
+    unknown = names - set(EXPANSIONS)
+    if unknown:
+        raise ValueError(f"expand must be a comma separated list of {', '.join(EXPANSIONS)}")
+    return tuple(name for name in EXPANSIONS if name in names)
+
+
+# Beyond this a radius search reads most of the table
+MAX_NEARBY_RADIUS_KM = 1000
+
+
+def parse_search_args(args):
+    """Convert the search query string into facade.search_places filters"""
+    def as_float(name):
+        value = args.get(name)
+        if value is None or value == '':
+            return None
+        try:
+            return float(value)
+        except ValueError:
+            raise ValueError(f'{name} must be a number')
+
+    filters = {
+        'min_price': as_float('min_price'),
+        'max_price': as_float('max_price'),
+    }
+
+    box = [as_float(name) for name in ('min_lat', 'min_lon', 'max_lat', 'max_lon')]
+    if any(value is not None for value in box):
+        if any(value is None for value in box):
+            raise ValueError('min_lat, min_lon, max_lat and max_lon must be given together')
+        filters['bbox'] = tuple(box)
+
+    amenities = args.get('amenities')
+    if amenities:
+        filters['amenity_ids'] = [a for a in amenities.split(',') if a]
+
+    sort = args.get('sort', 'price_asc')
+    if sort not in SORT_KEYS:
+        raise ValueError(f"sort must be one of {', '.join(SORT_KEYS)}")
+    filters['sort'] = sort
+
+    try:
+        limit = int(args.get('limit', DEFAULT_PAGE_SIZE))
+    except ValueError:
+        raise ValueError('limit must be an integer')
+    if limit < 1:
+        raise ValueError('limit must be greater than 0')
+    filters['limit'] = min(limit, MAX_PAGE_SIZE)
+
+    cursor = args.get('cursor')
+    if cursor:
+        after = decode_cursor(cursor)
+        # A cursor only continues the sort order it came from
+        if isinstance(after[0], datetime) != (SORT_KEYS[sort][0] is Place.created_at):
+            raise ValueError('cursor does not match the sort order')
+        filters['after'] = after
+
+    return filters
+
+
 @api.route('/')
 class PlaceList(Resource):
     @jwt_required()  # task 3: Secure the Endpoints with JWT Authentication
@@ -64,109 +166,157 @@ class PlaceList(Resource):
         place_data['owner_id'] = current_user.get("id")  # task 3
         try:
             new_place = facade.create_place(place_data)
-
-            response_data = {
-                'id': new_place.id,
-                'title': new_place.title,
-                'description': new_place.description,
-                'price': new_place.price,
-                'latitude': new_place.latitude,
-                'longitude': new_place.longitude,
-                'owner': new_place.owner_id,
-                'created_at': new_place.created_at.isoformat(),
-                'updated_at': new_place.updated_at.isoformat()
-            }
-
-            return response_data, 201
+            return written_place_to_dict(new_place), 201
         except Exception as e:
             api.abort(400, str(e))
 
+    @cached_response('places')
+    @conditional_collection('place')
+    @api.doc(params={'limit': 'Page size (enables cursor pagination)',
+                     'cursor': 'next_cursor returned by the previous page'})
     @api.response(200, 'List of places retrieved successfully')
+    @api.response(304, 'No place changed since the given ETag/date')
     def get(self):
         """Retrieve a list of all places"""
         try:
-            places = facade.get_all_places()
-
-            # Manually serialize each place in the list
-            places_data = []
-            for place in places:
-
-                place_data = {
-                    'id': place.id,
-                    'title': place.title,
-                    'description': place.description,
-                    'price': place.price,
-                    'latitude': place.latitude,
-                    'longitude': place.longitude,
-                    'owner': place.owner_id,
-                    'created_at': place.created_at.isoformat(),
-                    'updated_at': place.updated_at.isoformat()
-                }
-
-                places_data.append(place_data)
-
-            return places_data, 200
+            page_args = parse_page_args(request.args)
+            if page_args:
+                page = facade.get_all_places(**page_args, columns=PLACE_ROW_COLUMNS)
+                return serialization.page_response(page, Place, 'row', rows=True)
+
+            places = facade.get_all_places(columns=PLACE_ROW_COLUMNS)
+            return serialization.list_response(places, Place, 'row', rows=True)
         except Exception as e:
             api.abort(400, str(e))
 
 
+@api.route('/bulk')
+class PlaceBulk(Resource):
+    @jwt_required()
+    @api.doc(description='JSON array of places, or one place per line with '
+                         'Content-Type: application/x-ndjson')
+    @api.response(201, 'All places created')
+    @api.response(207, 'Some places were rejected, see errors')
+    @api.response(400, 'No place could be created')
+    def post(self):
+        """Create many places at once"""
+        current_user = get_jwt_identity()
+        try:
+            rows = read_bulk_rows()
+        except ValueError as e:
+            return {'error': str(e)}, 400
+
+        def with_owner(rows):
+            # Only admins may import places on behalf of other users
+            for row in rows:
+                if isinstance(row, dict) and not (current_user.get('is_admin') and row.get('owner_id')):
+                    row['owner_id'] = current_user.get('id')
+                yield row
+
+        result = facade.create_places_bulk(with_owner(rows), bulk_chunk_size())
+        return bulk_response(result)
+
+
+@api.route('/search')
+class PlaceSearch(Resource):
+    @api.doc(params={
+        'min_price': 'Minimum price per night',
+        'max_price': 'Maximum price per night',
+        'min_lat': 'Bounding box south edge',
+        'min_lon': 'Bounding box west edge',
+        'max_lat': 'Bounding box north edge',
+        'max_lon': 'Bounding box east edge',
+        'amenities': "Comma separated amenity ID's the place must all have",
+        'sort': 'price_asc, price_desc, newest or oldest',
+        'limit': 'Page size',
+        'cursor': 'next_cursor returned by the previous page'
+    })
+    @api.response(200, 'Page of matching places: {results, next_cursor}')
+    @api.response(400, 'Invalid search parameters')
+    def get(self):
+        """Search places by price, location and amenities"""
+        try:
+            filters = parse_search_args(request.args)
+        except ValueError as e:
+            return {'error': str(e)}, 400
+
+        page = facade.search_places(filters, columns=PLACE_ROW_COLUMNS)
+        return serialization.page_response(page, Place, 'row', rows=True)
+
+
+@api.route('/nearby')
+class PlaceNearby(Resource):
+    @api.doc(params={
+        'lat': 'Latitude of the search center',
+        'lon': 'Longitude of the search center',
+        'radius_km': f'Search radius in kilometers, at most {MAX_NEARBY_RADIUS_KM}',
+        'limit': 'Maximum number of places returned'
+    })
+    @api.response(200, 'Nearby places retrieved successfully')
+    @api.response(400, 'Invalid search parameters')
+    def get(self):
+        """Find the closest places around a coordinate"""
+        try:
+            latitude = float(request.args['lat'])
+            longitude = float(request.args['lon'])
+            radius_km = float(request.args['radius_km'])
+            limit = int(request.args.get('limit', DEFAULT_PAGE_SIZE))
+        except (KeyError, ValueError):
+            return {'error': 'lat, lon and radius_km must be numbers'}, 400
+
+        if not (-90.0 <= latitude <= 90.0) or not (-180.0 <= longitude <= 180.0):
+            return {'error': 'lat/lon out of range'}, 400
+        if not 0 < radius_km <= MAX_NEARBY_RADIUS_KM:
+            return {'error': f'radius_km must be greater than 0 and at most {MAX_NEARBY_RADIUS_KM}'}, 400
+        if limit < 1:
+            return {'error': 'limit must be greater than 0'}, 400
+
+        results = facade.get_places_nearby(latitude, longitude, radius_km, min(limit, MAX_PAGE_SIZE),
+                                           columns=PLACE_ROW_COLUMNS)
+        serialize = serialization.serializer(Place, 'row', native=True, rows=PLACE_ROW_COLUMNS)
+        return serialization.json_response([dict(serialize(place), distance_km=round(distance, 3))
+                                            for place, distance in results])
+
+
 @api.route('/<place_id>')
 class PlaceResource(Resource):
+    @conditional('place', expand=parse_expand)
+    @api.doc(params={'expand': 'Comma separated relationships to embed: owner, amenities, reviews'})
     @api.response(200, 'Place details retrieved successfully')
+    @api.response(304, 'Place unchanged since the given ETag/date')
+    @api.response(400, 'Invalid expand argument')
     @api.response(404, 'Place not found')
     def get(self, place_id):
         """Get place details by ID"""
         try:
-            place = facade.get_place(place_id)
+            expand = parse_expand(request.args)
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        try:
+            place = facade.get_place(place_id, expand)
             if not place:
                 return {'error': 'Place not found'}, 404
 
-            place_data = {
-                'id': place.id,
-                'title': place.title,
-                'description': place.description,
-                'price': place.price,
-                'latitude': place.latitude,
-                'longitude': place.longitude,
-                'owner': place.owner_id,
-                'created_at': place.created_at.isoformat(),
-                'updated_at': place.updated_at.isoformat()
-            }
-
-            return place_data, 200
+            place_dict = place_to_dict(place)
+            for name in expand:
+                place_dict[name] = EXPANDED_FIELDS[name](place)
+            return place_dict, 200
         except Exception as e:
             api.abort(400, str(e))
 
-    @jwt_required()  # task 3: Secure the Endpoints with JWT Authentication
+    @owner_required('place')  # task 3: If user is not owner, 403 "Unauthorized action."
     @api.expect(create_place_model)
     @api.response(200, 'Place updated successfully')
     @api.response(404, 'Place not found')
     @api.response(400, 'Invalid input data')
     def put(self, place_id):
         """Update a place's information"""
-        current_user = get_jwt_identity()  # task 3: Identify currently logged-in user
         place_data = api.payload
         try:
             updated_place = facade.update_place(place_id, place_data)
             if not updated_place:
                 return {'error': 'Place not found'}, 404
 
-            # task 3: If user is not owner, 403 error "Unauthorized action."
-            if updated_place.user_id.id != current_user.get("id"):
-                return {'error': 'Unauthorized action.'}, 403
-
-            response_data = {
-                'id': updated_place.id,
-                'title': updated_place.title,
-                'description': updated_place.description,
-                'price': updated_place.price,
-                'latitude': updated_place.latitude,
-                'longitude': updated_place.longitude,
-                'owner': updated_place.owner_id,
-                'created_at': updated_place.created_at.isoformat(),
-                'updated_at': updated_place.updated_at.isoformat()
-            }
-
-            return response_data, 200
+            return written_place_to_dict(updated_place), 200
         except Exception as e:
             return {'error': str(e)}, 400
@@ -1,7 +1,15 @@
 #!/usr/bin/python3
+import itertools
+from flask import Response, request, stream_with_context
 from flask_restx import Namespace, Resource, fields
 from part3.hbnb.app.services import facade
+from part3.hbnb.app.persistence.pagination import parse_page_args
+from part3.hbnb.app.models.review import Review
+from part3.hbnb.app import serialization
 from flask_jwt_extended import jwt_required, get_jwt_identity
+from part3.hbnb.app.authorization import owner_required
+from part3.hbnb.app.conditional import conditional, conditional_collection
+from part3.hbnb.app.responsecache import cached_response, place_reviews_tag
 
 
 api = Namespace('reviews', description='Review operations')
@@ -15,6 +23,28 @@ review_model = api.model('Review', {
 })
 
 
+serialization.register(Review, ['id', 'text', 'rating', 'place_id', 'user_id', 'created_at', 'updated_at'])
+review_to_dict = serialization.serializer(Review)
+REVIEW_COLUMNS = serialization.view_columns(Review)
+
+
+# Number of reviews read from the database and written out per chunk
+STREAM_CHUNK_SIZE = 500
+
+
+def stream_json_array(objs, model, chunk_size=STREAM_CHUNK_SIZE):
+    """Yield a JSON array piece by piece, one chunk of objects at a time"""
+    yield b'['
+    separator = b''
+    while True:
+        chunk = list(itertools.islice(objs, chunk_size))
+        if not chunk:
+            break
+        yield separator + serialization.dump_rows(chunk, model)
+        separator = b','
+    yield b']'
+
+
 @api.route('/')
 class ReviewList(Resource):
     @jwt_required()  # task 3: Secure Endpoints with JWT Authentication
@@ -36,50 +66,32 @@ class ReviewList(Resource):
             return 'You cannot review your own place.', 400
 
         # Check if user already left a review
-        review = facade.get_reviews_by_place(review_data['place_id'])
-        for review in review:
-            if review.user_id == current_user.get("id"):
-                return 'You have already reviewed this place..', 400
+        if facade.user_has_reviewed(current_user.get("id"), place.id):
+            return 'You have already reviewed this place..', 400
 
         try:
             review_data['user_id'] = current_user.get("id")
-            new_review = facade.create_review(review_data)
-
-            # Serialize the review
-            review_data = {
-                'id': new_review.id,
-                'text': new_review.text,
-                'rating': new_review.rating,
-                'place_id': new_review.place_id,
-                'user_id': new_review.user_id,
-                'created_at': new_review.created_at.isoformat(),
-                'updated_at': new_review.updated_at.isoformat()
-            }
-
-            return review_data, 201
+            new_review = facade.create_review(review_data, place=place)
+
+            return review_to_dict(new_review), 201
         except Exception as e:
             return {'error': str(e)}, 400
 
+    @conditional_collection('review')
+    @api.doc(params={'limit': 'Page size (enables cursor pagination)',
+                     'cursor': 'next_cursor returned by the previous page'})
     @api.response(200, 'List of reviews retrieved successfully')
+    @api.response(304, 'No review changed since the given ETag/date')
     def get(self):
         """Retrieve a list of all reviews"""
         try:
-            reviews = facade.get_all_reviews()
-
-            # Manually serialize each review
-            reviews_data = [
-                {
-                    'id': review.id,
-                    'text': review.text,
-                    'rating': review.rating,
-                    'place_id': review.place_id,
-                    'user_id': review.user_id,
-                    'created_at': review.created_at.isoformat(),
-                    'updated_at': review.updated_at.isoformat()
-                } for review in reviews
-            ]
-
-            return reviews_data, 200
+            page_args = parse_page_args(request.args)
+            if page_args:
+                page = facade.get_all_reviews(**page_args, columns=REVIEW_COLUMNS)
+                return serialization.page_response(page, Review, rows=True)
+
+            reviews = facade.get_all_reviews(columns=REVIEW_COLUMNS)
+            return serialization.list_response(reviews, Review, rows=True)
         except Exception as e:
             return {'error': str(e)}, 400
 
@@ -87,71 +99,41 @@ class ReviewList(Resource):
 @api.route('/<review_id>')
 class ReviewResource(Resource):
     @jwt_required()
+    @conditional('review')
     @api.response(200, 'Review details retrieved successfully')
+    @api.response(304, 'Review unchanged since the given ETag/date')
     @api.response(404, 'Review not found')
     def get(self, review_id):
         """Get review details by ID"""
         review = facade.get_review(review_id)
         if review:
-            # Serialize the review
-            review_data = {
-                'id': review.id,
-                'text': review.text,
-                'rating': review.rating,
-                'place_id': review.place_id,
-                'user_id': review.user_id,
-                'created_at': review.created_at.isoformat(),
-                'updated_at': review.updated_at.isoformat()
-            }
-            return review_data, 200
+            return review_to_dict(review), 200
         else:
             return {'error': 'Review does not exist'}, 404
 
-    @jwt_required()  # task 3: Secure Endpoints with JWT Authentication
+    @owner_required('review')  # task 3: only the author (or an admin) may edit
     @api.expect(review_model)
     @api.response(200, 'Review updated successfully')
     @api.response(404, 'Review not found')
     @api.response(400, 'Invalid input data')
     def put(self, review_id):
         """Update a review's information"""
-        current_user = get_jwt_identity()  # task 3: Identify currently logged-in user
         review_data = api.payload
 
-        review = facade.get_review(review_id)  # task 3: Check user_id matches  authenticated user.
-
-        if review.user_id != current_user.get("id"):
-            return {'error': 'Unauthorized action.'}, 403
-
         try:
             updated_review = facade.update_review(review_id, review_data)
             if updated_review:
-                # Serialize the updated review
-                review_data = {
-                    'id': updated_review.id,
-                    'text': updated_review.text,
-                    'rating': updated_review.rating,
-                    'place_id': updated_review.place_id,
-                    'user_id': updated_review.user_id,
-                    'created_at': updated_review.created_at.isoformat(),
-                    'updated_at': updated_review.updated_at.isoformat()
-                }
-                return review_data, 200
+                return review_to_dict(updated_review), 200
             else:
                 return {'error': 'Review does not exist'}, 404
         except Exception as e:
             return {'error': str(e)}, 400
 
-    @jwt_required()
+    @owner_required('review')
     @api.response(200, 'Review deleted successfully')
     @api.response(404, 'Review not found')
     def delete(self, review_id):
         """Delete a review"""
-        current_user = get_jwt_identity()  # task 3: Ensure the user is authenticated
-        review = facade.get_review(review_id)  # task 3: Check user_id matches  authenticated user.
-
-        if review.user_id != current_user.get("id"):
-            return {'error': 'Unauthorized action.'}, 403
-
         try:
             delete_review = facade.delete_review(review_id)
             if delete_review:
@@ -164,28 +146,29 @@ class ReviewResource(Resource):
 
 @api.route('/places/<place_id>/reviews')
 class PlaceReviewList(Resource):
+    @cached_response(place_reviews_tag)
+    @conditional_collection('review')
+    @api.doc(params={'limit': 'Page size (enables cursor pagination)',
+                     'cursor': 'next_cursor returned by the previous page'})
     @api.response(200, 'List of reviews for the place retrieved successfully')
     @api.response(404, 'Place not found')
     def get(self, place_id):
         """Get all reviews for a specific place"""
         try:
-            reviews = facade.get_reviews_by_place(place_id)
-            if reviews:
-                # Manually serialize each review
-                reviews_data = [
-                    {
-                        'id': review.id,
-                        'text': review.text,
-                        'rating': review.rating,
-                        'place_id': review.place_id,
-                        'user_id': review.user_id,
-                        'created_at': review.created_at.isoformat(),
-                        'updated_at': review.updated_at.isoformat()
-                    } for review in reviews
-                ]
-
-                return reviews_data, 200
-            else:
+            page_args = parse_page_args(request.args)
+            if page_args:
+                page = facade.get_reviews_by_place(place_id, **page_args)
+                return serialization.page_response(page, Review)
+
+            if not facade.get_reviews_by_place(place_id, limit=1).items:
                 return {'error': 'Place does not exist or has no reviews'}, 404
+
+            # Stream the array so popular places aren't serialized in one go.
+            # The query runs inside the generator, within the streaming context.
+            def generate():
+                reviews = iter(facade.iter_reviews_by_place(place_id, STREAM_CHUNK_SIZE))
+                yield from stream_json_array(reviews, Review)
+
+            return Response(stream_with_context(generate()), status=200, mimetype='application/json')
         except Exception as e:
             return {'error': str(e)}, 400
@@ -1,7 +1,12 @@
 #!/usr/bin/python3
+from flask import request
 from flask_restx import Namespace, Resource, fields
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from ...services import facade
+from ...hashing import HashingBusy
+from ...persistence.pagination import parse_page_args
+from ...models.user import User
+from ... import serialization
 
 api = Namespace('users', description='User operations')
 
@@ -21,6 +26,13 @@ update_user_model = api.model('UpdateUser', {
 })
 
 
+serialization.register(User, ['id', 'first_name', 'last_name', 'email'])
+serialization.register(User, ['id', 'first_name', 'last_name', 'email', 'is_admin'], view='account')
+user_to_dict = serialization.serializer(User)
+USER_COLUMNS = serialization.view_columns(User)
+account_to_dict = serialization.serializer(User, 'account')
+
+
 @api.route('/')
 class UserList(Resource):
 
@@ -28,6 +40,7 @@ class UserList(Resource):
     @api.response(201, 'User successfully created')
     @api.response(400, 'Email already registered')
     @api.response(400, 'Invalid input data')
+    @api.response(503, 'Password hashing queue is full')
     def post(self):
         """Register a new user"""
         user_data = api.payload
@@ -36,12 +49,11 @@ class UserList(Resource):
         if existing_user:
             return {'error': 'Email already registered'}, 400
 
-        new_user = facade.create_user(user_data)
-        return {'id': new_user.id,
-                'first_name': new_user.first_name,
-                'last_name': new_user.last_name,
-                'email': new_user.email,
-                'is_admin': new_user.is_admin}, 201
+        try:
+            new_user = facade.create_user(user_data)
+        except HashingBusy as e:
+            return {'error': str(e)}, 503, {'Retry-After': '1'}
+        return account_to_dict(new_user), 201
 
 
 @api.route('/<user_id>')
@@ -53,19 +65,26 @@ class UserResource(Resource):
         user = facade.get_user(user_id)
         if not user:
             return {'error': 'User not found'}, 404
-        return {'id': user.id, 'first_name': user.first_name, 'last_name': user.last_name, 'email': user.email}, 200
+        return user_to_dict(user), 200
 
 
 @api.route('/user-list')
 class Users(Resource):
+    @api.doc(params={'limit': 'Page size (enables cursor pagination)',
+                     'cursor': 'next_cursor returned by the previous page'})
     @api.response(200, 'List of users retrieved successfully')
+    @api.response(400, 'Invalid pagination parameters')
     def get(self):
         """List of users"""
-        users = facade.get_all_users()
-        return [{'id': user.id,
-                 'first_name': user.first_name,
-                 'last_name': user.last_name,
-                 'email': user.email} for user in users], 200
+        try:
+            page_args = parse_page_args(request.args)
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        if page_args:
+            page = facade.get_all_users(**page_args, columns=USER_COLUMNS)
+            return serialization.page_response(page, User, rows=True)
+
+        return serialization.list_response(facade.get_all_users(columns=USER_COLUMNS), User, rows=True)
 
 
 @api.route('/update/<user_id>')
@@ -89,7 +108,4 @@ class UserResource(Resource):
         updated_user = facade.update_user(user_id, user_data)
         if not updated_user:
             return {'error': 'User not found'}, 404
-        return {'id': updated_user.id,
-                'first_name': updated_user.first_name,
-                'last_name': updated_user.last_name,
-                'email': updated_user.email}, 200
+        return user_to_dict(updated_user), 200
@@ -0,0 +1,179 @@
+#!/usr/bin/python3
+"""ASGI application: the public read endpoints on asyncio, the rest on Flask.
+
+These GET endpoints are served by coroutines on the asyncio repositories,
+with the bodies of their Flask counterparts:
+    /api/v1/places/              /api/v1/places/<place_id>
+    /api/v1/amenities/           /api/v1/amenities/<amenity_id>
+    /api/v1/reviews/             /api/v1/reviews/places/<place_id>/reviews
+A slow client or a query waiting on the database costs a suspended
+coroutine rather than a thread. Every other request (writes, authenticated
+and search endpoints, docs) goes to the Flask app through asgiref's WSGI
+adapter, on a thread as before, and so does one a handler declines by
+returning None (a place with ?expand=).
+
+Conditional GET, the response cache, compression and X-Query-Count are
+Flask hooks: they only apply to the requests Flask serves.
+
+Run it with any ASGI server, from the repository root:
+    uvicorn part3.asgi:app --workers 4
+"""
+import re
+from urllib.parse import parse_qsl
+
+from werkzeug.datastructures import MultiDict
+
+from part3.hbnb.app import create_app, db, serialization
+from part3.hbnb.app.api.v1.amenities import AMENITY_COLUMNS
+from part3.hbnb.app.api.v1.places import PLACE_ROW_COLUMNS
+from part3.hbnb.app.api.v1.reviews import REVIEW_COLUMNS, STREAM_CHUNK_SIZE
+from part3.hbnb.app.models.amenity import Amenity
+from part3.hbnb.app.models.place import Place
+from part3.hbnb.app.models.review import Review
+from part3.hbnb.app.persistence.asyncrepository import create_async_database
+from part3.hbnb.app.persistence.pagination import parse_page_args
+from part3.hbnb.app.services.asyncfacade import AsyncHBnBFacade
+
+try:
+    from asgiref.wsgi import WsgiToAsgi
+except ImportError:  # pragma: no cover - without it only the async endpoints are served
+    WsgiToAsgi = None
+
+# Path segments that name other GET endpoints, not a place
+_PLACE_ID = r'(?P<place_id>(?!(?:search|nearby|bulk)$)[^/]+)'
+
+
+class AsyncReadAPI:
+    def __init__(self, flask_app):
+        with flask_app.app_context():
+            url = db.engine.url
+        self.engine, sessions = create_async_database(url, flask_app.config)
+        self.facade = AsyncHBnBFacade(sessions)
+        self.flask_app = flask_app
+        self.fallback = WsgiToAsgi(flask_app) if WsgiToAsgi is not None else None
+        self.routes = [(re.compile(pattern), handler) for pattern, handler in (
+            (r'/api/v1/places/', self.list_places),
+            (rf'/api/v1/places/{_PLACE_ID}', self.get_place),
+            (r'/api/v1/amenities/', self.list_amenities),
+            (r'/api/v1/amenities/(?P<amenity_id>(?!bulk$)[^/]+)', self.get_amenity),
+            (r'/api/v1/reviews/', self.list_reviews),
+            (r'/api/v1/reviews/places/(?P<place_id>[^/]+)/reviews', self.list_place_reviews),
+        )]
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            return await self._lifespan(receive, send)
+        if scope['type'] == 'http' and scope['method'] == 'GET':
+            for pattern, handler in self.routes:
+                match = pattern.fullmatch(scope['path'])
+                if match:
+                    args = MultiDict(parse_qsl(scope['query_string'].decode('latin-1'), keep_blank_values=True))
+                    response = await handler(args, **match.groupdict())
+                    if response is not None:
+                        return await self._send(send, *response)
+                    break
+        if self.fallback is None:
+            return await self._send(send, 404, serialization.dumps({'message': 'Not found'}))
+        await self.fallback(scope, receive, send)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await self.engine.dispose()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def _send(self, send, status, body):
+        """Send bytes, or the chunks of an async iterator as a streamed body"""
+        headers = [(b'content-type', b'application/json')]
+        if isinstance(body, bytes):
+            headers.append((b'content-length', str(len(body)).encode()))
+            await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+            await send({'type': 'http.response.body', 'body': body})
+            return
+        await send({'type': 'http.response.start', 'status': status, 'headers': headers})
+        async for chunk in body:
+            await send({'type': 'http.response.body', 'body': chunk, 'more_body': True})
+        await send({'type': 'http.response.body', 'body': b''})
+
+    # PLACE
+    async def list_places(self, args):
+        try:
+            page_args = parse_page_args(args)
+        except ValueError as e:
+            return 400, serialization.dumps({'message': str(e)})
+        if page_args:
+            page = await self.facade.get_all_places(PLACE_ROW_COLUMNS, **page_args)
+            return 200, serialization.page_body(page, Place, 'row', rows=True)
+        places = await self.facade.get_all_places(PLACE_ROW_COLUMNS)
+        return 200, serialization.list_body(places, Place, 'row', rows=True)
+
+    async def get_place(self, args, place_id):
+        if args.get('expand'):
+            # Embedded relationships are served by Flask
+            return None
+        row = await self.facade.get_place(place_id, PLACE_ROW_COLUMNS)
+        if row is None:
+            return 404, serialization.dumps({'error': 'Place not found'})
+        serialize = serialization.serializer(Place, 'row', native=True, rows=row._fields)
+        return 200, serialization.dumps(serialize(row))
+
+    # AMENITY
+    async def list_amenities(self, args):
+        try:
+            page_args = parse_page_args(args)
+        except ValueError as e:
+            return 400, serialization.dumps({'message': str(e)})
+        if page_args:
+            page = await self.facade.get_all_amenities(AMENITY_COLUMNS, **page_args)
+            return 200, serialization.page_body(page, Amenity, rows=True)
+        amenities = await self.facade.get_all_amenities(AMENITY_COLUMNS)
+        return 200, serialization.list_body(amenities, Amenity, rows=True)
+
+    async def get_amenity(self, args, amenity_id):
+        amenity = await self.facade.get_amenity(amenity_id)
+        if amenity is None:
+            return 404, serialization.dumps({'message': 'Amenity not found'})
+        return 200, serialization.dumps(serialization.serializer(Amenity, native=True)(amenity))
+
+    # REVIEW
+    async def list_reviews(self, args):
+        try:
+            page_args = parse_page_args(args)
+        except ValueError as e:
+            return 400, serialization.dumps({'error': str(e)})
+        if page_args:
+            page = await self.facade.get_all_reviews(REVIEW_COLUMNS, **page_args)
+            return 200, serialization.page_body(page, Review, rows=True)
+        reviews = await self.facade.get_all_reviews(REVIEW_COLUMNS)
+        return 200, serialization.list_body(reviews, Review, rows=True)
+
+    async def list_place_reviews(self, args, place_id):
+        try:
+            page_args = parse_page_args(args)
+        except ValueError as e:
+            return 400, serialization.dumps({'error': str(e)})
+        if page_args:
+            page = await self.facade.get_reviews_by_place(place_id, REVIEW_COLUMNS, **page_args)
+            return 200, serialization.page_body(page, Review, rows=True)
+        if not (await self.facade.get_reviews_by_place(place_id, REVIEW_COLUMNS, limit=1)).items:
+            return 404, serialization.dumps({'error': 'Place does not exist or has no reviews'})
+        return 200, self._stream_reviews(place_id)
+
+    async def _stream_reviews(self, place_id):
+        """The place's reviews as a JSON array, one chunk of rows at a time"""
+        yield b'['
+        separator = b''
+        async for chunk in self.facade.iter_reviews_by_place(place_id, REVIEW_COLUMNS, STREAM_CHUNK_SIZE):
+            yield separator + serialization.dump_rows(chunk, Review, rows=True)
+            separator = b','
+        yield b']'
+
+
+def create_asgi_app(config_class="config.DevelopmentConfig"):
+    """Create the Flask app (configuration, database initialization, the
+    endpoints the async tier doesn't serve) and the ASGI app around it"""
+    return AsyncReadAPI(create_app(config_class))
@@ -0,0 +1,107 @@
+#!/usr/bin/python3
+from datetime import timedelta
+from functools import lru_cache, wraps
+
+from flask import current_app
+from flask_jwt_extended import get_jwt_identity, jwt_required
+from flask_jwt_extended.config import config as jwt_config
+from jwt.algorithms import get_default_algorithms
+
+from part3.hbnb.app import jwt
+from part3.hbnb.app.persistence.cache import InProcessCache, SharedCache
+from part3.hbnb.app.services import facade
+
+DEFAULT_TOKEN_LIFETIME = timedelta(minutes=15)
+
+
+@lru_cache(maxsize=8)
+def _key_material(algorithm, key):
+    """Parse a signing key once instead of on every token verification"""
+    return get_default_algorithms()[algorithm].prepare_key(key)
+
+
+def _token_lifetime(config):
+    expires = config.get('JWT_ACCESS_TOKEN_EXPIRES', DEFAULT_TOKEN_LIFETIME)
+    if not expires:
+        # Tokens never expire, keep revocations for a day
+        return 86400
+    if isinstance(expires, timedelta):
+        return int(expires.total_seconds())
+    return int(expires)
+
+
+def build_denylist(config):
+    """Create the revoked-token store selected by TOKEN_DENYLIST.
+
+    Entries live as long as an access token, so a revoked jti is only
+    forgotten once the token it names has expired anyway (or when the store
+    is full, in which case the oldest revocations go first).
+    """
+    backend = config.get('TOKEN_DENYLIST', 'memory')
+    ttl = _token_lifetime(config)
+    max_entries = config.get('TOKEN_DENYLIST_SIZE', 100000)
+    if backend == 'memory':
+        return InProcessCache(max_entries=max_entries, ttl=ttl)
+    if backend == 'sqlite':
+        return SharedCache(config['TOKEN_DENYLIST_PATH'], max_entries=max_entries, ttl=ttl)
+    raise ValueError(f"Unknown TOKEN_DENYLIST backend: {backend}")
+
+
+def _denylist():
+    return current_app.extensions['token_denylist']
+
+
+def revoke_token(jti):
+    _denylist().set(jti, b'1')
+
+
+def init_authorization(app):
+    """Hook the denylist and the key cache into flask_jwt_extended"""
+    app.extensions['token_denylist'] = build_denylist(app.config)
+
+    @jwt.decode_key_loader
+    def decode_key(jwt_header, jwt_data):
+        # Keyed on the configured algorithm, never on the unverified header
+        return _key_material(jwt_config.algorithm, jwt_config.decode_key)
+
+    @jwt.token_in_blocklist_loader
+    def is_revoked(jwt_header, jwt_data):
+        jti = jwt_data.get('jti')
+        return jti is not None and _denylist().get(jti) is not None
+
+
+def admin_required(fn):
+    """Require a valid token whose identity has is_admin set"""
+    @wraps(fn)
+    @jwt_required()
+    def wrapper(*args, **kwargs):
+        if not get_jwt_identity().get('is_admin'):
+            return {'error': 'Admin privileges required'}, 403
+        return fn(*args, **kwargs)
+    return wrapper
+
+
+def owner_required(resource, id_arg=None, allow_admin=True):
+    """Require the caller to own the resource named by the view argument.
+
+    Ownership is read with a single primary-key query on the owner column
+    (see HBnBFacade.get_owner_id), the resource itself is not loaded.
+    """
+    id_arg = id_arg or f'{resource}_id'
+
+    def decorator(fn):
+        @wraps(fn)
+        @jwt_required()
+        def wrapper(*args, **kwargs):
+            identity = get_jwt_identity()
+            if allow_admin and identity.get('is_admin'):
+                return fn(*args, **kwargs)
+
+            owner_id = facade.get_owner_id(resource, kwargs[id_arg])
+            if owner_id is None:
+                return {'error': f'{resource.capitalize()} not found'}, 404
+            if owner_id != identity.get('id'):
+                return {'error': 'Unauthorized action.'}, 403
+            return fn(*args, **kwargs)
+        return wrapper
+    return decorator
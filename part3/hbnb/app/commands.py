@@ -0,0 +1,49 @@
+#!/usr/bin/python3
+import click
+from part3.hbnb.app import db
+from part3.hbnb.app.persistence import migrations, startup
+from part3.hbnb.app.services import facade
+
+
+def init_commands(app):
+    """Register the maintenance commands available through `flask`"""
+
+    @app.cli.command('rebuild-rating-stats')
+    def rebuild_rating_stats():
+        """Recompute every place's review aggregates from the review table"""
+        count = facade.rebuild_rating_stats()
+        click.echo(f"Rebuilt rating stats for {count} places")
+
+    @app.cli.command('db-upgrade')
+    @click.option('--to', 'target', type=int, default=None, help='Stop after this migration version')
+    def db_upgrade(target):
+        """Apply the pending schema migrations"""
+        applied = migrations.upgrade(db.engine, target)
+        for migration in applied:
+            click.echo(f"Applied {migration.version:04d}_{migration.name}")
+        click.echo(f"Schema version {migrations.current_version(db.engine)}")
+
+    @app.cli.command('db-init')
+    def db_init():
+        """Apply the pending migrations and the seed data if it changed"""
+        result = startup.initialize(db.engine)
+        for migration in result.applied:
+            click.echo(f"Applied {migration.version:04d}_{migration.name}")
+        if result.seeded:
+            click.echo("Applied seed data")
+        if result.skipped:
+            click.echo("Database already current")
+
+    @app.cli.command('db-version')
+    def db_version():
+        """Show the applied and pending schema migrations"""
+        current = migrations.current_version(db.engine)
+        for migration in migrations.available_migrations():
+            state = 'applied' if migration.version <= current else 'pending'
+            click.echo(f"{migration.version:04d}_{migration.name} {state}")
+        raw = db.engine.raw_connection()
+        try:
+            seeded = startup.applied_seed_checksum(raw.driver_connection) == startup.seed_checksum()
+        finally:
+            raw.close()
+        click.echo(f"seed data {'applied' if seeded else 'pending'}")
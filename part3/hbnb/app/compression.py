@@ -0,0 +1,89 @@
+#!/usr/bin/python3
+import zlib
+
+from flask import current_app, request
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional
+    brotli = None
+
+# Only text is worth compressing, images and archives already are
+COMPRESSIBLE_TYPES = ('application/json', 'application/x-ndjson', 'application/javascript', 'text/')
+
+
+def available_encodings():
+    """Supported content codings, in the server's order of preference"""
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def choose_encoding():
+    """Content coding for the current request from Accept-Encoding, None for identity"""
+    if not current_app.config.get('COMPRESS_RESPONSES', True):
+        return None
+    accepted = request.accept_encodings
+    best, best_quality = None, 0
+    for encoding in available_encodings():
+        quality = accepted[encoding]
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def _compressor(encoding, config):
+    """(process, finish) functions of an incremental compressor"""
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=config.get('COMPRESS_BROTLI_QUALITY', 4))
+        return compressor.process, compressor.finish
+    # wbits=31 writes the gzip header and trailer
+    compressor = zlib.compressobj(config.get('COMPRESS_LEVEL', 6), zlib.DEFLATED, 31)
+    return compressor.compress, compressor.flush
+
+
+def _compress_stream(chunks, process, finish):
+    for chunk in chunks:
+        compressed = process(chunk)
+        if compressed:
+            yield compressed
+    yield finish()
+
+
+def compress(response, encoding):
+    """Compress a 200 text response in place with the given content coding.
+
+    Bodies under COMPRESS_MIN_SIZE are left alone. A streamed body is
+    compressed chunk by chunk, whatever its size, as it is sent.
+    """
+    if (response.status_code != 200 or response.direct_passthrough
+            or 'Content-Encoding' in response.headers
+            or not (response.mimetype or '').startswith(COMPRESSIBLE_TYPES)):
+        return response
+
+    response.vary.add('Accept-Encoding')
+    if encoding is None:
+        return response
+
+    config = current_app.config
+    if not response.is_streamed and response.calculate_content_length() < config.get('COMPRESS_MIN_SIZE', 1024):
+        return response
+
+    process, finish = _compressor(encoding, config)
+    if response.is_streamed:
+        response.response = _compress_stream(response.iter_encoded(), process, finish)
+        response.headers.pop('Content-Length', None)
+    else:
+        response.set_data(process(response.get_data()) + finish())
+
+    # The compressed bytes differ, only a weak validator still holds
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    response.headers['Content-Encoding'] = encoding
+    return response
+
+
+def init_compression(app):
+    """Compress responses according to the client's Accept-Encoding"""
+    @app.after_request
+    def compress_response(response):
+        return compress(response, choose_encoding())
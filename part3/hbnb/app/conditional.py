@@ -0,0 +1,88 @@
+#!/usr/bin/python3
+from datetime import timezone
+from functools import wraps
+
+from flask import Response, request
+from werkzeug.http import http_date, quote_etag
+
+from part3.hbnb.app.services import facade
+
+
+def _stamp(moment):
+    return moment.strftime('%Y%m%d%H%M%S%f')
+
+
+def _is_fresh(etag, last_modified):
+    """Whether the client's copy matches, If-None-Match taking precedence"""
+    if request.if_none_match:
+        return request.if_none_match.contains_weak(etag)
+    if request.if_modified_since:
+        # Last-Modified only has whole seconds
+        modified = last_modified.replace(microsecond=0, tzinfo=timezone.utc)
+        return modified <= request.if_modified_since
+    return False
+
+
+def _respond(method, args, kwargs, etag, last_modified):
+    """304 before the view runs when the client is current, else the view's
+    response with ETag and Last-Modified added to a 200"""
+    headers = {'ETag': quote_etag(etag, weak=True), 'Last-Modified': http_date(last_modified)}
+    if _is_fresh(etag, last_modified):
+        return Response(status=304, headers=headers)
+
+    result = method(*args, **kwargs)
+    if isinstance(result, Response):
+        if result.status_code == 200:
+            result.headers.update(headers)
+        return result
+    if not isinstance(result, tuple):
+        result = (result, 200)
+    if result[1] != 200:
+        return result
+    return result[0], 200, {**(result[2] if len(result) > 2 else {}), **headers}
+
+
+def conditional(resource, id_arg=None, expand=None):
+    """Answer GET on a single resource with 304 when it hasn't changed.
+
+    The ETag is built from the id and updated_at, read with one primary-key
+    query (see HBnBFacade.get_version); the resource itself is not loaded
+    when the client's copy is current.
+
+    expand parses the query string into the relationships the response
+    embeds; their changes then count too, and each expansion has its ETag.
+    """
+    id_arg = id_arg or f'{resource}_id'
+
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            obj_id = kwargs[id_arg]
+            try:
+                embedded = expand(request.args) if expand else ()
+            except ValueError:
+                # The view reports the bad argument
+                return fn(*args, **kwargs)
+            updated_at = facade.get_version(resource, obj_id, embedded)
+            if updated_at is None:
+                return fn(*args, **kwargs)
+            etag = '-'.join([obj_id, *embedded, _stamp(updated_at)])
+            return _respond(fn, args, kwargs, etag, updated_at)
+        return wrapper
+    return decorator
+
+
+def conditional_collection(resource):
+    """Answer GET on a list with 304 when nothing in the collection changed.
+
+    The ETag is built from the collection's row count and last change
+    time, kept up to date on every write (see persistence.versions).
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            row_count, last_modified = facade.get_collection_version(resource)
+            etag = f'{resource}s-{row_count}-{_stamp(last_modified)}'
+            return _respond(fn, args, kwargs, etag, last_modified)
+        return wrapper
+    return decorator
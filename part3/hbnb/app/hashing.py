@@ -0,0 +1,239 @@
+#!/usr/bin/python3
+import hashlib
+import hmac
+import os
+import threading
+import time
+
+import bcrypt as _bcrypt
+from part3.hbnb.app.persistence.cache import InProcessCache
+
+# bcrypt only looks at the first 72 bytes of a password
+MAX_PASSWORD_BYTES = 72
+
+
+class HashingBusy(Exception):
+    """Raised when too many hashing jobs are already waiting"""
+
+
+def _to_bytes(password):
+    return password.encode('utf-8')[:MAX_PASSWORD_BYTES]
+
+
+def _hash(password, rounds):
+    return _bcrypt.hashpw(_to_bytes(password), _bcrypt.gensalt(rounds=rounds)).decode('utf-8')
+
+
+def _check(pw_hash, password):
+    pw_hash = pw_hash.encode('utf-8')
+    try:
+        return hmac.compare_digest(_bcrypt.hashpw(_to_bytes(password), pw_hash), pw_hash)
+    except ValueError:
+        # Not a bcrypt hash
+        return False
+
+
+def hash_cost(pw_hash):
+    """Work factor stored in a bcrypt hash ($2b$12$...), or None"""
+    try:
+        return int(pw_hash.split('$')[2])
+    except (AttributeError, IndexError, ValueError):
+        return None
+
+
+class CredentialCache:
+    """Short-lived memory of recent successful password checks.
+
+    Entries are keyed by an HMAC-SHA256 of (user id, stored hash, password)
+    under a random per-process key, so no plaintext is kept and changing
+    the stored hash makes old entries unreachable.
+    """
+
+    def __init__(self, max_entries=10000, ttl=300):
+        self._key = os.urandom(32)
+        self._entries = InProcessCache(max_entries=max_entries, ttl=ttl)
+
+    def _digest(self, user_id, pw_hash, password):
+        message = '\0'.join((str(user_id), pw_hash, password)).encode('utf-8')
+        return hmac.new(self._key, message, hashlib.sha256).hexdigest()
+
+    def contains(self, user_id, pw_hash, password):
+        return self._entries.get(self._digest(user_id, pw_hash, password)) is not None
+
+    def add(self, user_id, pw_hash, password):
+        self._entries.set(self._digest(user_id, pw_hash, password), True)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self):
+        stats = self._entries.stats()
+        del stats['backend']
+        stats['ttl'] = self._entries.ttl
+        return stats
+
+
+class PasswordHasher:
+    """bcrypt hashing and verification run in a bounded process pool.
+
+    The request thread only waits on a future while the CPU-bound bcrypt
+    work runs in worker processes, so throughput scales with cores rather
+    than with WSGI threads. With PASSWORD_HASH_WORKERS = 0 the work runs
+    inline, which is what the tests use.
+
+    Config:
+        BCRYPT_LOG_ROUNDS: work factor of new hashes
+        PASSWORD_HASH_WORKERS: size of the process pool (0 = inline)
+        PASSWORD_HASH_MAX_PENDING: jobs allowed to wait before HashingBusy
+        PASSWORD_HASH_TIMEOUT: seconds a request waits for its result
+            before HashingBusy (the job keeps its slot until it ends)
+        CREDENTIAL_CACHE_TTL: seconds a successful check is remembered
+            (0 disables the credential cache)
+        CREDENTIAL_CACHE_SIZE: most remembered checks
+    """
+
+    def __init__(self, app=None):
+        self.rounds = 12
+        self.workers = 0
+        self.max_pending = 64
+        self.timeout = 10
+        self.credential_cache = None
+        self._executor = None
+        self._executor_pid = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._reset_metrics()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.rounds = app.config.get('BCRYPT_LOG_ROUNDS', 12)
+        self.workers = app.config.get('PASSWORD_HASH_WORKERS', 0)
+        self.max_pending = app.config.get('PASSWORD_HASH_MAX_PENDING', 64)
+        self.timeout = app.config.get('PASSWORD_HASH_TIMEOUT', 10)
+        ttl = app.config.get('CREDENTIAL_CACHE_TTL', 0)
+        self.credential_cache = CredentialCache(
+            max_entries=app.config.get('CREDENTIAL_CACHE_SIZE', 10000), ttl=ttl) if ttl else None
+        self._reset_metrics()
+        self.shutdown()
+
+    def _reset_metrics(self):
+        self.completed = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.max_queue_depth = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.rehash_checks = 0
+        self.rehashed = 0
+
+    def _pool(self):
+        # Created lazily and per process, so pre-forking servers don't share it
+        if self._executor is None or self._executor_pid != os.getpid():
+            # Imported here, multiprocessing is only needed once a hash is requested
+            from concurrent.futures import ProcessPoolExecutor
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            self._executor_pid = os.getpid()
+        return self._executor
+
+    def _acquire(self):
+        """Take a pending slot, returns the function releasing it (once)"""
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.rejected += 1
+                raise HashingBusy('Too many password hashing requests, retry later')
+            self._pending += 1
+            self.max_queue_depth = max(self.max_queue_depth, self._pending)
+
+        start = time.perf_counter()
+        released = []
+
+        def release(*args):
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                if released:
+                    return
+                released.append(True)
+                self._pending -= 1
+                self.completed += 1
+                self.total_seconds += elapsed
+                self.max_seconds = max(self.max_seconds, elapsed)
+        return release
+
+    def _run(self, func, *args):
+        release = self._acquire()
+        if not self.workers:
+            try:
+                return func(*args)
+            finally:
+                release()
+
+        from concurrent.futures import TimeoutError as FuturesTimeout
+        try:
+            future = self._pool().submit(func, *args)
+        except BaseException:
+            release()
+            raise
+        # A job outliving its caller's timeout keeps its slot until it ends
+        future.add_done_callback(release)
+        try:
+            return future.result(timeout=self.timeout)
+        except FuturesTimeout:
+            # Frees the slot right away when the job hasn't started yet
+            future.cancel()
+            with self._lock:
+                self.timed_out += 1
+            raise HashingBusy('Password hashing is taking too long, retry later')
+        finally:
+            if future.done():
+                release()
+
+    def hash(self, password, rounds=None):
+        if not password:
+            raise ValueError('Password must be non-empty.')
+        return self._run(_hash, password, rounds or self.rounds)
+
+    def verify(self, pw_hash, password, user_id=None):
+        """Check a password; with a user_id, recent successes skip bcrypt"""
+        if not pw_hash or not password:
+            return False
+        cache = self.credential_cache if user_id is not None else None
+        if cache and cache.contains(user_id, pw_hash, password):
+            return True
+        valid = self._run(_check, pw_hash, password)
+        if valid and cache:
+            cache.add(user_id, pw_hash, password)
+        return valid
+
+    def needs_rehash(self, pw_hash):
+        """True when a hash was made with another work factor than configured"""
+        needed = hash_cost(pw_hash) != self.rounds
+        with self._lock:
+            self.rehash_checks += 1
+            if needed:
+                self.rehashed += 1
+        return needed
+
+    def stats(self):
+        return {
+            'workers': self.workers,
+            'work_factor': self.rounds,
+            'queue_depth': self._pending,
+            'max_queue_depth': self.max_queue_depth,
+            'max_pending': self.max_pending,
+            'completed': self.completed,
+            'rejected': self.rejected,
+            'timed_out': self.timed_out,
+            'avg_latency_ms': round(self.total_seconds / self.completed * 1000, 2) if self.completed else None,
+            'max_latency_ms': round(self.max_seconds * 1000, 2),
+            'rehash_checks': self.rehash_checks,
+            'rehashed': self.rehashed,
+            'rehash_ratio': round(self.rehashed / self.rehash_checks, 4) if self.rehash_checks else None,
+            'credential_cache': self.credential_cache.stats() if self.credential_cache else None,
+        }
+
+    def shutdown(self):
+        if self._executor is not None and self._executor_pid == os.getpid():
+            self._executor.shutdown(wait=False)
+        self._executor = None
+        self._executor_pid = None
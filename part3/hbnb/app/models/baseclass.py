@@ -2,13 +2,14 @@
 import uuid
 from datetime import datetime
 from ...app import db  # task 7
+from ...app.serialization import COLUMNS, serializer
 
 
 class BaseModel(db.Model):  # task 7
     __abstract__ = True  # This ensures SQLAlchemy does not create a table for BaseModel
 
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)  # keyset pagination order
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     def __init__(self):
@@ -29,11 +30,5 @@ class BaseModel(db.Model):  # task 7
         self.save()  # Update the updated_at timestamp
 
     def to_dict(self):
-        """Convert the object attributes to a dictionary for serialization"""
-        result = self.__dict__.copy()
-        # Convert datetime fields to ISO format
-        if 'created_at' in result:
-            result['created_at'] = result['created_at'].isoformat()
-        if 'updated_at' in result:
-            result['updated_at'] = result['updated_at'].isoformat()
-        return result
+        """Convert the object's columns to a dictionary for serialization"""
+        return serializer(type(self), COLUMNS)(self)
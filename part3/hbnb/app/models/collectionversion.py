@@ -0,0 +1,13 @@
+#!/usr/bin/python3
+from part3.hbnb.app import db
+
+
+class CollectionVersion(db.Model):
+    """Row count and last change time of a table, kept up to date by the
+    repositories so list responses can be revalidated without a scan"""
+    __tablename__ = 'collection_version'
+    __table_args__ = {'extend_existing': True}
+
+    name = db.Column(db.String(64), primary_key=True)
+    row_count = db.Column(db.Integer, nullable=False, default=0)
+    last_modified = db.Column(db.DateTime, nullable=False)
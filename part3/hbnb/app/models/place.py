@@ -1,21 +1,43 @@
 #!/usr/bin/python3
+from sqlalchemy import event
 from .baseclass import BaseModel
 from part3.hbnb.app.models.user import User
+from part3.hbnb.app.models.amenity import Amenity
+from part3.hbnb.app.models.placeamenity import PlaceAmenity
+from part3.hbnb.app.models.review import Review
+from part3.hbnb.app.models.placeratingstats import PlaceRatingStats, EMPTY_STATS
+from part3.hbnb.app.persistence import geohash
 from part3.hbnb.app import bcrypt, db
 
 
 class Place(BaseModel):
     __tablename__ = 'place'
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        # Used by the search endpoint's price range and bounding box filters
+        db.Index('ix_place_price', 'price'),
+        db.Index('ix_place_latitude_longitude', 'latitude', 'longitude'),
+        # Radius searches scan geohash prefix ranges
+        db.Index('ix_place_geohash', 'geohash'),
+        {'extend_existing': True}
+    )
 
     title = db.Column(db.String(100), nullable=False)
     description = db.Column(db.String, nullable=True)
     price = db.Column(db.Float, nullable=False)
     latitude = db.Column(db.Float, nullable=True)
     longitude = db.Column(db.Float, nullable=True)
-    owner_id = db.Column(db.String(36), db.ForeignKey('user.id'), nullable=False)
+    owner_id = db.Column(db.String(36), db.ForeignKey('user.id'), nullable=False, index=True)
+    geohash = db.Column(db.String(geohash.STORED_PRECISION), nullable=True)
 
-    def __init__(self, title, description, price, latitude, longitude, owner_id):
+    # One-to-one aggregates, joined into every place query so listing
+    # places never issues a query per row
+    rating_stats = db.relationship('PlaceRatingStats', uselist=False, lazy='joined')
+    # Loaded on access, or eagerly with PlaceRepository.get_expanded()
+    owner = db.relationship(User)
+    amenities = db.relationship(Amenity, secondary=PlaceAmenity.__table__, order_by=Amenity.name)
+    reviews = db.relationship(Review, order_by=(Review.created_at, Review.id))
+
+    def __init__(self, title, description, price, latitude, longitude, owner_id, owner=None):
         super().__init__()
         self.title = title
         self.description = description
@@ -25,12 +47,14 @@ class Place(BaseModel):
         self.owner_id = owner_id
 
         # Validations
-        self.validations()
+        self.validations(owner)
+        self.sync_geohash()
 
-    def validations(self):
-        # Ensure the owner exists
-        user = db.session.query(User).filter_by(id=self.owner_id).first()
-        if not user:
+    def validations(self, owner=None):
+        # Ensure the owner exists, reusing the User the caller already loaded
+        if owner is None:
+            owner = db.session.query(User).filter_by(id=self.owner_id).first()
+        if not owner or owner.id != self.owner_id:
             raise ValueError('Owner must be a valid User')
 
         # Validates required length of title
@@ -48,6 +72,17 @@ class Place(BaseModel):
         if not (-180.0 <= self.longitude <= 180.0):
             raise ValueError('Longitude must be between -180 and 180')
 
+    def sync_geohash(self):
+        """Recompute the geohash column from latitude/longitude"""
+        if self.latitude is None or self.longitude is None:
+            self.geohash = None
+        else:
+            self.geohash = geohash.encode(self.latitude, self.longitude)
+
+    def rating_summary(self):
+        """Review count, average and histogram, read from the aggregates row"""
+        return self.rating_stats.to_dict() if self.rating_stats else dict(EMPTY_STATS)
+
     def add_review(self, review):
         """Add a review to the place."""
         self.reviews.append(review)
@@ -55,3 +90,10 @@ class Place(BaseModel):
     def add_amenity(self, amenity):
         """Add an amenity to the place."""
         self.amenities.append(amenity)
+
+
+@event.listens_for(Place, 'before_insert')
+@event.listens_for(Place, 'before_update')
+def update_geohash(mapper, connection, place):
+    """Keep the geohash column in sync with latitude/longitude"""
+    place.sync_geohash()
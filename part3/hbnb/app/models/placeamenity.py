@@ -1,13 +1,19 @@
 #!/usr/bin/python3
-from sqlalchemy import Column, String, ForeignKey
+from sqlalchemy import Column, Index, String, ForeignKey
 from part3.hbnb.app.models.baseclass import BaseModel
 
 
 class PlaceAmenity(BaseModel):
     __tablename__ = 'place_amenity'
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        # A place's amenities, one row per place and amenity
+        Index('ix_place_amenity_place_id_amenity_id', 'place_id', 'amenity_id', unique=True),
+        # Search by amenities, answered from the index alone
+        Index('ix_place_amenity_amenity_id_place_id', 'amenity_id', 'place_id'),
+        {'extend_existing': True}
+    )
     place_id = Column(String, ForeignKey('place.id'), nullable=False)
-    amenity_id = Column(String, ForeignKey('place_amenity.id'), nullable=False)
+    amenity_id = Column(String, ForeignKey('amenity.id'), nullable=False)
 
     def __init__(self, place_id, amenity_id):
         super().__init__()
@@ -0,0 +1,84 @@
+#!/usr/bin/python3
+from datetime import datetime
+from sqlalchemy import inspect
+from sqlalchemy.sql import ClauseElement
+from part3.hbnb.app import db
+
+RATINGS = range(1, 6)
+
+
+class PlaceRatingStats(db.Model):
+    """Running review aggregates of a place, kept up to date by the facade"""
+    __tablename__ = 'place_rating_stats'
+    __table_args__ = {'extend_existing': True}
+
+    place_id = db.Column(db.String(36), db.ForeignKey('place.id'), primary_key=True)
+    review_count = db.Column(db.Integer, nullable=False, default=0)
+    rating_sum = db.Column(db.Integer, nullable=False, default=0)
+    rating_1 = db.Column(db.Integer, nullable=False, default=0)
+    rating_2 = db.Column(db.Integer, nullable=False, default=0)
+    rating_3 = db.Column(db.Integer, nullable=False, default=0)
+    rating_4 = db.Column(db.Integer, nullable=False, default=0)
+    rating_5 = db.Column(db.Integer, nullable=False, default=0)
+    # A review changes the place's representation without touching place.updated_at
+    updated_at = db.Column(db.DateTime, nullable=True)
+
+    def __init__(self, place_id=None):
+        self.place_id = place_id
+        self.review_count = 0
+        self.rating_sum = 0
+        for rating in RATINGS:
+            setattr(self, f'rating_{rating}', 0)
+        self.updated_at = datetime.utcnow()
+
+    def add_rating(self, rating):
+        self._apply({rating: 1})
+
+    def remove_rating(self, rating):
+        self._apply({rating: -1})
+
+    def replace_rating(self, old_rating, new_rating):
+        self._apply({old_rating: -1, new_rating: 1})
+
+    def _apply(self, rating_deltas):
+        changes = {'review_count': 0, 'rating_sum': 0}
+        for rating, delta in rating_deltas.items():
+            changes['review_count'] += delta
+            changes['rating_sum'] += delta * rating
+            column = f'rating_{rating}'
+            changes[column] = changes.get(column, 0) + delta
+
+        # Rows already in the database are incremented in SQL (SET x = x + 1)
+        # so concurrent reviews on the same place don't overwrite each other
+        in_database = inspect(self).persistent
+        for column, change in changes.items():
+            if not change:
+                continue
+            if in_database:
+                pending = self.__dict__.get(column)
+                base = pending if isinstance(pending, ClauseElement) else getattr(PlaceRatingStats, column)
+                setattr(self, column, base + change)
+            else:
+                setattr(self, column, getattr(self, column) + change)
+        self.updated_at = datetime.utcnow()
+
+    def to_dict(self):
+        return summarize(*(getattr(self, column) for column in STATS_COLUMNS))
+
+
+# Aggregate columns a projected place row carries (see PlaceRepository)
+STATS_COLUMNS = ('review_count', 'rating_sum') + tuple(f'rating_{rating}' for rating in RATINGS)
+
+
+def summarize(review_count, rating_sum, *histogram):
+    """Review count, average and histogram from the STATS_COLUMNS values,
+    which are all None for a place without a stats row"""
+    review_count = review_count or 0
+    return {
+        'review_count': review_count,
+        'average_rating': round(rating_sum / review_count, 2) if review_count else None,
+        'rating_histogram': {str(rating): count or 0 for rating, count in zip(RATINGS, histogram)}
+    }
+
+
+EMPTY_STATS = PlaceRatingStats().to_dict()
@@ -4,12 +4,18 @@ from part3.hbnb.app import db
 
 class Review(BaseModel):
     __tablename__ = 'review'
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        # One review per user and place; also serves the "already reviewed" check
+        db.Index('ix_review_user_id_place_id', 'user_id', 'place_id', unique=True),
+        # Listing a place's reviews in creation order
+        db.Index('ix_review_place_id_created_at', 'place_id', 'created_at'),
+        {'extend_existing': True}
+    )
 
     text = db.Column(db.String, nullable=False)
     rating = db.Column(db.Integer, nullable=False)
     user_id = db.Column(db.String(36), db.ForeignKey('user.id'), nullable=False)
-    place_id = db.Column(db.Integer, db.ForeignKey('place.id'), nullable=False)
+    place_id = db.Column(db.String(36), db.ForeignKey('place.id'), nullable=False)
 
     def __init__(self, text, rating, place_id, user_id):
         super().__init__()
@@ -20,9 +26,9 @@ class Review(BaseModel):
         self.validations()
 
     def validations(self):
-        # Rating validation, must be between 0 and 5
-        if self.rating < 0 or self.rating > 5:
-            raise ValueError("Rating must be between 0 and 5")
+        # Rating validation, must be between 1 and 5 (same as the schema's CHECK)
+        if not isinstance(self.rating, int) or self.rating < 1 or self.rating > 5:
+            raise ValueError("Rating must be between 1 and 5")
 
         # Review text can't be empty
         if self.text is None:
@@ -1,6 +1,6 @@
 #!/usr/bin/python3
 from .baseclass import BaseModel
-from part3.hbnb.app import bcrypt, db
+from part3.hbnb.app import db, password_hasher
 import re
 import uuid
 
@@ -37,11 +37,15 @@ class User(BaseModel):
 
     def hash_password(self, password):
         """Hashes the password before storing it."""
-        self.password = bcrypt.generate_password_hash(password).decode('utf-8')
+        self.password = password_hasher.hash(password)
 
     def verify_password(self, password):
         """Verifies if the provided password matches the hashed password."""
-        return bcrypt.check_password_hash(self.password, password)
+        return password_hasher.verify(self.password, password, user_id=self.id)
+
+    def needs_rehash(self):
+        """True when the stored hash uses another work factor than configured."""
+        return password_hasher.needs_rehash(self.password)
 
     def update(self, first_name: str = None, last_name: str = None, email: str = None, is_admin: bool = None):
         if first_name:
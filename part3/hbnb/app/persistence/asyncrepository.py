@@ -0,0 +1,119 @@
+#!/usr/bin/python3
+"""Asyncio repositories for the ASGI read tier (see app/asgi.py).
+
+They mirror Repository.add/get/get_all/get_by_attribute on SQLAlchemy's
+asyncio extension. A query waiting on the database suspends its coroutine
+instead of pinning a thread, so one worker can keep thousands of slow
+requests in flight. Needs aiosqlite and greenlet (requirements.txt).
+
+Each call runs in its own AsyncSession. There is no identity map, cache
+or unit of work here, and add() doesn't notify the facade's listeners:
+writes that caches must see go through the facade.
+"""
+from abc import ABC, abstractmethod
+from sqlalchemy import event, select
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from part3.hbnb.app.persistence import versions
+from part3.hbnb.app.persistence.connections import apply_pragmas, connection_pragmas
+from part3.hbnb.app.persistence.pagination import DEFAULT_PAGE_SIZE
+from part3.hbnb.app.persistence.repository import after_position, page_of
+
+try:
+    import aiosqlite  # noqa: F401 - driver of sqlite+aiosqlite URLs
+    import greenlet  # noqa: F401 - runs the ORM's loading code inside the event loop
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+except ImportError:  # pragma: no cover - the async tier is optional
+    create_async_engine = None
+
+
+def async_url(url):
+    """The asyncio driver URL of a SQLite database URL"""
+    url = make_url(url)
+    if url.get_backend_name() != 'sqlite':
+        raise ValueError(f'The async tier is written for SQLite, not {url.get_backend_name()}')
+    return url.set(drivername='sqlite+aiosqlite')
+
+
+def create_async_database(url, config):
+    """Return (engine, session factory) for the database at url.
+
+    Coroutines queue for one of ASYNC_DB_POOL_SIZE connections; each
+    connection gets the SQLITE_PRAGMAS of the sync engines.
+    """
+    if create_async_engine is None:
+        raise RuntimeError('The async tier needs the aiosqlite and greenlet packages')
+    engine = create_async_engine(async_url(url), poolclass=AsyncAdaptedQueuePool,
+                                 pool_size=config.get('ASYNC_DB_POOL_SIZE', 10), max_overflow=0,
+                                 pool_timeout=config.get('DB_POOL_TIMEOUT', 30))
+    pragmas = connection_pragmas(config)
+    if pragmas:
+        @event.listens_for(engine.sync_engine, 'connect')
+        def on_connect(dbapi_connection, connection_record):
+            apply_pragmas(dbapi_connection, pragmas)
+    return engine, async_sessionmaker(engine, expire_on_commit=False)
+
+
+class AsyncRepository(ABC):
+    @abstractmethod
+    async def add(self, obj):
+        pass
+
+    @abstractmethod
+    async def get(self, obj_id):
+        pass
+
+    @abstractmethod
+    async def get_all(self):
+        pass
+
+    @abstractmethod
+    async def get_by_attribute(self, attr_name, attr_value):
+        pass
+
+
+class AsyncSQLAlchemyRepository(AsyncRepository):
+    def __init__(self, model, sessions):
+        self.model = model
+        self.sessions = sessions
+
+    async def add(self, obj):
+        async with self.sessions.begin() as session:
+            session.add(obj)
+            await session.execute(versions.touch_statement(self.model.__tablename__, 1))
+
+    async def get(self, obj_id):
+        async with self.sessions() as session:
+            return await session.get(self.model, obj_id)
+
+    async def get_all(self):
+        async with self.sessions() as session:
+            return (await session.scalars(select(self.model))).all()
+
+    async def get_by_attribute(self, attr_name, attr_value):
+        async with self.sessions() as session:
+            return (await session.scalars(select(self.model).filter_by(**{attr_name: attr_value}).limit(1))).first()
+
+    async def get_row(self, obj_id, columns):
+        """One row of the named columns by primary key, None if it doesn't exist"""
+        async with self.sessions() as session:
+            return (await session.execute(self._row_select(columns).where(self.model.id == obj_id))).first()
+
+    async def get_all_rows(self, columns, after=None, limit=None):
+        """Rows of the named columns, a Page of them with a limit (see
+        SQLAlchemyRepository.get_all_rows)"""
+        if limit is None:
+            async with self.sessions() as session:
+                return (await session.execute(self._row_select(columns))).all()
+        columns = list(columns) + [name for name in ('created_at', 'id') if name not in columns]
+        return await self._page(self._row_select(columns), after, limit)
+
+    def _row_select(self, columns):
+        return select(*[getattr(self.model, name) for name in columns]).select_from(self.model)
+
+    async def _page(self, statement, after=None, limit=DEFAULT_PAGE_SIZE):
+        statement = statement.order_by(self.model.created_at, self.model.id)
+        if after:
+            statement = statement.where(after_position(self.model, after))
+        async with self.sessions() as session:
+            return page_of((await session.execute(statement.limit(limit + 1))).all(), limit)
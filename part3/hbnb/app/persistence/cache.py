@@ -0,0 +1,251 @@
+#!/usr/bin/python3
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from sqlalchemy import DateTime, inspect
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+from part3.hbnb.app import db, serialization
+from part3.hbnb.app.persistence import identitymap, unitofwork
+
+
+class InProcessCache:
+    """Bounded LRU cache with a time-to-live, private to one worker process"""
+
+    def __init__(self, max_entries=1024, ttl=60, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= self.clock():
+                if entry is not None:
+                    del self._entries[key]
+                    self.evictions += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (self.clock() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'backend': 'memory',
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_ratio': round(self.hits / lookups, 4) if lookups else None,
+            'size': len(self._entries),
+            'max_entries': self.max_entries,
+        }
+
+
+class SharedCache:
+    """LRU + TTL cache stored in a local SQLite file.
+
+    Stand-in for a key-value server: every worker process on the host opens
+    the same file, so an invalidation done by one worker is seen by all.
+    Counters are per process.
+
+    The LRU order is approximate: a hit only records its time when the last
+    one is older than touch_interval (ttl / 10 by default), so most reads
+    don't write to the shared file.
+    """
+
+    def __init__(self, path, max_entries=10000, ttl=60, clock=time.time, touch_interval=None):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+        self.touch_interval = ttl / 10 if touch_interval is None else touch_interval
+        self._local = threading.local()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._connection().execute(
+            'CREATE TABLE IF NOT EXISTS cache ('
+            ' key TEXT PRIMARY KEY, value BLOB NOT NULL,'
+            ' expires_at REAL NOT NULL, used_at REAL NOT NULL)'
+        )
+        self._connection().execute('CREATE INDEX IF NOT EXISTS ix_cache_used_at ON cache (used_at)')
+
+    def _connection(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            self._local.conn = conn
+        return conn
+
+    def get(self, key):
+        now = self.clock()
+        conn = self._connection()
+        row = conn.execute('SELECT value, expires_at, used_at FROM cache WHERE key = ?', (key,)).fetchone()
+        if row is None or row[1] <= now:
+            if row is not None:
+                conn.execute('DELETE FROM cache WHERE key = ?', (key,))
+                self.evictions += 1
+            self.misses += 1
+            return None
+        if now - row[2] >= self.touch_interval:
+            conn.execute('UPDATE cache SET used_at = ? WHERE key = ?', (now, key))
+        self.hits += 1
+        return row[0]
+
+    def set(self, key, value):
+        now = self.clock()
+        conn = self._connection()
+        conn.execute('INSERT OR REPLACE INTO cache (key, value, expires_at, used_at) VALUES (?, ?, ?, ?)',
+                     (key, value, now + self.ttl, now))
+        overflow = conn.execute('SELECT COUNT(*) FROM cache').fetchone()[0] - self.max_entries
+        if overflow > 0:
+            conn.execute('DELETE FROM cache WHERE key IN '
+                         '(SELECT key FROM cache ORDER BY used_at LIMIT ?)', (overflow,))
+            self.evictions += overflow
+
+    def delete(self, key):
+        self._connection().execute('DELETE FROM cache WHERE key = ?', (key,))
+
+    def clear(self):
+        self._connection().execute('DELETE FROM cache')
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'backend': 'sqlite',
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_ratio': round(self.hits / lookups, 4) if lookups else None,
+            'size': self._connection().execute('SELECT COUNT(*) FROM cache').fetchone()[0],
+            'max_entries': self.max_entries,
+        }
+
+
+def encode_entity(obj):
+    """JSON of an entity's loaded columns and loaded one-to-one relationships
+    (a place's rating aggregates), the form CachedRepository stores"""
+    return serialization.dumps(_entity_dict(obj))
+
+
+def _entity_dict(obj):
+    mapper = inspect(obj).mapper
+    state = obj.__dict__
+    data = {attr.key: state[attr.key] for attr in mapper.column_attrs if attr.key in state}
+    for relationship in mapper.relationships:
+        if not relationship.uselist and relationship.key in state:
+            related = state[relationship.key]
+            data[relationship.key] = None if related is None else _entity_dict(related)
+    return data
+
+
+def decode_entity(model, encoded):
+    """Detached entity of model rebuilt from encode_entity() output, its
+    constructor (and validation) not run"""
+    return _entity(model, json.loads(encoded))
+
+
+def _entity(model, data):
+    mapper = inspect(model)
+    obj = mapper.class_manager.new_instance()
+    for key, value in data.items():
+        if key in mapper.relationships:
+            related = mapper.relationships[key].mapper.class_
+            value = None if value is None else _entity(related, value)
+        elif value is not None and isinstance(mapper.columns[key].type, DateTime):
+            value = datetime.fromisoformat(value)
+        set_committed_value(obj, key, value)
+    make_transient_to_detached(obj)
+    return obj
+
+
+class CachedRepository:
+    """Read-through cache in front of a SQLAlchemyRepository's get().
+
+    Objects are cached as JSON column values (see encode_entity), keyed by
+    (model, id), and merged back into the current session on a hit so
+    callers get a normal persistent object. Nothing read from the cache is
+    executed, unlike a pickle. Everything other than get/update/delete is
+    delegated unchanged.
+    """
+
+    def __init__(self, repository, cache):
+        self.repository = repository
+        self.cache = cache
+
+    def __getattr__(self, name):
+        return getattr(self.repository, name)
+
+    def _key(self, obj_id):
+        return f'{self.repository.model.__tablename__}:{obj_id}'
+
+    def get(self, obj_id):
+        # Objects already used in this request skip the cache entirely
+        obj = identitymap.lookup(self.repository.model, obj_id)
+        if obj is not identitymap.MISSING:
+            return obj
+
+        cached = self.cache.get(self._key(obj_id))
+        if cached is not None:
+            obj = db.session.merge(decode_entity(self.repository.model, cached), load=False)
+            identitymap.remember(self.repository.model, obj_id, obj)
+            return obj
+
+        obj = self.repository.get(obj_id)
+        if obj is not None:
+            self.cache.set(self._key(obj_id), encode_entity(obj))
+        return obj
+
+    def update(self, obj_id, data):
+        self.repository.update(obj_id, data)
+        self.invalidate(obj_id)
+
+    def delete(self, obj_id):
+        self.repository.delete(obj_id)
+        self.invalidate(obj_id)
+
+    def invalidate(self, obj_id):
+        # Until the commit, other requests still read the committed row
+        key = self._key(obj_id)
+        unitofwork.after_commit(lambda: self.cache.delete(key))
+
+
+def build_cache(config, prefix='REPOSITORY_CACHE'):
+    """Create the cache backend selected by <prefix> (e.g. REPOSITORY_CACHE), or None"""
+    backend = config.get(prefix)
+    if not backend:
+        return None
+    ttl = config.get(f'{prefix}_TTL', 60)
+    max_entries = config.get(f'{prefix}_SIZE', 1024)
+    if backend == 'memory':
+        return InProcessCache(max_entries=max_entries, ttl=ttl)
+    if backend == 'sqlite':
+        return SharedCache(config[f'{prefix}_PATH'], max_entries=max_entries, ttl=ttl)
+    raise ValueError(f"Unknown {prefix} backend: {backend}")
@@ -0,0 +1,91 @@
+#!/usr/bin/python3
+"""Per-connection SQLite settings and the read/write split.
+
+SQLITE_PRAGMAS are applied to every connection an engine opens, not just to
+the one that created the schema. With SQLITE_READ_POOL (the options of a
+second engine on the same database file), the SELECTs of requests use
+that engine until their session writes: with WAL, readers work on their own
+connections and don't queue behind a writer holding the write connection,
+and a write request only takes the write connection when it writes.
+Read connections are opened with query_only, so a stray write fails loudly.
+
+Writes, reads following an uncommitted write or made during a flush, and
+everything outside a request (CLI, scripts, tests) stay on the default
+engine, so a request always reads its own uncommitted writes.
+"""
+from flask import current_app, has_request_context
+from flask_sqlalchemy.session import Session
+from sqlalchemy import create_engine, event
+from part3.hbnb.app.persistence.pool import InstrumentedQueuePool
+
+# app.extensions key of the read engine
+READ_ENGINE = 'hbnb_read_engine'
+
+
+class RoutingSession(Session):
+    """db.session class: sends request reads to the read engine, if configured"""
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and self._is_request_read(clause):
+            engine = current_app.extensions.get(READ_ENGINE)
+            if engine is not None:
+                return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+    def _is_request_read(self, clause):
+        if clause is None or not getattr(clause, 'is_select', False) or self._flushing:
+            return False
+        if not has_request_context():
+            return False
+        # Imported here: unitofwork needs db, which is created with this class
+        from part3.hbnb.app.persistence import unitofwork
+        return not unitofwork.has_written(self)
+
+
+def apply_pragmas(dbapi_connection, pragmas):
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name} = {value}')
+    finally:
+        cursor.close()
+
+
+def read_engine(app):
+    """The engine GET requests read from, None without SQLITE_READ_POOL"""
+    return app.extensions.get(READ_ENGINE)
+
+
+def connection_pragmas(config, read_only=False):
+    """The pragmas for new connections of an engine, in the order they are set"""
+    pragmas = dict(config.get('SQLITE_PRAGMAS') or {})
+    if read_only:
+        # Last: journal_mode may have to write the database header first
+        pragmas['query_only'] = 'ON'
+    return pragmas
+
+
+def init_connections(app):
+    """Set the pragmas on every new SQLite connection and create the read
+    engine. Called before anything connects, so the pool never hands out a
+    connection without them."""
+    with app.app_context():
+        engine = app.extensions['sqlalchemy'].engine
+    if engine.dialect.name != 'sqlite':
+        return
+    engines = [(engine, False)]
+    read_pool = app.config.get('SQLITE_READ_POOL')
+    if read_pool is not None and engine.url.database not in (None, '', ':memory:'):
+        # engine.url: the path Flask-SQLAlchemy resolved against the instance folder
+        app.extensions[READ_ENGINE] = create_engine(engine.url, **{'poolclass': InstrumentedQueuePool,
+                                                                   **read_pool})
+        engines.append((app.extensions[READ_ENGINE], True))
+
+    for engine, read_only in engines:
+        pragmas = connection_pragmas(app.config, read_only)
+        if not pragmas:
+            continue
+
+        def on_connect(dbapi_connection, connection_record, pragmas=pragmas):
+            apply_pragmas(dbapi_connection, pragmas)
+        event.listen(engine, 'connect', on_connect)
@@ -0,0 +1,129 @@
+#!/usr/bin/python3
+import math
+
+BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+
+# Precision stored on each Place (~4.8m x 4.8m cells); searches use a prefix
+STORED_PRECISION = 9
+# Upper bound on the number of cells scanned by one radius search
+MAX_SEARCH_CELLS = 32
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE_LAT = math.pi * EARTH_RADIUS_KM / 180
+
+
+def encode(latitude, longitude, precision=STORED_PRECISION):
+    """Encode a coordinate into a geohash string"""
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True  # geohash interleaves bits starting with longitude
+
+    while len(chars) < precision:
+        if even:
+            mid = (lon_range[0] + lon_range[1]) / 2
+            if longitude >= mid:
+                bits = (bits << 1) | 1
+                lon_range[0] = mid
+            else:
+                bits <<= 1
+                lon_range[1] = mid
+        else:
+            mid = (lat_range[0] + lat_range[1]) / 2
+            if latitude >= mid:
+                bits = (bits << 1) | 1
+                lat_range[0] = mid
+            else:
+                bits <<= 1
+                lat_range[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(BASE32[bits])
+            bits = 0
+            bit_count = 0
+
+    return ''.join(chars)
+
+
+def _grid_bits(precision):
+    """Number of (latitude, longitude) bits used by a geohash precision"""
+    total = 5 * precision
+    return total // 2, total - total // 2
+
+
+def _cell_from_indexes(lat_index, lon_index, precision):
+    """Build the geohash of the cell at the given grid position"""
+    lat_bits, lon_bits = _grid_bits(precision)
+    value = 0
+    for position in range(5 * precision):
+        if position % 2 == 0:
+            bit = (lon_index >> (lon_bits - 1 - position // 2)) & 1
+        else:
+            bit = (lat_index >> (lat_bits - 1 - position // 2)) & 1
+        value = (value << 1) | bit
+    return ''.join(BASE32[(value >> (5 * (precision - 1 - i))) & 31] for i in range(precision))
+
+
+def bounding_box(latitude, longitude, radius_km):
+    """Return (min_lat, min_lon, max_lat, max_lon) enclosing the circle.
+
+    Longitudes are not normalised, so min_lon may be below -180 or max_lon
+    above 180 when the circle crosses the antimeridian.
+    """
+    delta_lat = radius_km / KM_PER_DEGREE_LAT
+    min_lat = latitude - delta_lat
+    max_lat = latitude + delta_lat
+
+    if min_lat <= -90 or max_lat >= 90:
+        # The circle reaches a pole: every longitude is in range
+        return max(min_lat, -90.0), -180.0, min(max_lat, 90.0), 180.0
+
+    # Widest longitude offset of a spherical cap (it is not reached at the
+    # center latitude, so radius / cos(latitude) would be too narrow)
+    ratio = math.sin(radius_km / EARTH_RADIUS_KM) / math.cos(math.radians(latitude))
+    if radius_km / EARTH_RADIUS_KM >= math.pi / 2 or ratio >= 1:
+        return min_lat, -180.0, max_lat, 180.0
+    delta_lon = math.degrees(math.asin(ratio))
+    return min_lat, longitude - delta_lon, max_lat, longitude + delta_lon
+
+
+def covering_cells(latitude, longitude, radius_km, max_cells=MAX_SEARCH_CELLS):
+    """Return the geohash cells that together cover the search circle.
+
+    Picks the finest precision whose covering stays under max_cells, so
+    small radii scan a few tiny cells and large radii a few coarse ones.
+    """
+    min_lat, min_lon, max_lat, max_lon = bounding_box(latitude, longitude, radius_km)
+
+    for precision in range(STORED_PRECISION, 0, -1):
+        lat_bits, lon_bits = _grid_bits(precision)
+        lat_cells, lon_cells = 1 << lat_bits, 1 << lon_bits
+        cell_lat = 180.0 / lat_cells
+        cell_lon = 360.0 / lon_cells
+
+        first_lat = max(int((min_lat + 90) // cell_lat), 0)
+        last_lat = min(int((max_lat + 90) // cell_lat), lat_cells - 1)
+        first_lon = int((min_lon + 180) // cell_lon)
+        last_lon = int((max_lon + 180) // cell_lon)
+        lon_span = min(last_lon - first_lon + 1, lon_cells)
+
+        if (last_lat - first_lat + 1) * lon_span > max_cells and precision > 1:
+            continue
+
+        return sorted({
+            _cell_from_indexes(lat_index, (first_lon + offset) % lon_cells, precision)
+            for lat_index in range(first_lat, last_lat + 1)
+            for offset in range(lon_span)
+        })
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Great-circle distance between two coordinates in kilometers"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
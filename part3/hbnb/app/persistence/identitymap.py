@@ -0,0 +1,35 @@
+#!/usr/bin/python3
+from flask import g, has_app_context
+
+# Marks ids that are not in the map, None is a valid (negative) entry
+MISSING = object()
+
+
+def lookup(model, obj_id):
+    """Return the object loaded earlier in this request, or MISSING"""
+    if not has_app_context():
+        return MISSING
+    return g.get('identity_map', {}).get((model, obj_id), MISSING)
+
+
+def remember(model, obj_id, obj):
+    """Record what get() returned for this id, including None"""
+    if has_app_context():
+        g.setdefault('identity_map', {})[(model, obj_id)] = obj
+
+
+def forget(model, obj_id):
+    if has_app_context():
+        g.get('identity_map', {}).pop((model, obj_id), None)
+
+
+def clear():
+    if has_app_context():
+        g.pop('identity_map', None)
+
+
+def init_identity_map(app):
+    """Give every request (app context) its own empty identity map"""
+    @app.teardown_appcontext
+    def clear_identity_map(exception=None):
+        clear()
@@ -1,5 +1,7 @@
--- Enable foreign key constraints
-PRAGMA foreign_keys = ON;
+-- Schema formerly created by scripts.sql. Every statement is IF NOT EXISTS so
+-- databases built by that script (or by db.create_all()) are adopted as they
+-- are, 0002 then brings older variants of them up to date. Secondary indexes
+-- are created by 0003, once every column they cover exists.
 
 -- User Table
 CREATE TABLE IF NOT EXISTS User (
@@ -22,6 +24,7 @@ CREATE TABLE IF NOT EXISTS Place (
     latitude FLOAT NOT NULL,
     longitude FLOAT NOT NULL,
     owner_id CHAR(36),
+    geohash VARCHAR(9),
     created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
     updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
     FOREIGN KEY (owner_id) REFERENCES User(id) ON DELETE CASCADE
@@ -41,6 +44,20 @@ CREATE TABLE IF NOT EXISTS Review (
     UNIQUE (user_id, place_id)
 );
 
+-- Place_Rating_Stats Table (review aggregates maintained by the facade)
+CREATE TABLE IF NOT EXISTS Place_Rating_Stats (
+    place_id CHAR(36) PRIMARY KEY,
+    review_count INT NOT NULL DEFAULT 0,
+    rating_sum INT NOT NULL DEFAULT 0,
+    rating_1 INT NOT NULL DEFAULT 0,
+    rating_2 INT NOT NULL DEFAULT 0,
+    rating_3 INT NOT NULL DEFAULT 0,
+    rating_4 INT NOT NULL DEFAULT 0,
+    rating_5 INT NOT NULL DEFAULT 0,
+    updated_at DATETIME,
+    FOREIGN KEY (place_id) REFERENCES Place(id) ON DELETE CASCADE
+);
+
 -- Amenity Table
 CREATE TABLE IF NOT EXISTS Amenity (
     id CHAR(36) PRIMARY KEY,
@@ -59,3 +76,10 @@ CREATE TABLE IF NOT EXISTS Place_Amenity (
     FOREIGN KEY (place_id) REFERENCES Place(id) ON DELETE CASCADE,
     FOREIGN KEY (amenity_id) REFERENCES Amenity(id) ON DELETE CASCADE
 );
+
+-- Collection_Version Table (row count and last change of each table, maintained by the repositories)
+CREATE TABLE IF NOT EXISTS Collection_Version (
+    name VARCHAR(64) PRIMARY KEY,
+    row_count INT NOT NULL DEFAULT 0,
+    last_modified DATETIME NOT NULL
+);
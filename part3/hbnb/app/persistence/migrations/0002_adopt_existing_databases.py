@@ -0,0 +1,43 @@
+#!/usr/bin/python3
+"""Bring databases built by an older scripts.sql, or by db.create_all(), to
+the schema of the models: columns added since, and a Place_Amenity table
+keyed by id like every other model instead of (place_id, amenity_id)."""
+import uuid
+from part3.hbnb.app.persistence import geohash
+
+
+def _columns(conn, table):
+    return {row[1] for row in conn.execute(f'PRAGMA table_info({table})')}
+
+
+def upgrade(conn):
+    if 'geohash' not in _columns(conn, 'Place'):
+        conn.execute('ALTER TABLE Place ADD COLUMN geohash VARCHAR(9)')
+    missing = conn.execute('SELECT id, latitude, longitude FROM Place WHERE geohash IS NULL '
+                           'AND latitude IS NOT NULL AND longitude IS NOT NULL').fetchall()
+    conn.executemany('UPDATE Place SET geohash = ? WHERE id = ?',
+                     [(geohash.encode(latitude, longitude), place_id) for place_id, latitude, longitude in missing])
+
+    if 'updated_at' not in _columns(conn, 'Place_Rating_Stats'):
+        conn.execute('ALTER TABLE Place_Rating_Stats ADD COLUMN updated_at DATETIME')
+
+    if 'id' not in _columns(conn, 'Place_Amenity'):
+        conn.execute(
+            'CREATE TABLE Place_Amenity_New ('
+            ' id CHAR(36) PRIMARY KEY,'
+            ' place_id CHAR(36) NOT NULL,'
+            ' amenity_id CHAR(36) NOT NULL,'
+            ' created_at DATETIME DEFAULT CURRENT_TIMESTAMP,'
+            ' updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,'
+            ' FOREIGN KEY (place_id) REFERENCES Place(id) ON DELETE CASCADE,'
+            ' FOREIGN KEY (amenity_id) REFERENCES Amenity(id) ON DELETE CASCADE)'
+        )
+        rows = conn.execute('SELECT place_id, amenity_id, created_at, updated_at FROM Place_Amenity').fetchall()
+        conn.executemany('INSERT INTO Place_Amenity_New (id, place_id, amenity_id, created_at, updated_at) '
+                         'VALUES (?, ?, ?, ?, ?)', [(str(uuid.uuid4()),) + tuple(row) for row in rows])
+        conn.execute('DROP TABLE Place_Amenity')
+        conn.execute('ALTER TABLE Place_Amenity_New RENAME TO Place_Amenity')
+    else:
+        # create_all() never prevented duplicates, the unique index of 0003 would fail on them
+        conn.execute('DELETE FROM Place_Amenity WHERE rowid NOT IN '
+                     '(SELECT MIN(rowid) FROM Place_Amenity GROUP BY place_id, amenity_id)')
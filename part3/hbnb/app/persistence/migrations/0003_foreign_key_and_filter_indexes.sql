@@ -0,0 +1,32 @@
+-- Indexes for every foreign key and every column the repositories filter or
+-- sort on. Names match the models' declarations so databases built by
+-- db.create_all() end up with the same indexes.
+
+-- Keyset pagination of the list endpoints orders by created_at
+CREATE INDEX IF NOT EXISTS ix_user_created_at ON User (created_at);
+CREATE INDEX IF NOT EXISTS ix_place_created_at ON Place (created_at);
+CREATE INDEX IF NOT EXISTS ix_review_created_at ON Review (created_at);
+CREATE INDEX IF NOT EXISTS ix_amenity_created_at ON Amenity (created_at);
+CREATE INDEX IF NOT EXISTS ix_place_amenity_created_at ON Place_Amenity (created_at);
+
+-- Place search filters (price range, bounding box, radius)
+CREATE INDEX IF NOT EXISTS ix_place_price ON Place (price);
+CREATE INDEX IF NOT EXISTS ix_place_latitude_longitude ON Place (latitude, longitude);
+CREATE INDEX IF NOT EXISTS ix_place_geohash ON Place (geohash);
+
+-- Listing a place's reviews in creation order
+CREATE INDEX IF NOT EXISTS ix_review_place_id_created_at ON Review (place_id, created_at);
+
+-- Places of an owner, and cascading deletes of users
+CREATE INDEX IF NOT EXISTS ix_place_owner_id ON Place (owner_id);
+
+-- One review per user and place; also the "already reviewed" check and,
+-- through its user_id prefix, a user's reviews
+CREATE UNIQUE INDEX IF NOT EXISTS ix_review_user_id_place_id ON Review (user_id, place_id);
+
+-- A place's amenities, one row per place and amenity
+CREATE UNIQUE INDEX IF NOT EXISTS ix_place_amenity_place_id_amenity_id ON Place_Amenity (place_id, amenity_id);
+
+-- Search by amenities filters on amenity_id and groups by place_id,
+-- answered from this index alone
+CREATE INDEX IF NOT EXISTS ix_place_amenity_amenity_id_place_id ON Place_Amenity (amenity_id, place_id);
@@ -0,0 +1,135 @@
+#!/usr/bin/python3
+"""Numbered schema migrations for the SQLite database.
+
+Each migration is a file named NNNN_description.sql, or NNNN_description.py
+defining upgrade(connection) for changes plain SQL can't express. They are
+applied in order, each in its own transaction together with its row in the
+schema_migrations table, so a failing migration leaves nothing behind.
+"""
+import importlib.util
+import os
+import re
+import sqlite3
+from collections import namedtuple
+from datetime import datetime
+
+MIGRATIONS_DIR = os.path.dirname(os.path.abspath(__file__))
+_FILE_NAME = re.compile(r'^(\d{4})_(\w+)\.(sql|py)$')
+
+Migration = namedtuple('Migration', ['version', 'name', 'path'])
+
+
+def available_migrations(directory=MIGRATIONS_DIR):
+    """Every migration file, ordered by version"""
+    migrations = []
+    for file_name in os.listdir(directory):
+        match = _FILE_NAME.match(file_name)
+        if match:
+            migrations.append(Migration(int(match.group(1)), match.group(2), os.path.join(directory, file_name)))
+    migrations.sort()
+    versions = [migration.version for migration in migrations]
+    if len(set(versions)) != len(versions):
+        raise RuntimeError(f'Duplicate migration version in {directory}')
+    return migrations
+
+
+def split_statements(script):
+    """Split a SQL script into complete statements (trigger bodies included)"""
+    statements, pending = [], ''
+    for line in script.splitlines(keepends=True):
+        pending += line
+        if sqlite3.complete_statement(pending):
+            statement = pending.strip()
+            if statement.rstrip(';').strip() and not _only_comments(statement):
+                statements.append(statement)
+            pending = ''
+    if pending.strip() and not _only_comments(pending):
+        raise ValueError(f'Incomplete SQL statement: {pending.strip()[:60]}')
+    return statements
+
+
+def _only_comments(text):
+    return all(not line.strip() or line.strip().startswith('--') for line in text.splitlines())
+
+
+def execute_file(conn, path):
+    """Run every statement of a SQL file, in the caller's transaction"""
+    with open(path) as script:
+        for statement in split_statements(script.read()):
+            conn.execute(statement)
+
+
+def _ensure_version_table(conn):
+    conn.execute(
+        'CREATE TABLE IF NOT EXISTS schema_migrations ('
+        ' version INTEGER PRIMARY KEY, name TEXT NOT NULL, applied_at DATETIME NOT NULL)'
+    )
+
+
+def applied_versions(conn):
+    _ensure_version_table(conn)
+    return {row[0] for row in conn.execute('SELECT version FROM schema_migrations')}
+
+
+def _apply(conn, migration):
+    conn.execute('BEGIN')
+    try:
+        if migration.path.endswith('.sql'):
+            execute_file(conn, migration.path)
+        else:
+            spec = importlib.util.spec_from_file_location(f'migration_{migration.version:04d}', migration.path)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            module.upgrade(conn)
+        conn.execute('INSERT INTO schema_migrations (version, name, applied_at) VALUES (?, ?, ?)',
+                     (migration.version, migration.name, datetime.utcnow().isoformat(' ')))
+        conn.execute('COMMIT')
+    except Exception:
+        conn.execute('ROLLBACK')
+        raise
+
+
+def pending_migrations(conn, directory=MIGRATIONS_DIR):
+    """Migrations not applied yet, without writing to the database"""
+    exists = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'schema_migrations'").fetchone()
+    done = {row[0] for row in conn.execute('SELECT version FROM schema_migrations')} if exists else set()
+    return [migration for migration in available_migrations(directory) if migration.version not in done]
+
+
+def upgrade_connection(conn, target=None, directory=MIGRATIONS_DIR):
+    """Apply the pending migrations up to target (default: all) on a sqlite3
+    connection, returns the migrations applied"""
+    isolation_level = conn.isolation_level
+    # Transactions are managed explicitly so DDL is part of them
+    conn.isolation_level = None
+    try:
+        done = applied_versions(conn)
+        applied = []
+        for migration in available_migrations(directory):
+            if migration.version in done or (target is not None and migration.version > target):
+                continue
+            _apply(conn, migration)
+            applied.append(migration)
+        return applied
+    finally:
+        conn.isolation_level = isolation_level
+
+
+def upgrade(engine, target=None, directory=MIGRATIONS_DIR):
+    """Apply the pending migrations on a SQLAlchemy engine's database"""
+    if engine.dialect.name != 'sqlite':
+        raise RuntimeError(f'Migrations are written for SQLite, not {engine.dialect.name}')
+    raw = engine.raw_connection()
+    try:
+        return upgrade_connection(raw.driver_connection, target, directory)
+    finally:
+        raw.close()
+
+
+def current_version(engine):
+    """Highest applied migration version, 0 for a database never migrated"""
+    raw = engine.raw_connection()
+    try:
+        return max(applied_versions(raw.driver_connection), default=0)
+    finally:
+        raw.close()
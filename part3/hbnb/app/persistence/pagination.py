@@ -0,0 +1,60 @@
+#!/usr/bin/python3
+import base64
+from collections import namedtuple
+from datetime import datetime
+
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+# items: the rows of the current page
+# next_after: (created_at, id) of the last row, or None on the last page
+Page = namedtuple('Page', ['items', 'next_after'])
+
+
+def encode_cursor(after):
+    """Encode a (created_at, id) position into an opaque cursor string.
+
+    The sort value may also be a number (search ordered by price).
+    """
+    if after is None:
+        return None
+    value, obj_id = after
+    value = value.isoformat() if isinstance(value, datetime) else f'#{value!r}'
+    raw = f"{value}|{obj_id}".encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii')
+
+
+def decode_cursor(cursor):
+    """Decode a cursor string back into a (created_at or number, id) position"""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8')
+        value, obj_id = raw.split('|', 1)
+        if value.startswith('#'):
+            return float(value[1:]), obj_id
+        return datetime.fromisoformat(value), obj_id
+    except (ValueError, UnicodeError):
+        raise ValueError('Invalid cursor')
+
+
+def parse_page_args(args):
+    """Read ?limit=&cursor= from the query string.
+
+    Returns None when the client did not ask for a page, so list endpoints
+    keep returning the full array to existing clients.
+    """
+    limit = args.get('limit')
+    cursor = args.get('cursor')
+    if limit is None and cursor is None:
+        return None
+
+    try:
+        limit = int(limit) if limit is not None else DEFAULT_PAGE_SIZE
+    except ValueError:
+        raise ValueError('limit must be an integer')
+    if limit < 1:
+        raise ValueError('limit must be greater than 0')
+
+    return {
+        'after': decode_cursor(cursor) if cursor else None,
+        'limit': min(limit, MAX_PAGE_SIZE)
+    }
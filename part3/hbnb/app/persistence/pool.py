@@ -0,0 +1,131 @@
+#!/usr/bin/python3
+"""Connection pool settings and checkout metrics.
+
+The DB_POOL_* settings become the engine options of the default engine
+(explicit SQLALCHEMY_ENGINE_OPTIONS win). Pooled engines use
+InstrumentedQueuePool, which times how long each checkout waits for a
+connection and counts overflow connections, timeouts and invalidations;
+/api/v1/admin/pool-stats reports them. Metrics are per worker process.
+
+In-memory SQLite keeps Flask-SQLAlchemy's single static connection: there
+is no pool to size.
+"""
+import threading
+import time
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeout
+from sqlalchemy.pool import QueuePool
+
+# Config key -> create_engine() argument
+POOL_SETTINGS = {
+    'DB_POOL_SIZE': 'pool_size',
+    'DB_MAX_OVERFLOW': 'max_overflow',
+    'DB_POOL_TIMEOUT': 'pool_timeout',
+    'DB_POOL_RECYCLE': 'pool_recycle',
+    'DB_POOL_PRE_PING': 'pool_pre_ping',
+}
+
+
+class PoolMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.overflow_opened = 0
+        self.timeouts = 0
+        self.invalidated = 0
+
+    def record_checkout(self, seconds, overflowed):
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait += seconds
+            self.max_wait = max(self.max_wait, seconds)
+            self.overflow_opened += overflowed
+
+    def record_timeout(self, seconds):
+        with self._lock:
+            self.timeouts += 1
+            self.max_wait = max(self.max_wait, seconds)
+
+    def record_invalidation(self):
+        with self._lock:
+            self.invalidated += 1
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long checkouts wait, see PoolMetrics"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+        if '_dispatch' not in kwargs:
+            # Failed pre-pings and disconnects discard the connection. A
+            # recreated pool inherits the listeners, and the metrics below.
+            event.listen(self, 'invalidate', self._record_invalidation)
+
+    def _record_invalidation(self, *args):
+        self.metrics.record_invalidation()
+
+    def _do_get(self):
+        overflow = self._overflow
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeout:
+            self.metrics.record_timeout(time.perf_counter() - start)
+            raise
+        self.metrics.record_checkout(time.perf_counter() - start, self._overflow > max(overflow, 0))
+        return connection
+
+    def recreate(self):
+        # engine.dispose() swaps in a new pool, keep counting in the same place
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+def is_memory_sqlite(url):
+    url = make_url(url)
+    return url.get_backend_name() == 'sqlite' and (url.database in (None, '', ':memory:')
+                                                   or url.query.get('mode') == 'memory')
+
+
+def engine_options(config):
+    """SQLALCHEMY_ENGINE_OPTIONS with the DB_POOL_* settings filled in"""
+    explicit = dict(config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+    uri = config.get('SQLALCHEMY_DATABASE_URI')
+    if not uri or is_memory_sqlite(uri):
+        return explicit
+    options = {argument: config[key] for key, argument in POOL_SETTINGS.items() if config.get(key) is not None}
+    options['poolclass'] = InstrumentedQueuePool
+    options.update(explicit)
+    return options
+
+
+def pool_stats(pool):
+    """Current state and counters of one engine's pool"""
+    stats = {'pool_class': type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update({
+            'size': pool.size(),
+            'max_overflow': pool._max_overflow,
+            'timeout_s': pool.timeout(),
+            'active': pool.checkedout(),
+            'idle': pool.checkedin(),
+            'overflow': max(pool.overflow(), 0),
+        })
+    metrics = getattr(pool, 'metrics', None)
+    if metrics is not None:
+        with metrics._lock:
+            stats.update({
+                'checkouts': metrics.checkouts,
+                'avg_checkout_ms': round(metrics.total_wait / metrics.checkouts * 1000, 3)
+                if metrics.checkouts else None,
+                'max_checkout_ms': round(metrics.max_wait * 1000, 3),
+                'overflow_opened': metrics.overflow_opened,
+                'timeouts': metrics.timeouts,
+                'invalidated': metrics.invalidated,
+            })
+    return stats
@@ -0,0 +1,44 @@
+#!/usr/bin/python3
+import threading
+from contextlib import contextmanager
+from flask import g, has_request_context
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+_local = threading.local()
+_installed = False
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    """Count every statement sent to the database"""
+    for statements in getattr(_local, 'active', ()):
+        statements.append(statement)
+    if has_request_context():
+        g.query_count = g.get('query_count', 0) + 1
+
+
+@contextmanager
+def count_queries():
+    """Collect the SQL statements executed inside the block into a list"""
+    statements = []
+    if not hasattr(_local, 'active'):
+        _local.active = []
+    _local.active.append(statements)
+    try:
+        yield statements
+    finally:
+        _local.active.remove(statements)
+
+
+def init_query_counter(app):
+    """Count queries per request and report them in the X-Query-Count header"""
+    global _installed
+    if not _installed:
+        event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+        _installed = True
+
+    if app.config.get('QUERY_COUNTER'):
+        @app.after_request
+        def add_query_count_header(response):
+            response.headers['X-Query-Count'] = str(g.get('query_count', 0))
+            return response
@@ -1,6 +1,28 @@
 #!/usr/bin/python3
+import uuid
+from collections import namedtuple
 from abc import ABC, abstractmethod
+from sqlalchemy import and_, exists, insert, or_
+from sqlalchemy.exc import SQLAlchemyError
 from part3.hbnb.app import db
+from part3.hbnb.app.persistence.pagination import Page, DEFAULT_PAGE_SIZE
+from part3.hbnb.app.persistence import identitymap, unitofwork, versions
+
+
+BULK_CHUNK_SIZE = 500
+
+
+def after_position(model, after):
+    """Keyset condition: rows ordered after (created_at, id)"""
+    created_at, obj_id = after
+    return or_(model.created_at > created_at, and_(model.created_at == created_at, model.id > obj_id))
+
+
+def page_of(rows, limit):
+    """Page of the first limit rows, from a query that fetched limit + 1"""
+    items = rows[:limit]
+    next_after = (items[-1].created_at, items[-1].id) if len(rows) > limit else None
+    return Page(items, next_after)
 
 
 class Repository(ABC):
@@ -8,14 +30,34 @@ class Repository(ABC):
     def add(self, obj):
         pass
 
+    @abstractmethod
+    def add_many(self, objs, chunk_size=BULK_CHUNK_SIZE):
+        pass
+
     @abstractmethod
     def get(self, obj_id):
         pass
 
+    @abstractmethod
+    def get_many(self, obj_ids):
+        pass
+
+    @abstractmethod
+    def exists(self, obj_id):
+        pass
+
     @abstractmethod
     def get_all(self):
         pass
 
+    @abstractmethod
+    def get_page(self, after=None, limit=DEFAULT_PAGE_SIZE):
+        pass
+
+    @abstractmethod
+    def get_all_rows(self, columns, after=None, limit=None):
+        pass
+
     @abstractmethod
     def update(self, obj_id, data):
         pass
@@ -28,6 +70,18 @@ class Repository(ABC):
     def get_by_attribute(self, attr_name, attr_value):
         pass
 
+    @abstractmethod
+    def get_value(self, obj_id, attr_name):
+        pass
+
+    @abstractmethod
+    def get_version(self, obj_id):
+        pass
+
+    @abstractmethod
+    def get_collection_version(self):
+        pass
+
 
 class InMemoryRepository(Repository):
     def __init__(self):
@@ -36,12 +90,38 @@ class InMemoryRepository(Repository):
     def add(self, obj):
         self._storage[obj.id] = obj
 
+    def add_many(self, objs, chunk_size=BULK_CHUNK_SIZE):
+        for obj in objs:
+            self.add(obj)
+        return {}
+
     def get(self, obj_id):
         return self._storage.get(obj_id)
 
+    def get_many(self, obj_ids):
+        return {obj_id: self._storage[obj_id] for obj_id in obj_ids if obj_id in self._storage}
+
+    def exists(self, obj_id):
+        return obj_id in self._storage
+
     def get_all(self):
         return list(self._storage.values())
 
+    def get_page(self, after=None, limit=DEFAULT_PAGE_SIZE):
+        objs = sorted(self._storage.values(), key=lambda obj: (obj.created_at, obj.id))
+        if after:
+            objs = [obj for obj in objs if (obj.created_at, obj.id) > after]
+        items = objs[:limit]
+        next_after = (items[-1].created_at, items[-1].id) if len(objs) > limit else None
+        return Page(items, next_after)
+
+    def get_all_rows(self, columns, after=None, limit=None):
+        row = namedtuple('Row', columns)
+        if limit is None:
+            return [row(*(getattr(obj, name) for name in columns)) for obj in self.get_all()]
+        page = self.get_page(after, limit)
+        return Page([row(*(getattr(obj, name) for name in columns)) for obj in page.items], page.next_after)
+
     def update(self, obj_id, data):
         obj = self.get(obj_id)
         if obj:
@@ -54,6 +134,17 @@ class InMemoryRepository(Repository):
     def get_by_attribute(self, attr_name, attr_value):
         return next((obj for obj in self._storage.values() if getattr(obj, attr_name) == attr_value), None)
 
+    def get_value(self, obj_id, attr_name):
+        obj = self.get(obj_id)
+        return getattr(obj, attr_name) if obj else None
+
+    def get_version(self, obj_id):
+        return self.get_value(obj_id, 'updated_at')
+
+    def get_collection_version(self):
+        objs = self.get_all()
+        return len(objs), max((obj.updated_at for obj in objs), default=None)
+
 
 class SQLAlchemyRepository(Repository):
     def __init__(self, model):
@@ -61,26 +152,132 @@ class SQLAlchemyRepository(Repository):
 
     def add(self, obj):
         db.session.add(obj)
-        db.session.commit()
+        self.touch(1)
+        unitofwork.commit()
+        identitymap.remember(self.model, obj.id, obj)
+
+    def add_many(self, objs, chunk_size=BULK_CHUNK_SIZE):
+        """Insert objects with one executemany per chunk, committing each chunk
+        (inside a unit of work, each chunk is a savepoint).
+
+        Returns {position: error message} for the objects that could not be
+        inserted; a failing chunk is retried row by row so one bad row only
+        loses itself.
+        """
+        objs = list(objs)
+        columns = [column.key for column in self.model.__table__.columns]
+        rows = []
+        for obj in objs:
+            if obj.id is None:
+                obj.id = str(uuid.uuid4())
+            rows.append({column: getattr(obj, column) for column in columns})
+
+        failed = {}
+        for start in range(0, len(rows), chunk_size):
+            try:
+                with unitofwork.transaction():
+                    self._insert_rows(rows[start:start + chunk_size])
+            except SQLAlchemyError:
+                for position in range(start, min(start + chunk_size, len(rows))):
+                    try:
+                        with unitofwork.transaction():
+                            self._insert_rows([rows[position]])
+                    except SQLAlchemyError as e:
+                        failed[position] = str(e.orig if getattr(e, 'orig', None) else e).split('\n')[0]
+        return failed
+
+    def _insert_rows(self, rows):
+        db.session.execute(insert(self.model.__table__), rows)
+        self.touch(len(rows))
+
+    def get_many(self, obj_ids):
+        """Load several objects in one IN query, returns {id: object}"""
+        obj_ids = list(set(obj_ids))
+        if not obj_ids:
+            return {}
+        return {obj.id: obj for obj in self.model.query.filter(self.model.id.in_(obj_ids))}
 
     def get(self, obj_id):
-        return self.model.query.get(obj_id)
+        # Within one request the same row is only ever SELECTed once
+        obj = identitymap.lookup(self.model, obj_id)
+        if obj is identitymap.MISSING:
+            obj = self.model.query.get(obj_id)
+            identitymap.remember(self.model, obj_id, obj)
+        return obj
+
+    def exists(self, obj_id):
+        """Check a primary key without loading the row"""
+        return db.session.query(exists().where(self.model.id == obj_id)).scalar()
 
     def get_all(self):
         return self.model.query.all()
 
+    def get_page(self, after=None, limit=DEFAULT_PAGE_SIZE):
+        """Return one page ordered by (created_at, id), starting after the given position"""
+        return self._page(self.model.query, after, limit)
+
+    def get_all_rows(self, columns, after=None, limit=None):
+        """Read only the named columns, as Row named tuples instead of entities.
+
+        Rows skip the identity map, change tracking and attribute
+        instrumentation, which is what list endpoints pay for on every row.
+        With a limit this returns a Page like get_page().
+        """
+        if limit is None:
+            return self._row_query(columns).all()
+        # Keyset pagination needs the position of the last row
+        columns = list(columns) + [name for name in ('created_at', 'id') if name not in columns]
+        return self._page(self._row_query(columns), after, limit)
+
+    def _row_query(self, columns):
+        return db.session.query(*[getattr(self.model, name) for name in columns]).select_from(self.model)
+
+    def _page(self, query, after, limit):
+        """Apply keyset pagination on (created_at, id) to a query"""
+        query = query.order_by(self.model.created_at, self.model.id)
+        if after:
+            query = query.filter(after_position(self.model, after))
+        # Fetch one extra row to know whether another page exists
+        return page_of(query.limit(limit + 1).all(), limit)
+
     def update(self, obj_id, data):
         obj = self.get(obj_id)
         if obj:
             for key, value in data.items():
                 setattr(obj, key, value)
-            db.session.commit()
+            self.touch()
+            unitofwork.commit()
 
     def delete(self, obj_id):
         obj = self.get(obj_id)
         if obj:
             db.session.delete(obj)
-            db.session.commit()
+            self.touch(-1)
+            unitofwork.commit()
+            identitymap.forget(self.model, obj_id)
 
     def get_by_attribute(self, attr_name, attr_value):
         return self.model.query.filter_by(**{attr_name: attr_value}).first()
+
+    def get_value(self, obj_id, attr_name):
+        """Read one column of a row by primary key without loading the object"""
+        obj = identitymap.lookup(self.model, obj_id)
+        if obj is not identitymap.MISSING:
+            return getattr(obj, attr_name) if obj else None
+        return db.session.query(getattr(self.model, attr_name)).filter(self.model.id == obj_id).scalar()
+
+    def get_version(self, obj_id):
+        """Last modification time of a row, None when it doesn't exist"""
+        return self.get_value(obj_id, 'updated_at')
+
+    def get_collection_version(self):
+        """(row_count, last_modified) of the whole table, without scanning it"""
+        return versions.read(self.model)
+
+    def touch(self, added=0):
+        """Bump the collection version within the current transaction"""
+        versions.touch(self.model.__tablename__, added)
+
+    def invalidate(self, obj_id):
+        """Drop cached copies of an object, see CachedRepository"""
+        pass
@@ -1,3 +1,6 @@
+-- Reference data. The seed set is applied again whenever one of its files
+-- changes (see persistence/startup.py), so every statement must be idempotent.
+
 -- Insert Administrator User
 INSERT INTO User (id, first_name, last_name, email, password, is_admin)
 VALUES (
@@ -8,7 +11,7 @@ VALUES (
     '$2b$12$KbQYq/j9FQ4lQbPT7G5eze9uJPP5mF/.lqCpZQTxj8iO1mU1QStH6', -- bcrypt hash of "admin1234"
     TRUE
 )
-ON CONFLICT (id) DO NOTHING;
+ON CONFLICT DO NOTHING;
 
 -- Insert Initial Amenities
 INSERT INTO Amenity (id, name)
@@ -16,4 +19,7 @@ VALUES
     ('b0c7c154-2df7-4cb7-8ef9-dce29bb9d6d5', 'WiFi'),
     ('a6d3a3f5-4137-4bd6-93b5-62d89d89e50d', 'Swimming Pool'),
     ('9fc75c16-3ad6-4c3f-a82d-90a8cfd91b60', 'Air Conditioning')
-ON CONFLICT (id) DO NOTHING;
+ON CONFLICT DO NOTHING;
+
+-- Row counts recorded before the seed are stale, the next read recounts them
+DELETE FROM Collection_Version WHERE name IN ('user', 'amenity');
@@ -0,0 +1,138 @@
+#!/usr/bin/python3
+"""Database initialization at application startup.
+
+A process first checks, read-only, whether every migration is applied and
+the seed set (the files of persistence/seeds) is unchanged since it was
+last applied. That is the usual case and costs two SELECTs. Otherwise it
+takes a file lock next to the database, so concurrent workers don't
+replay the same DDL, checks again (a worker holding the lock may just have
+done the work) and applies what is missing.
+"""
+import hashlib
+import os
+from collections import namedtuple
+from contextlib import contextmanager
+from datetime import datetime
+from part3.hbnb.app.persistence import migrations
+
+try:
+    import fcntl
+except ImportError:  # Windows: initialization isn't serialized between processes
+    fcntl = None
+
+SEEDS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'seeds')
+
+Startup = namedtuple('Startup', ['applied', 'seeded', 'skipped'])
+
+
+def seed_files(directory=SEEDS_DIR):
+    return sorted(os.path.join(directory, name) for name in os.listdir(directory) if name.endswith('.sql'))
+
+
+def seed_checksum(directory=SEEDS_DIR):
+    """sha256 of the seed set, file names included so a rename counts as a change"""
+    digest = hashlib.sha256()
+    for path in seed_files(directory):
+        digest.update(os.path.basename(path).encode())
+        with open(path, 'rb') as seed:
+            digest.update(seed.read())
+    return digest.hexdigest()
+
+
+def applied_seed_checksum(conn):
+    """Checksum of the seed set last applied, None if never seeded"""
+    exists = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'schema_seed'").fetchone()
+    if not exists:
+        return None
+    row = conn.execute('SELECT checksum FROM schema_seed WHERE id = 1').fetchone()
+    return row[0] if row else None
+
+
+def is_current(conn, migrations_dir=migrations.MIGRATIONS_DIR, seeds_dir=SEEDS_DIR):
+    """True when there is nothing to do, checked without writing"""
+    return (not migrations.pending_migrations(conn, migrations_dir)
+            and applied_seed_checksum(conn) == seed_checksum(seeds_dir))
+
+
+def apply_seeds(conn, directory=SEEDS_DIR):
+    """Run the seed files and record their checksum, in one transaction"""
+    isolation_level = conn.isolation_level
+    conn.isolation_level = None
+    try:
+        conn.execute('BEGIN')
+        try:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS schema_seed ('
+                ' id INTEGER PRIMARY KEY CHECK (id = 1), checksum TEXT NOT NULL, applied_at DATETIME NOT NULL)'
+            )
+            for path in seed_files(directory):
+                migrations.execute_file(conn, path)
+            conn.execute('INSERT OR REPLACE INTO schema_seed (id, checksum, applied_at) VALUES (1, ?, ?)',
+                         (seed_checksum(directory), datetime.utcnow().isoformat(' ')))
+            conn.execute('COMMIT')
+        except Exception:
+            conn.execute('ROLLBACK')
+            raise
+    finally:
+        conn.isolation_level = isolation_level
+
+
+@contextmanager
+def file_lock(path):
+    """Exclusive lock on path across processes, nothing when path is None"""
+    if path is None or fcntl is None:
+        yield
+        return
+    with open(path, 'a') as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def initialize_connection(conn, lock_path=None, migrations_dir=migrations.MIGRATIONS_DIR, seeds_dir=SEEDS_DIR):
+    """Apply pending migrations and a changed seed set on a sqlite3 connection"""
+    if is_current(conn, migrations_dir, seeds_dir):
+        return Startup([], False, True)
+    with file_lock(lock_path):
+        # The worker that held the lock before us may have done everything
+        if is_current(conn, migrations_dir, seeds_dir):
+            return Startup([], False, True)
+        applied = migrations.upgrade_connection(conn, directory=migrations_dir)
+        seeded = applied_seed_checksum(conn) != seed_checksum(seeds_dir)
+        if seeded:
+            apply_seeds(conn, seeds_dir)
+        return Startup(applied, seeded, False)
+
+
+def lock_path_for(engine):
+    """Lock file next to a SQLite database file, None for in-memory databases"""
+    database = engine.url.database
+    if not database or database == ':memory:' or database.startswith('file:'):
+        return None
+    return os.path.abspath(database) + '.init.lock'
+
+
+def initialize(engine, migrations_dir=migrations.MIGRATIONS_DIR, seeds_dir=SEEDS_DIR):
+    """Bring a SQLAlchemy engine's database up to date, see initialize_connection"""
+    if engine.dialect.name != 'sqlite':
+        raise RuntimeError(f'Startup initialization is written for SQLite, not {engine.dialect.name}')
+    raw = engine.raw_connection()
+    try:
+        return initialize_connection(raw.driver_connection, lock_path_for(engine), migrations_dir, seeds_dir)
+    finally:
+        raw.close()
+
+
+def init_database(app):
+    """Initialize the database when the app is created, if DATABASE_AUTO_INIT"""
+    if not app.config.get('DATABASE_AUTO_INIT'):
+        return None
+    with app.app_context():
+        result = initialize(app.extensions['sqlalchemy'].engine)
+    for migration in result.applied:
+        app.logger.info('Applied migration %04d_%s', migration.version, migration.name)
+    if result.seeded:
+        app.logger.info('Applied seed data')
+    return result
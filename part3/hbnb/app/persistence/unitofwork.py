@@ -0,0 +1,204 @@
+#!/usr/bin/python3
+"""Unit of work: several repository writes saved by a single commit.
+
+Outside a unit of work every repository write commits right away. Inside
+one (`with facade.transaction():`, or a whole HTTP request with
+UNIT_OF_WORK_PER_REQUEST) writes are only flushed, so constraint errors
+still surface at the call that caused them. The outermost block commits
+once at the end, or rolls everything back if it raises. A nested block
+is a savepoint: when it raises, only its own writes are undone.
+
+Cache invalidations and change notifications registered with
+after_commit() run once the commit succeeded, and are dropped on
+rollback, so nobody refreshes a cache from data that isn't committed.
+
+On SQLite the transaction, and with it the database write lock, is only
+opened at the first write (flush or INSERT/UPDATE/DELETE statement), so a
+request spending time before its writes (hashing a password) doesn't block
+the other writers. Reads made before that see the last committed data.
+"""
+from contextlib import contextmanager
+from flask import current_app, g, has_app_context, request
+from sqlalchemy import event
+from part3.hbnb.app import db
+from part3.hbnb.app.persistence import identitymap
+
+UNSAFE_METHODS = {'POST', 'PUT', 'PATCH', 'DELETE'}
+
+
+class UnitOfWork:
+    def __init__(self):
+        # Called in order after the commit
+        self.callbacks = []
+
+
+def current():
+    """The open unit of work, None outside one"""
+    return g.get('unit_of_work') if has_app_context() else None
+
+
+def commit():
+    """Commit now, or only flush when a unit of work commits later"""
+    if current() is not None:
+        db.session.flush()
+    else:
+        db.session.commit()
+
+
+def after_commit(callback):
+    """Run callback() once the changes made so far are committed"""
+    work = current()
+    if work is None:
+        callback()
+    else:
+        work.callbacks.append(callback)
+
+
+def _begin_sqlite_transaction(session):
+    """pysqlite only sends BEGIN before the first INSERT/UPDATE/DELETE, so
+    the reads following it and savepoints would run outside the transaction
+    (and releasing a savepoint would commit). Open it explicitly. IMMEDIATE
+    takes the write lock now: reads inside a deferred transaction would
+    otherwise fail when upgrading their lock."""
+    connection = session.connection()
+    if connection.dialect.name != 'sqlite':
+        return
+    driver_connection = connection.connection.driver_connection
+    if not driver_connection.in_transaction:
+        # Straight on the driver: transaction control, not a query to count
+        driver_connection.execute('BEGIN IMMEDIATE')
+
+
+def has_written(session):
+    """Whether the session's transaction holds uncommitted writes"""
+    return session.info.get('writing', False)
+
+
+def _writing(session):
+    """Mark the session as writing; in a unit of work, open its transaction"""
+    if has_written(session):
+        return
+    session.info['writing'] = True
+    if current() is None:
+        return
+    try:
+        _begin_sqlite_transaction(session)
+    except BaseException:
+        session.info.pop('writing', None)
+        raise
+
+
+@event.listens_for(db.session, 'before_flush')
+def _before_flush(session, flush_context, instances):
+    _writing(session)
+
+
+@event.listens_for(db.session, 'do_orm_execute')
+def _before_statement(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        _writing(orm_execute_state.session)
+
+
+@event.listens_for(db.session, 'after_transaction_end')
+def _after_transaction_end(session, transaction):
+    if transaction.parent is None:
+        session.info.pop('writing', None)
+
+
+def begin():
+    """Open a unit of work, returns None when one is already open"""
+    if current() is not None:
+        return None
+    work = g.unit_of_work = UnitOfWork()
+    return work
+
+
+def end(work, success):
+    """Commit (success) or roll back a unit of work opened by begin()"""
+    g.pop('unit_of_work', None)
+    if not success:
+        _rollback()
+        return
+    try:
+        db.session.commit()
+    except BaseException:
+        _rollback()
+        raise
+    for callback in work.callbacks:
+        callback()
+
+
+def _rollback():
+    db.session.rollback()
+    # Objects remembered in the meantime may never have been saved
+    identitymap.clear()
+
+
+@contextmanager
+def transaction():
+    """Group the writes of the block, see the module docstring"""
+    work = begin()
+    if work is not None:
+        try:
+            yield work
+        except BaseException:
+            end(work, False)
+            raise
+        end(work, True)
+        return
+
+    work = current()
+    pending = len(work.callbacks)
+    # The savepoint has to be inside the transaction
+    _writing(db.session())
+    savepoint = db.session.begin_nested()
+    try:
+        yield work
+    except BaseException:
+        savepoint.rollback()
+        identitymap.clear()
+        del work.callbacks[pending:]
+        raise
+    savepoint.commit()
+
+
+def without_unit_of_work(method):
+    """Leave a view method that doesn't write (login) out of the
+    per-request unit of work; a write it does make commits on its own"""
+    method.request_unit_of_work = False
+    return method
+
+
+def _wants_unit_of_work():
+    if request.method not in UNSAFE_METHODS:
+        return False
+    view = current_app.view_functions.get(request.endpoint)
+    # flask_restx views carry their Resource class, the method is on it
+    method = getattr(getattr(view, 'view_class', None), request.method.lower(), view)
+    return getattr(method, 'request_unit_of_work', True)
+
+
+def init_unit_of_work(app):
+    """With UNIT_OF_WORK_PER_REQUEST, commit the writes of each POST, PUT,
+    PATCH and DELETE request once, and roll them back on an error status"""
+    if not app.config.get('UNIT_OF_WORK_PER_REQUEST'):
+        return
+
+    @app.before_request
+    def begin_request_unit_of_work():
+        if _wants_unit_of_work():
+            g.request_unit_of_work = begin()
+
+    @app.after_request
+    def end_request_unit_of_work(response):
+        work = g.pop('request_unit_of_work', None)
+        if work is not None:
+            # A failing commit propagates and turns the response into a 500
+            end(work, response.status_code < 400)
+        return response
+
+    @app.teardown_request
+    def abandon_request_unit_of_work(exception=None):
+        work = g.pop('request_unit_of_work', None)
+        if work is not None:
+            end(work, False)
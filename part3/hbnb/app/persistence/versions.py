@@ -0,0 +1,59 @@
+#!/usr/bin/python3
+from datetime import datetime
+from sqlalchemy import event, func, insert, literal, select, update
+from sqlalchemy.exc import IntegrityError
+from part3.hbnb.app import db
+from part3.hbnb.app.models.collectionversion import CollectionVersion
+from part3.hbnb.app.persistence import unitofwork
+
+
+def touch(table, added=0):
+    """Record a change to a table in the current transaction.
+
+    added is the change in row count (1 for an insert, -1 for a delete).
+    Nothing is committed, the caller's commit saves it with the change
+    itself. Tables whose version was never read have no row yet and are
+    skipped: the first read counts them.
+    """
+    db.session.execute(touch_statement(table, added))
+
+
+def touch_statement(table, added=0):
+    """The UPDATE behind touch(), for sessions other than db.session"""
+    return (update(CollectionVersion)
+            .where(CollectionVersion.name == table)
+            .values(row_count=CollectionVersion.row_count + added, last_modified=datetime.utcnow()))
+
+
+def read(model):
+    """Return (row_count, last_modified) of a model's table.
+
+    The first call on a table counts it once, in a single INSERT ... SELECT
+    so a concurrent write can't slip between the count and the insert.
+    """
+    table = model.__tablename__
+    version = db.session.get(CollectionVersion, table, populate_existing=True)
+    if version is None:
+        try:
+            # A savepoint when a unit of work is open, committed right away otherwise
+            with unitofwork.transaction():
+                db.session.execute(insert(CollectionVersion).from_select(
+                    ['name', 'row_count', 'last_modified'],
+                    select(literal(table), func.count(model.id),
+                           func.coalesce(func.max(model.updated_at), datetime.utcnow()))
+                ))
+        except IntegrityError:
+            # Another worker counted it first
+            pass
+        version = db.session.get(CollectionVersion, table, populate_existing=True)
+    return version.row_count, version.last_modified
+
+
+@event.listens_for(db.metadata, 'after_create')
+def seed_versions(target, connection, tables=(), **kw):
+    """Tables created by create_all() are empty, record that right away"""
+    now = datetime.utcnow()
+    rows = [{'name': table.name, 'row_count': 0, 'last_modified': now}
+            for table in tables if 'updated_at' in table.c and table is not CollectionVersion.__table__]
+    if rows:
+        connection.execute(insert(CollectionVersion.__table__), rows)
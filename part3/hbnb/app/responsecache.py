@@ -0,0 +1,180 @@
+#!/usr/bin/python3
+import itertools
+import json
+import uuid
+from functools import wraps
+from urllib.parse import urlencode
+
+from flask import Response, current_app, has_app_context, request
+
+from part3.hbnb.app.compression import choose_encoding, compress
+from part3.hbnb.app.persistence.cache import build_cache
+from part3.hbnb.app.services import facade
+
+DEFAULT_MAX_BODY = 1024 * 1024
+
+
+def place_reviews_tag(place_id):
+    return f'place_reviews:{place_id}'
+
+
+def stale_tags(resource, place_id=None):
+    """Tags of the cached responses a facade change makes stale"""
+    if resource == 'place':
+        return ['places']
+    if resource == 'amenity':
+        return ['amenities']
+    if resource == 'place_amenity':
+        return ['place_amenities']
+    if resource == 'review':
+        # The place list carries the rating aggregates
+        return ['places', place_reviews_tag(place_id)]
+    return []
+
+
+def _encoded_body(response, limit):
+    """The response's bytes, or None above limit with the response left intact"""
+    if not response.is_streamed:
+        body = response.get_data()
+        return body if len(body) <= limit else None
+
+    chunks, size = [], 0
+    iterator = response.iter_encoded()
+    for chunk in iterator:
+        chunks.append(chunk)
+        size += len(chunk)
+        if size > limit:
+            # Too big to keep, stream the rest as before
+            response.response = itertools.chain(chunks, iterator)
+            return None
+    response.response = chunks
+    return b''.join(chunks)
+
+
+def encode_entry(status, headers, body):
+    """A JSON line with the status and headers, then the raw body bytes.
+
+    Entries may come back from a file shared by every worker, so they are
+    never unpickled.
+    """
+    meta = json.dumps({'status': status, 'headers': headers})
+    return meta.encode('utf-8') + b'\n' + body
+
+
+def decode_entry(entry):
+    """(status, headers, body) of an entry made by encode_entry"""
+    meta, _, body = bytes(entry).partition(b'\n')
+    meta = json.loads(meta)
+    return meta['status'], [tuple(header) for header in meta['headers']], body
+
+
+class ResponseCache:
+    """Encoded GET responses grouped under invalidation tags.
+
+    Each tag has a generation token that is part of the keys stored under
+    it. Invalidating a tag drops the token, so all of its responses become
+    unreachable at once and age out of the LRU. The key is built before the
+    view runs: a response computed while a write invalidates its tag is
+    stored under the old token and never served.
+    """
+
+    def __init__(self, entries, generations, max_body=DEFAULT_MAX_BODY):
+        self.entries = entries
+        self.generations = generations
+        self.max_body = max_body
+
+    def _generation(self, tag):
+        generation = self.generations.get(tag)
+        if generation is None:
+            generation = uuid.uuid4().hex
+            self.generations.set(tag, generation)
+        return generation
+
+    def key(self, tag, encoding=None):
+        """Key of the current request: tag generation, content coding, route
+        and sorted query string"""
+        query = urlencode(sorted(request.args.items(multi=True)))
+        return f'{tag}@{self._generation(tag)}:{encoding or "identity"}:{request.path}?{query}'
+
+    def lookup(self, key):
+        cached = self.entries.get(key)
+        if cached is None:
+            return None
+        status, headers, body = decode_entry(cached)
+        return Response(body, status=status, headers=headers)
+
+    def store(self, key, response):
+        body = _encoded_body(response, self.max_body)
+        if body is None:
+            return
+        headers = [(name, value) for name, value in response.headers if name != 'Content-Length']
+        self.entries.set(key, encode_entry(response.status_code, headers, body))
+
+    def invalidate(self, tag):
+        self.generations.delete(tag)
+
+    def clear(self):
+        self.entries.clear()
+        self.generations.clear()
+
+    def stats(self):
+        return dict(self.entries.stats(), max_body=self.max_body)
+
+
+def init_response_cache(app):
+    """Build the cache selected by RESPONSE_CACHE, stored in app.extensions"""
+    entries = build_cache(app.config, 'RESPONSE_CACHE')
+    if entries is not None:
+        entries = ResponseCache(entries, build_cache(app.config, 'RESPONSE_CACHE'),
+                                app.config.get('RESPONSE_CACHE_MAX_BODY', DEFAULT_MAX_BODY))
+    app.extensions['response_cache'] = entries
+
+
+def response_cache_stats():
+    cache = current_app.extensions.get('response_cache')
+    return cache.stats() if cache else None
+
+
+def _invalidate(resource, **keys):
+    cache = current_app.extensions.get('response_cache') if has_app_context() else None
+    if cache is None:
+        return
+    for tag in stale_tags(resource, **keys):
+        cache.invalidate(tag)
+
+
+facade.subscribe(_invalidate)
+
+
+def cached_response(tag):
+    """Serve a public GET endpoint from the response cache.
+
+    tag is a string or a function of the view arguments, see stale_tags()
+    for the facade changes that invalidate it. Only 200 responses are
+    stored, already compressed for the negotiated content coding so a hit
+    is neither re-serialized nor recompressed. A hit is replayed without
+    touching the database and still answers If-None-Match/If-Modified-Since
+    with 304.
+    """
+    def decorator(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            cache = current_app.extensions.get('response_cache')
+            if cache is None:
+                return fn(*args, **kwargs)
+
+            encoding = choose_encoding()
+            key = cache.key(tag(**kwargs) if callable(tag) else tag, encoding)
+            response = cache.lookup(key)
+            if response is not None:
+                response.headers['X-Cache'] = 'HIT'
+                return response.make_conditional(request.environ)
+
+            response = fn(*args, **kwargs)
+            if isinstance(response, Response) and response.status_code == 200:
+                compress(response, encoding)
+                cache.store(key, response)
+                response.headers['X-Cache'] = 'MISS'
+            return response
+        return wrapper
+    return decorator
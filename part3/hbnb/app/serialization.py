@@ -0,0 +1,202 @@
+#!/usr/bin/python3
+import json
+import threading
+from datetime import date, datetime
+
+from flask import Response
+from part3.hbnb.app.persistence.pagination import encode_cursor
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is optional
+    orjson = None
+
+# Field spec entry whose value (a dict) is merged into the output
+MERGE = object()
+# View that always lists every column of the table
+COLUMNS = 'columns'
+
+_views = {}
+_compiled = {}
+_lock = threading.Lock()
+
+
+def register(model, fields, view='default'):
+    """Declare the fields a view of a model serializes.
+
+    Each field is an attribute name, an (output key, attribute name) pair,
+    an (output key, function of the object) pair, or an (output key,
+    function, attribute names) triple calling the function with those
+    attribute values. (MERGE, function) merges the dict the function returns.
+    """
+    with _lock:
+        _views[(model, view)] = [_normalize(field) for field in fields]
+        for key in [key for key in _compiled if key[:2] == (model, view)]:
+            del _compiled[key]
+
+
+def _normalize(field):
+    """Turn a field spec into (output key, source, argument names)"""
+    if not isinstance(field, tuple):
+        return field, field, None
+    if len(field) == 2:
+        return field[0], field[1], None
+    return field[0], field[1], tuple(field[2])
+
+
+def _column_fields(model):
+    return [(column.key, column.key, None) for column in model.__table__.columns]
+
+
+def _datetime_type(column):
+    try:
+        return column.type.python_type in (datetime, date)
+    except NotImplementedError:
+        return False
+
+
+def _compile(model, fields, native, rows):
+    """Generate one function returning the dict of a view.
+
+    The attribute reads are unrolled into a single dict display, so a row
+    costs a function call instead of a loop over the field spec. With
+    native=False dates become ISO strings (JSON safe for any encoder);
+    native=True leaves them for orjson to encode.
+
+    rows is False for entities, or the column names of projected Row tuples
+    (see get_all_rows), which are then read by position.
+    """
+    columns = model.__table__.columns
+    positions = {name: index for index, name in enumerate(rows)} if rows else None
+
+    def read(name, fast):
+        if positions is not None:
+            return f'obj[{positions[name]}]'
+        # Loaded column values sit in the instance __dict__; reading them
+        # there skips the ORM attribute descriptor
+        return f'state[{name!r}]' if fast and name in columns else f'obj.{name}'
+
+    def value(name, fast):
+        expression = read(name, fast)
+        column = columns.get(name)
+        if not native and column is not None and _datetime_type(column):
+            expression = f'(None if {expression} is None else {expression}.isoformat())'
+        return expression
+
+    namespace = {}
+    fast_items, slow_items = [], []
+    merges = []
+    for position, (key, source, args) in enumerate(fields):
+        if callable(source):
+            name = f'_f{position}'
+            namespace[name] = source
+            if args is None:
+                fast = slow = f'{name}(obj)'
+            else:
+                fast = f"{name}({', '.join(read(arg, True) for arg in args)})"
+                slow = f"{name}({', '.join(read(arg, False) for arg in args)})"
+            if key is MERGE:
+                merges.append(fast if positions is not None else slow)
+                continue
+        else:
+            fast, slow = value(source, True), value(source, False)
+        fast_items.append(f'{key!r}: {fast}')
+        slow_items.append(f'{key!r}: {slow}')
+
+    if positions is not None:
+        lines = ['def serialize(obj):', '    result = {' + ', '.join(fast_items) + '}']
+    else:
+        lines = [
+            'def serialize(obj):',
+            '    state = obj.__dict__',
+            '    try:',
+            '        result = {' + ', '.join(fast_items) + '}',
+            '    except KeyError:',
+            '        # Expired or deferred column, let the ORM load it',
+            '        result = {' + ', '.join(slow_items) + '}',
+        ]
+    lines += [f'    result.update({merge})' for merge in merges]
+    lines.append('    return result')
+    exec('\n'.join(lines), namespace)
+    return namespace['serialize']
+
+
+def serializer(model, view='default', native=False, rows=False):
+    """Return the compiled serializer of a view, building it on first use.
+
+    The COLUMNS view, and the default view of a model that registered
+    none, serialize every column. rows gives the column names of the
+    projected rows to serialize instead of entities.
+    """
+    key = (model, view, native, tuple(rows) if rows else False)
+    function = _compiled.get(key)
+    if function is None:
+        with _lock:
+            fields = _views.get((model, view))
+            if fields is None:
+                if view not in ('default', COLUMNS):
+                    raise KeyError(f'No {view!r} view registered for {model.__name__}')
+                fields = _column_fields(model)
+            function = _compiled[key] = _compile(model, fields, native, key[3])
+    return function
+
+
+def view_columns(model, view='default'):
+    """Names of the attributes a view reads, to project a query on"""
+    names = []
+    for key, source, args in _views.get((model, view)) or _column_fields(model):
+        for name in args or ([] if callable(source) else [source]):
+            if name not in names:
+                names.append(name)
+    return names
+
+
+def _layout(objs, rows):
+    """Column names of the first projected row, or False for entities"""
+    return objs[0]._fields if rows and objs else False
+
+
+def _default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+
+def dumps(data):
+    """Encode to JSON bytes, with orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, default=_default, separators=(',', ':')).encode('utf-8')
+
+
+def dump_rows(objs, model, view='default', rows=False):
+    """Encode objects (or projected rows) as the comma separated body of a JSON array"""
+    serialize = serializer(model, view, native=True, rows=_layout(objs, rows))
+    return dumps([serialize(obj) for obj in objs])[1:-1]
+
+
+def json_response(data, status=200):
+    """Encoded response that flask_restx passes through without marshalling"""
+    return Response(dumps(data), status=status, mimetype='application/json')
+
+
+def list_body(objs, model, view='default', rows=False):
+    serialize = serializer(model, view, native=True, rows=_layout(objs, rows))
+    return dumps([serialize(obj) for obj in objs])
+
+
+def page_body(page, model, view='default', rows=False):
+    """Body of paged list endpoints: {'results', 'next_cursor'}"""
+    serialize = serializer(model, view, native=True, rows=_layout(page.items, rows))
+    return dumps({
+        'results': [serialize(obj) for obj in page.items],
+        'next_cursor': encode_cursor(page.next_after)
+    })
+
+
+def list_response(objs, model, view='default', rows=False):
+    return Response(list_body(objs, model, view, rows), mimetype='application/json')
+
+
+def page_response(page, model, view='default', rows=False):
+    return Response(page_body(page, model, view, rows), mimetype='application/json')
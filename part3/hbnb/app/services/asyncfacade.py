@@ -0,0 +1,38 @@
+#!/usr/bin/python3
+"""Read side of the facade for the ASGI tier, on asyncio repositories"""
+from part3.hbnb.app.models.amenity import Amenity
+from part3.hbnb.app.persistence.asyncrepository import AsyncSQLAlchemyRepository
+from part3.hbnb.app.persistence.pagination import DEFAULT_PAGE_SIZE
+from part3.hbnb.app.services.repositories.placerepository import AsyncPlaceRepository
+from part3.hbnb.app.services.repositories.reviewrepository import AsyncReviewRepository
+
+
+class AsyncHBnBFacade:
+    def __init__(self, sessions):
+        self.place_repo = AsyncPlaceRepository(sessions)
+        self.review_repo = AsyncReviewRepository(sessions)
+        self.amenity_repo = AsyncSQLAlchemyRepository(Amenity, sessions)
+
+    # PLACE
+    async def get_place(self, place_id, columns):
+        return await self.place_repo.get_row(place_id, columns)
+
+    async def get_all_places(self, columns, after=None, limit=None):
+        return await self.place_repo.get_all_rows(columns, after, limit)
+
+    # AMENITY
+    async def get_amenity(self, amenity_id):
+        return await self.amenity_repo.get(amenity_id)
+
+    async def get_all_amenities(self, columns, after=None, limit=None):
+        return await self.amenity_repo.get_all_rows(columns, after, limit)
+
+    # REVIEW
+    async def get_all_reviews(self, columns, after=None, limit=None):
+        return await self.review_repo.get_all_rows(columns, after, limit)
+
+    async def get_reviews_by_place(self, place_id, columns, after=None, limit=DEFAULT_PAGE_SIZE):
+        return await self.review_repo.list_by_place(place_id, columns, limit, after)
+
+    def iter_reviews_by_place(self, place_id, columns, chunk_size=500):
+        return self.review_repo.iter_by_place(place_id, columns, chunk_size)
@@ -1,29 +1,153 @@
 #!/usr/bin/python3
-from part3.hbnb.app.models.placeamenity import PlaceAmenity
-from part3.hbnb.app.services.repositories.userrepository import UserRepository
-from part3.hbnb.app.services.repositories.amenityrepository import AmenityRepository
-from part3.hbnb.app.services.repositories.placerepository import PlaceRepository
-from part3.hbnb.app.services.repositories.reviewrepository import ReviewRepository
-from part3.hbnb.app.services.repositories.placeamenityrepository import PlaceAmenityRepository
+import itertools
+from collections import namedtuple
+from importlib import import_module
+from part3.hbnb.app.hashing import HashingBusy
+from part3.hbnb.app.persistence import unitofwork
+from part3.hbnb.app.persistence.cache import CachedRepository
+from part3.hbnb.app.persistence.repository import BULK_CHUNK_SIZE
 
-from part3.hbnb.app.models.user import User
-from part3.hbnb.app.models.amenity import Amenity
-from part3.hbnb.app.models.place import Place
-from part3.hbnb.app.models.review import Review
+# created: ids of the inserted rows, errors: [{'index', 'error'}] for the rejected ones
+BulkResult = namedtuple('BulkResult', ['created', 'errors'])
+
+
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _row_id(row, key):
+    """The id a bulk row references under key, which must be a string"""
+    value = row.get(key)
+    if not isinstance(value, str):
+        raise ValueError(f'{key} must be a string')
+    return value
+
+
+def _chunk_ids(chunk, key):
+    """Every well-formed id of a chunk under key, for one IN query"""
+    return [row[key] for _, row in chunk if isinstance(row, dict) and isinstance(row.get(key), str)]
+
+
+class _LazyRepository:
+    """Facade attribute creating its repository on first use, so importing
+    the facade doesn't import every model and repository module"""
+
+    def __init__(self, module, class_name):
+        self.module = f'part3.hbnb.app.services.repositories.{module}'
+        self.class_name = class_name
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, facade, owner=None):
+        if facade is None:
+            return self
+        repository = getattr(import_module(self.module), self.class_name)()
+        # Stored on the instance, which takes precedence over this descriptor
+        facade.__dict__[self.name] = repository
+        return repository
 
 
 class HBnBFacade:
+    # Model instances are built through repo.model for the same reason
+    user_repo = _LazyRepository('userrepository', 'UserRepository')
+    place_repo = _LazyRepository('placerepository', 'PlaceRepository')
+    review_repo = _LazyRepository('reviewrepository', 'ReviewRepository')
+    amenity_repo = _LazyRepository('amenityrepository', 'AmenityRepository')
+    place_amenity_repo = _LazyRepository('placeamenityrepository', 'PlaceAmenityRepository')
+    rating_stats_repo = _LazyRepository('placeratingstatsrepository', 'PlaceRatingStatsRepository')
+
     def __init__(self):
-        self.user_repo = UserRepository()
-        self.place_repo = PlaceRepository()
-        self.review_repo = ReviewRepository()
-        self.amenity_repo = AmenityRepository()
-        self.place_amenity_repo = PlaceAmenityRepository()
+        self.cache = None
+        self.listeners = []
+
+    # EVENTS
+    def subscribe(self, listener):
+        """Call listener(resource, **keys) after each committed change,
+        e.g. ('review', place_id=...) or ('amenity',)"""
+        if listener not in self.listeners:
+            self.listeners.append(listener)
+
+    def _changed(self, resource, **keys):
+        # Listeners refresh caches, they must not see uncommitted changes
+        def notify():
+            for listener in self.listeners:
+                listener(resource, **keys)
+        unitofwork.after_commit(notify)
+
+    # UNIT OF WORK
+    def transaction(self):
+        """Save the writes of several facade calls with one commit:
+
+            with facade.transaction():
+                place = facade.create_place(...)
+                facade.create_place_amenity({'place_id': place.id, ...})
+
+        Rolled back as a whole if the block raises, see persistence/unitofwork.py
+        """
+        return unitofwork.transaction()
+
+    # CACHE
+    # Not users: their rows carry password hashes
+    CACHED_REPOSITORIES = ('place_repo', 'review_repo', 'amenity_repo')
+
+    def enable_cache(self, cache):
+        """Put a read-through cache in front of get() of the main repositories"""
+        self.disable_cache()
+        self.cache = cache
+        for name in self.CACHED_REPOSITORIES:
+            setattr(self, name, CachedRepository(getattr(self, name), cache))
+
+    def disable_cache(self):
+        if self.cache is None:
+            return
+        for name in self.CACHED_REPOSITORIES:
+            setattr(self, name, getattr(self, name).repository)
+        self.cache.clear()
+        self.cache = None
+
+    def cache_stats(self):
+        return self.cache.stats() if self.cache else None
+
+    # OWNERSHIP
+    # resource name -> (repository attribute, column holding the owner's user id)
+    OWNER_COLUMNS = {
+        'user': ('user_repo', 'id'),
+        'place': ('place_repo', 'owner_id'),
+        'review': ('review_repo', 'user_id'),
+    }
+
+    def get_owner_id(self, resource, obj_id):
+        """Return the id of the user owning a resource, None if it doesn't exist"""
+        repo_name, column = self.OWNER_COLUMNS[resource]
+        return getattr(self, repo_name).get_value(obj_id, column)
+
+    # VERSIONS
+    VERSIONED_REPOSITORIES = {
+        'place': 'place_repo',
+        'amenity': 'amenity_repo',
+        'review': 'review_repo',
+    }
+
+    def get_version(self, resource, obj_id, expand=()):
+        """Last modification time of a resource, None if it doesn't exist.
+        expand names the embedded relationships that count as well"""
+        repository = getattr(self, self.VERSIONED_REPOSITORIES[resource])
+        return repository.get_version(obj_id, expand) if expand else repository.get_version(obj_id)
+
+    def get_collection_version(self, resource):
+        """(row_count, last_modified) of a resource's whole collection"""
+        return getattr(self, self.VERSIONED_REPOSITORIES[resource]).get_collection_version()
 
     # USER
     def create_user(self, user_data):
-        user = User(**user_data)
-        user.hash_password(user.password)
+        # User() already hashes the password
+        user = self.user_repo.model(**user_data)
         self.user_repo.add(user)
         return user
 
@@ -33,8 +157,29 @@ class HBnBFacade:
     def get_user_by_email(self, email):
         return self.user_repo.get_by_attribute('email', email)
 
-    def get_all_users(self):
-        return self.user_repo.get_all()
+    def authenticate(self, email, password):
+        """Return the user matching the credentials, or None.
+
+        A stored hash made with another work factor is replaced on success,
+        unless the hashing pool is busy: then it waits for a later login.
+        """
+        user = self.get_user_by_email(email)
+        if not user or not user.verify_password(password):
+            return None
+        if user.needs_rehash():
+            try:
+                user.hash_password(password)
+            except HashingBusy:
+                return user
+            self.user_repo.update(user.id, {'password': user.password})
+        return user
+
+    def get_all_users(self, after=None, limit=None, columns=None):
+        if columns:
+            return self.user_repo.get_all_rows(columns, after, limit)
+        if limit is None:
+            return self.user_repo.get_all()
+        return self.user_repo.get_page(after, limit)
 
     def update_user(self, user_id, user_data):
         """Update user information by ID"""
@@ -48,8 +193,9 @@ class HBnBFacade:
 
     # AMENITY
     def create_amenity(self, amenity_data):
-        amenity = Amenity(**amenity_data)
+        amenity = self.amenity_repo.model(**amenity_data)
         self.amenity_repo.add(amenity)
+        self._changed('amenity')
         return amenity
 
     def get_amenity(self, amenity_id):
@@ -58,9 +204,13 @@ class HBnBFacade:
             raise ValueError(f"Amenity with ID {amenity_id} not found")
         return amenity
 
-    def get_all_amenities(self):
-        amenities = self.amenity_repo.get_all()
-        return [amenity for amenity in amenities]
+    def get_all_amenities(self, after=None, limit=None, columns=None):
+        if columns:
+            return self.amenity_repo.get_all_rows(columns, after, limit)
+        if limit is None:
+            amenities = self.amenity_repo.get_all()
+            return [amenity for amenity in amenities]
+        return self.amenity_repo.get_page(after, limit)
 
     def update_amenity(self, amenity_id, amenity_data):
         amenity = self.amenity_repo.get(amenity_id)
@@ -72,6 +222,7 @@ class HBnBFacade:
                 setattr(amenity, key, value)
 
         self.amenity_repo.update(amenity.id, amenity_data)
+        self._changed('amenity')
         return amenity
 
     # PLACE
@@ -85,19 +236,42 @@ class HBnBFacade:
         if not owner:
             raise Exception('Owner not found')
 
-        # Create the Place instance without amenities for now
-        place = Place(owner_id=owner_id, **place_data)
+        # Create the Place instance without amenities for now, the owner is
+        # handed over so validation doesn't query it a second time
+        place = self.place_repo.model(owner_id=owner_id, owner=owner, **place_data)
+        place.rating_stats = self.rating_stats_repo.model()
 
         # Add the Place instance to the repository
         self.place_repo.add(place)
+        self._changed('place')
 
         return place
 
-    def get_place(self, place_id):
+    def get_place(self, place_id, expand=()):
+        """The place, with the relationships named in expand (owner,
+        amenities, reviews) loaded eagerly"""
+        if expand:
+            return self.place_repo.get_expanded(place_id, expand)
         return self.place_repo.get(place_id)
 
-    def get_all_places(self):
-        return self.place_repo.get_all()
+    def get_all_places(self, after=None, limit=None, columns=None):
+        # Without a limit keep the historical behaviour of returning every place,
+        # otherwise return a Page ordered by (created_at, id).
+        # With columns, rows of those columns are returned instead of places.
+        if columns:
+            return self.place_repo.get_all_rows(columns, after, limit)
+        if limit is None:
+            return self.place_repo.get_all()
+        return self.place_repo.get_page(after, limit)
+
+    def search_places(self, filters, columns=None):
+        """Search places by price range, bounding box and amenities, a Page
+        of them in the filters' sort order"""
+        return self.place_repo.search(**filters, columns=columns)
+
+    def get_places_nearby(self, latitude, longitude, radius_km, limit, columns=None):
+        """Return (place, distance_km) pairs ordered by distance"""
+        return self.place_repo.nearby(latitude, longitude, radius_km, limit, columns=columns)
 
     # Updated `update_place` method in `HBnBFacade` class
     def update_place(self, place_id, place_data):
@@ -119,59 +293,89 @@ class HBnBFacade:
 
         # Update the place in the repository
         self.place_repo.update(place_id, place_data)
+        self._changed('place')
         return place
 
     # REVIEW
-    def create_review(self, review_data):
-        # Retrieve the place by its ID
-        place = self.place_repo.get(review_data['place_id'])
+    def create_review(self, review_data, place=None):
+        # Retrieve the place by its ID unless the caller already loaded it
+        if place is None:
+            place = self.place_repo.get(review_data['place_id'])
         if not place:
             raise ValueError('Place not found')
 
-        # Retrieve the user by its ID
-        user = self.user_repo.get(review_data['user_id'])
-        if not user:
+        # Only check that the user exists, the object itself isn't needed
+        if not self.user_repo.exists(review_data['user_id']):
             raise ValueError('User not found')
 
-        # Create the Review object by passing user and place objects
-        review = Review(
+        # Create the Review object
+        review = self.review_repo.model(
             text=review_data['text'],
             rating=review_data['rating'],
             place_id=place.id,
-            user_id=user.id
+            user_id=review_data['user_id']
         )
 
+        # Update the place's aggregates, committed together with the review
+        stats = place.rating_stats or self.rating_stats_repo.get_or_create(place.id)
+        stats.add_rating(review.rating)
+        # Listed places carry the aggregates too
+        self.place_repo.touch()
+
         # Add the review to the repository
         self.review_repo.add(review)
+        # Cached places hold the aggregates that just changed
+        self.place_repo.invalidate(place.id)
+        self._changed('review', place_id=place.id)
 
         return review
 
     def get_review(self, review_id):
         return self.review_repo.get(review_id)
 
-    def get_all_reviews(self):
-        return self.review_repo.get_all()
+    def get_all_reviews(self, after=None, limit=None, columns=None):
+        if columns:
+            return self.review_repo.get_all_rows(columns, after, limit)
+        if limit is None:
+            return self.review_repo.get_all()
+        return self.review_repo.get_page(after, limit)
+
+    def user_has_reviewed(self, user_id, place_id):
+        return self.review_repo.exists_for(user_id, place_id)
 
     # Facade method (in HBnBFacade class)
-    def get_reviews_by_place(self, place_id):
-        reviews = self.review_repo.get_by_attribute('place_id', place_id)
-        return [reviews] if isinstance(reviews, Review) else reviews if reviews else []
+    def get_reviews_by_place(self, place_id, after=None, limit=None):
+        if limit is None:
+            return list(self.review_repo.iter_by_place(place_id))
+        return self.review_repo.list_by_place(place_id, limit, after)
+
+    def iter_reviews_by_place(self, place_id, chunk_size=500):
+        """Lazily yield a place's reviews without loading them all at once"""
+        return self.review_repo.iter_by_place(place_id, chunk_size)
 
     def update_review(self, review_id, review_data):
         review = self.review_repo.get(review_id)
         if not review:
             return None
+        old_rating = review.rating
 
         # Update the attributes of the review
-        for key, value in review_data.items():
-            if key in ['text', 'rating']:  # Update only allowed attributes
-                setattr(review, key, value)
+        allowed_data = {key: value for key, value in review_data.items() if key in ['text', 'rating']}
+        for key, value in allowed_data.items():
+            setattr(review, key, value)
 
         # Validate the updated review object
         review.validations()
 
+        if review.rating != old_rating:
+            stats = self.rating_stats_repo.get_or_create(review.place_id)
+            stats.replace_rating(old_rating, review.rating)
+            self.place_repo.touch()
+
         # Update the review in the repository
-        self.review_repo.update(review.id, review_data)
+        self.review_repo.update(review.id, allowed_data)
+        self.place_repo.invalidate(review.place_id)
+        self._changed('review', place_id=review.place_id)
 
         return review
 
@@ -180,22 +384,38 @@ class HBnBFacade:
         if not review:
             return None
 
+        stats = self.rating_stats_repo.get(review.place_id)
+        if stats:
+            stats.remove_rating(review.rating)
+            self.place_repo.touch()
+
         # Delete the review from the repository
         self.review_repo.delete(review_id)
+        self.place_repo.invalidate(review.place_id)
+        self._changed('review', place_id=review.place_id)
 
         return True
 
+    def rebuild_rating_stats(self):
+        """Recompute all place rating aggregates, returns the number of places"""
+        count = self.rating_stats_repo.rebuild()
+        if self.cache:
+            unitofwork.after_commit(self.cache.clear)
+        self._changed('place')
+        return count
+
     # PLACE AMENITY
 
     def create_place_amenity(self, amenity_data):
 
-        place_amenity = PlaceAmenity(
+        place_amenity = self.place_amenity_repo.model(
             place_id=amenity_data['place_id'],
             amenity_id=amenity_data['amenity_id']
         )
 
         # Add the review to the repository
         self.place_amenity_repo.add(place_amenity)
+        self._changed('place_amenity', place_id=place_amenity.place_id)
 
         return place_amenity
 
@@ -205,3 +425,91 @@ class HBnBFacade:
     def get_place_amenity_by_place(self, place_id):
         return self.place_amenity_repo.get_by_attribute('place_id', place_id)
 
+    # BULK
+    def _bulk_create(self, repo, rows, chunk_size, build_chunk, resource):
+        """Validate and insert rows chunk by chunk, collecting per-row errors.
+
+        build_chunk receives [(index, row)] and yields (index, object) or
+        (index, exception) so it can validate a whole chunk with one query.
+        Listeners hear one change of resource once everything is inserted.
+        """
+        created = []
+        errors = []
+        for chunk in _chunks(enumerate(rows), chunk_size):
+            valid = []
+            for index, result in build_chunk(chunk):
+                if isinstance(result, Exception):
+                    errors.append({'index': index, 'error': str(result)})
+                else:
+                    valid.append((index, result))
+
+            failed = repo.add_many([obj for _, obj in valid], chunk_size)
+            for position, (index, obj) in enumerate(valid):
+                if position in failed:
+                    errors.append({'index': index, 'error': failed[position]})
+                else:
+                    created.append(obj.id)
+
+        errors.sort(key=lambda error: error['index'])
+        if created:
+            self._changed(resource)
+        return BulkResult(created, errors)
+
+    def _build_places(self, chunk):
+        # One owner lookup for the whole chunk
+        owners = self.user_repo.get_many(_chunk_ids(chunk, 'owner_id'))
+        place_model = self.place_repo.model
+        for index, row in chunk:
+            try:
+                if isinstance(row, Exception):
+                    raise row
+                if not isinstance(row, dict):
+                    raise ValueError('Each place must be a JSON object')
+                owner = owners.get(_row_id(row, 'owner_id'))
+                if not owner:
+                    raise ValueError('Owner not found')
+                yield index, place_model(owner=owner, **row)
+            except (TypeError, ValueError) as e:
+                yield index, e
+
+    def _build_amenities(self, chunk):
+        amenity_model = self.amenity_repo.model
+        for index, row in chunk:
+            try:
+                if isinstance(row, Exception):
+                    raise row
+                if not isinstance(row, dict):
+                    raise ValueError('Each amenity must be a JSON object')
+                yield index, amenity_model(**row)
+            except (TypeError, ValueError) as e:
+                yield index, e
+
+    def _build_place_amenities(self, chunk):
+        places = self.place_repo.get_many(_chunk_ids(chunk, 'place_id'))
+        amenities = self.amenity_repo.get_many(_chunk_ids(chunk, 'amenity_id'))
+        for index, row in chunk:
+            try:
+                if isinstance(row, Exception):
+                    raise row
+                if not isinstance(row, dict):
+                    raise ValueError('Each place amenity must be a JSON object')
+                place_id = _row_id(row, 'place_id')
+                if place_id not in places:
+                    raise ValueError('Place not found')
+                amenity_id = _row_id(row, 'amenity_id')
+                if amenity_id not in amenities:
+                    raise ValueError('Amenity not found')
+                yield index, self.place_amenity_repo.model(place_id=place_id, amenity_id=amenity_id)
+            except (TypeError, ValueError) as e:
+                yield index, e
+
+    def create_places_bulk(self, rows, chunk_size=BULK_CHUNK_SIZE):
+        """Create many places, returns a BulkResult"""
+        return self._bulk_create(self.place_repo, rows, chunk_size, self._build_places, 'place')
+
+    def create_amenities_bulk(self, rows, chunk_size=BULK_CHUNK_SIZE):
+        return self._bulk_create(self.amenity_repo, rows, chunk_size, self._build_amenities, 'amenity')
+
+    def create_place_amenities_bulk(self, rows, chunk_size=BULK_CHUNK_SIZE):
+        return self._bulk_create(self.place_amenity_repo, rows, chunk_size, self._build_place_amenities,
+                                 'place_amenity')
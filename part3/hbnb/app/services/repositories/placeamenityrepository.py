@@ -7,4 +7,4 @@ class PlaceAmenityRepository(SQLAlchemyRepository):
         super().__init__(PlaceAmenity)
 
     def get_by_attribute(self, attribute_name, attribute_value):
-        return self.model.query(PlaceAmenity).filter_by(**{attribute_name: attribute_value}).all()
+        return self.model.query.filter_by(**{attribute_name: attribute_value}).all()
@@ -0,0 +1,53 @@
+from datetime import datetime
+from sqlalchemy import case, delete, func, insert, literal, select
+from part3.hbnb.app import db
+from part3.hbnb.app.models.place import Place
+from part3.hbnb.app.models.placeratingstats import PlaceRatingStats, RATINGS
+from part3.hbnb.app.models.review import Review
+from part3.hbnb.app.persistence.repository import SQLAlchemyRepository
+from part3.hbnb.app.persistence import identitymap, unitofwork, versions
+
+
+class PlaceRatingStatsRepository(SQLAlchemyRepository):
+    def __init__(self):
+        super().__init__(PlaceRatingStats)
+
+    def get_or_create(self, place_id):
+        """Return the aggregates row of a place, adding an empty one if missing.
+
+        Nothing is committed: the caller's next commit saves it together
+        with the review that changed it.
+        """
+        stats = self.get(place_id)
+        if stats is None:
+            stats = PlaceRatingStats(place_id)
+            db.session.add(stats)
+            identitymap.remember(self.model, place_id, stats)
+        return stats
+
+    def rebuild(self):
+        """Recompute every place's aggregates from the review table"""
+        columns = (['place_id', 'review_count', 'rating_sum'] + [f'rating_{rating}' for rating in RATINGS]
+                   + ['updated_at'])
+        aggregates = (
+            select(
+                Place.id,
+                func.count(Review.id),
+                func.coalesce(func.sum(Review.rating), 0),
+                *[func.coalesce(func.sum(case((Review.rating == rating, 1), else_=0)), 0)
+                  for rating in RATINGS],
+                literal(datetime.utcnow())
+            )
+            .select_from(Place)
+            .outerjoin(Review, Review.place_id == Place.id)
+            .group_by(Place.id)
+        )
+
+        db.session.execute(delete(PlaceRatingStats))
+        result = db.session.execute(insert(PlaceRatingStats).from_select(columns, aggregates))
+        # Every place's representation may have changed
+        versions.touch(Place.__tablename__)
+        unitofwork.commit()
+        db.session.expire_all()
+        identitymap.clear()
+        return result.rowcount
@@ -1,7 +1,195 @@
+import heapq
+from sqlalchemy import and_, func, or_, select
+from sqlalchemy.orm import joinedload, selectinload
+from part3.hbnb.app.models.amenity import Amenity
 from part3.hbnb.app.models.place import Place
+from part3.hbnb.app.models.placeamenity import PlaceAmenity
+from part3.hbnb.app.models.placeratingstats import PlaceRatingStats, STATS_COLUMNS
+from part3.hbnb.app.models.review import Review
+from part3.hbnb.app.models.user import User
+from part3.hbnb.app import db
+from part3.hbnb.app.persistence.asyncrepository import AsyncSQLAlchemyRepository
 from part3.hbnb.app.persistence.repository import SQLAlchemyRepository
+from part3.hbnb.app.persistence.pagination import DEFAULT_PAGE_SIZE, Page
+from part3.hbnb.app.persistence import geohash
+
+# Candidates fetched at a time by nearby()
+NEARBY_BATCH_SIZE = 500
+
+# Search orders: (column, descending), ties broken by ascending id
+SORT_KEYS = {
+    'price_asc': (Place.price, False),
+    'price_desc': (Place.price, True),
+    'newest': (Place.created_at, True),
+    'oldest': (Place.created_at, False),
+}
+SORT_ORDERS = {
+    name: (column.desc() if descending else column.asc(), Place.id)
+    for name, (column, descending) in SORT_KEYS.items()
+}
+
+
+def sort_after(sort, after):
+    """Keyset condition: places ordered after the (sort value, id) position"""
+    value, obj_id = after
+    column, descending = SORT_KEYS[sort]
+    beyond = column < value if descending else column > value
+    return or_(beyond, and_(column == value, Place.id > obj_id))
+
+
+# Relationships a place can be loaded with, and the loader of each: the
+# owner joins into the place query, collections take one IN query each
+EXPANSIONS = {
+    'owner': joinedload(Place.owner),
+    'amenities': selectinload(Place.amenities),
+    'reviews': selectinload(Place.reviews),
+}
+
+
+def row_entities(columns):
+    """The attributes to select for the named place and aggregate columns,
+    and whether the aggregates have to be joined"""
+    selected = [getattr(PlaceRatingStats, name) if name in STATS_COLUMNS else getattr(Place, name)
+                for name in columns]
+    return selected, any(name in STATS_COLUMNS for name in columns)
 
 
 class PlaceRepository(SQLAlchemyRepository):
     def __init__(self):
         super().__init__(Place)
+
+    def _row_query(self, columns):
+        """Place columns, plus the rating aggregates through an outer join"""
+        selected, with_stats = row_entities(columns)
+        query = db.session.query(*selected).select_from(Place)
+        if with_stats:
+            query = query.outerjoin(PlaceRatingStats, PlaceRatingStats.place_id == Place.id)
+        return query
+
+    def get_expanded(self, obj_id, expand):
+        """The place with the EXPANSIONS named in expand loaded, in one query
+        plus one per collection"""
+        statement = (select(Place)
+                     .options(*[EXPANSIONS[name] for name in expand])
+                     .where(Place.id == obj_id)
+                     .execution_options(populate_existing=True))
+        return db.session.scalars(statement).first()
+
+    def get_version(self, obj_id, expand=()):
+        """Latest of the place's and its rating aggregates' modification times,
+        and of the related rows named in expand (see EXPANSIONS)"""
+        stamps = [Place.updated_at, PlaceRatingStats.updated_at]
+        if 'owner' in expand:
+            stamps.append(select(User.updated_at).where(User.id == Place.owner_id).scalar_subquery())
+        if 'amenities' in expand:
+            # Links and amenities are compared apart, a rename doesn't touch the link
+            stamps.append(select(func.max(PlaceAmenity.updated_at))
+                          .where(PlaceAmenity.place_id == Place.id).scalar_subquery())
+            stamps.append(select(func.max(Amenity.updated_at))
+                          .join(PlaceAmenity, PlaceAmenity.amenity_id == Amenity.id)
+                          .where(PlaceAmenity.place_id == Place.id).scalar_subquery())
+        if 'reviews' in expand:
+            # Deleted reviews show in the aggregates' updated_at
+            stamps.append(select(func.max(Review.updated_at))
+                          .where(Review.place_id == Place.id).scalar_subquery())
+        row = (db.session.query(*stamps)
+               .outerjoin(PlaceRatingStats, PlaceRatingStats.place_id == Place.id)
+               .filter(Place.id == obj_id)
+               .first())
+        if row is None:
+            return None
+        return max(stamp for stamp in row if stamp is not None)
+
+    def search(self, min_price=None, max_price=None, bbox=None, amenity_ids=None,
+               sort='price_asc', limit=DEFAULT_PAGE_SIZE, after=None, columns=None):
+        """Filter places in a single SQL query, returns a Page.
+
+        bbox is (min_lat, min_lon, max_lat, max_lon); a min_lon greater than
+        max_lon means the box crosses the antimeridian.
+        amenity_ids keeps only places that have every listed amenity.
+        after is the (sort value, id) position the page starts after.
+        With columns, the page holds rows of those columns instead of places.
+        """
+        sort_column = SORT_KEYS[sort][0]
+        if columns:
+            # The position of the last row needs its sort value and id
+            columns = list(columns) + [name for name in (sort_column.key, 'id') if name not in columns]
+        query = self._row_query(columns) if columns else self.model.query
+
+        if min_price is not None:
+            query = query.filter(Place.price >= min_price)
+        if max_price is not None:
+            query = query.filter(Place.price <= max_price)
+
+        if bbox:
+            min_lat, min_lon, max_lat, max_lon = bbox
+            query = query.filter(Place.latitude.between(min_lat, max_lat))
+            if min_lon <= max_lon:
+                query = query.filter(Place.longitude.between(min_lon, max_lon))
+            else:
+                query = query.filter(or_(Place.longitude >= min_lon, Place.longitude <= max_lon))
+
+        if amenity_ids:
+            amenity_ids = set(amenity_ids)
+            with_amenities = (
+                PlaceAmenity.query
+                .with_entities(PlaceAmenity.place_id)
+                .filter(PlaceAmenity.amenity_id.in_(amenity_ids))
+                .group_by(PlaceAmenity.place_id)
+                .having(func.count(func.distinct(PlaceAmenity.amenity_id)) == len(amenity_ids))
+            )
+            query = query.filter(Place.id.in_(with_amenities))
+
+        if after:
+            query = query.filter(sort_after(sort, after))
+        rows = query.order_by(*SORT_ORDERS[sort]).limit(limit + 1).all()
+        items = rows[:limit]
+        next_after = (getattr(items[-1], sort_column.key), items[-1].id) if len(rows) > limit else None
+        return Page(items, next_after)
+
+    def nearby(self, latitude, longitude, radius_km, limit=DEFAULT_PAGE_SIZE, columns=None):
+        """Return the closest places within radius_km as (place, distance_km) pairs.
+
+        The geohash index narrows the candidates to the cells covering the
+        circle, then the candidates are ranked exactly by haversine distance.
+        With columns, rows of those columns (which must include id, latitude
+        and longitude) are returned instead of places.
+        """
+        cells = geohash.covering_cells(latitude, longitude, radius_km)
+        # Every geohash starting with a cell sorts between cell and cell + '{'
+        prefix_ranges = [and_(Place.geohash >= cell, Place.geohash < cell + '{') for cell in cells]
+        query = self._row_query(columns) if columns else self.model.query
+        query = query.filter(or_(*prefix_ranges), *self._box_filters(latitude, longitude, radius_km))
+
+        # Streamed: only the limit closest candidates are kept in memory
+        matches = ((geohash.haversine_km(latitude, longitude, place.latitude, place.longitude), place.id, place)
+                   for place in query.yield_per(NEARBY_BATCH_SIZE))
+        closest = heapq.nsmallest(limit, (match for match in matches if match[0] <= radius_km))
+        return [(place, distance) for distance, _, place in closest]
+
+    @staticmethod
+    def _box_filters(latitude, longitude, radius_km):
+        """Conditions keeping the places inside the circle's bounding box,
+        which the coarse geohash cells of large radii overshoot"""
+        min_lat, min_lon, max_lat, max_lon = geohash.bounding_box(latitude, longitude, radius_km)
+        filters = [Place.latitude.between(min_lat, max_lat)]
+        if min_lon < -180:
+            filters.append(or_(Place.longitude >= min_lon + 360, Place.longitude <= max_lon))
+        elif max_lon > 180:
+            filters.append(or_(Place.longitude >= min_lon, Place.longitude <= max_lon - 360))
+        elif min_lon > -180 or max_lon < 180:
+            filters.append(Place.longitude.between(min_lon, max_lon))
+        return filters
+
+
+class AsyncPlaceRepository(AsyncSQLAlchemyRepository):
+    def __init__(self, sessions):
+        super().__init__(Place, sessions)
+
+    def _row_select(self, columns):
+        """Place columns, plus the rating aggregates through an outer join"""
+        selected, with_stats = row_entities(columns)
+        statement = select(*selected).select_from(Place)
+        if with_stats:
+            statement = statement.outerjoin(PlaceRatingStats, PlaceRatingStats.place_id == Place.id)
+        return statement
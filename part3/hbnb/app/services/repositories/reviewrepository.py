@@ -1,7 +1,47 @@
+from sqlalchemy import exists
+from part3.hbnb.app import db
 from part3.hbnb.app.models.review import Review
+from part3.hbnb.app.persistence.asyncrepository import AsyncSQLAlchemyRepository
 from part3.hbnb.app.persistence.repository import SQLAlchemyRepository
+from part3.hbnb.app.persistence.pagination import DEFAULT_PAGE_SIZE
 
 
 class ReviewRepository(SQLAlchemyRepository):
     def __init__(self):
         super().__init__(Review)
+
+    def exists_for(self, user_id, place_id):
+        """Check whether the user already reviewed the place (single indexed EXISTS)"""
+        return db.session.query(
+            exists().where(Review.user_id == user_id, Review.place_id == place_id)
+        ).scalar()
+
+    def list_by_place(self, place_id, limit=DEFAULT_PAGE_SIZE, after=None):
+        """Return one page of a place's reviews, oldest first"""
+        return self._page(self.model.query.filter(Review.place_id == place_id), after, limit)
+
+    def iter_by_place(self, place_id, chunk_size=500):
+        """Yield every review of a place, fetching chunk_size rows at a time"""
+        query = (self.model.query
+                 .filter(Review.place_id == place_id)
+                 .order_by(Review.created_at, Review.id))
+        return query.yield_per(chunk_size)
+
+
+class AsyncReviewRepository(AsyncSQLAlchemyRepository):
+    def __init__(self, sessions):
+        super().__init__(Review, sessions)
+
+    async def list_by_place(self, place_id, columns, limit=DEFAULT_PAGE_SIZE, after=None):
+        """Return one page of rows of a place's reviews, oldest first"""
+        return await self._page(self._row_select(columns).where(Review.place_id == place_id), after, limit)
+
+    async def iter_by_place(self, place_id, columns, chunk_size=500):
+        """Yield lists of rows of every review of a place, streamed chunk_size at a time"""
+        statement = (self._row_select(columns)
+                     .where(Review.place_id == place_id)
+                     .order_by(Review.created_at, Review.id))
+        async with self.sessions() as session:
+            result = await session.stream(statement.execution_options(yield_per=chunk_size))
+            async for chunk in result.partitions(chunk_size):
+                yield chunk
@@ -271,20 +271,49 @@ function getCookie(name) {
   }
   
   // Filter places based on selected price
-  function filterPlacesByPrice(event) {
+  // The filter runs server-side so only the matching places are downloaded
+  async function filterPlacesByPrice(event) {
     const selectedPrice = event.target.value;
-    const places = window.placesData || [];
-    
-    let filteredPlaces;
-    
+
     if (selectedPrice === 'All') {
-      filteredPlaces = places;
-    } else {
+      displayPlaces(window.placesData || []);
+      return;
+    }
+
+    try {
+      const headers = {
+        'Content-Type': 'application/json'
+      };
+
+      const token = getCookie('token');
+      if (token) {
+        headers['Authorization'] = `Bearer ${token}`;
+      }
+
       const maxPrice = parseInt(selectedPrice, 10);
-      filteredPlaces = places.filter(place => place.price <= maxPrice);
+      const searchUrl = `http://localhost:5050/hbnb/app/api/v1/places/search?max_price=${maxPrice}&limit=100`;
+      // Results come in pages, follow next_cursor until the last one
+      const places = [];
+      let url = searchUrl;
+      while (url) {
+        const response = await fetch(url, {
+          method: 'GET',
+          headers: headers
+        });
+
+        if (!response.ok) {
+          throw new Error(`Error searching places: ${response.statusText}`);
+        }
+
+        const page = await response.json();
+        places.push(...page.results);
+        url = page.next_cursor ? `${searchUrl}&cursor=${encodeURIComponent(page.next_cursor)}` : null;
+      }
+
+      displayPlaces(places);
+    } catch (error) {
+      console.error('Failed to search places:', error);
     }
-    
-    displayPlaces(filteredPlaces);
   }
   
   // Initialize the page